@@ -0,0 +1,194 @@
+ # benchmarks.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+# Measures the simulation throughput and peak memory of each policy with each kind of bandit, the
+# policies only defined for rewards in [0, 1], as BetaThompsonPolicy, with the Bernoulli bandits only.
+#
+# usage:
+#   python benchmarks/benchmarks.py --output results.json
+#   python benchmarks/benchmarks.py --output results.json --compare baseline.json --tolerance 0.2
+#
+# Each case simulates either a single run through Simulator.nextStep ("single" mode), a single run
+# through the fused loop of Simulator.run ("run" mode) or several runs in lockstep folded into
+# RunsAggregators as plotAggregates does ("aggregate" mode). A case
+# runs for at least --duration seconds to measure its steps per second, then a fixed number of
+# steps under tracemalloc to measure its peak memory. In aggregate mode a step advances every run.
+# The comparison flags the cases slower, or using more memory, than the baseline by more than
+# --tolerance, and exits with status 1 if there are any.
+
+from rlsimulator.simulator import Simulator
+from rlsimulator.batchSimulator import BatchSimulator
+from rlsimulator.policies.policies import GreedyPolicy
+from rlsimulator.policies.policies import EpsilonGreedyPolicy
+from rlsimulator.policies.policies import UCBPolicy
+from rlsimulator.policies.policies import NormalThompsonPolicy
+from rlsimulator.policies.policies import BetaThompsonPolicy
+from rlsimulator.policies.policies import NonStationaryEpsilonGreedyPolicy
+from rlsimulator.policies.policies import NonStationaryUCBPolicy
+from rlsimulator.estimators.estimators import SlidingWindowEstimator
+from rlsimulator.estimators.estimators import DiscountedEstimator
+from rlsimulator.bandits.bandits import BernoulliBandit
+from rlsimulator.bandits.bandits import NormalBandit
+from rlsimulator.bandits.bandits import IncrementalNormalBandit
+from rlsimulator.bandits.bandits import ScheduledNormalBandit
+from rlsimulator.bandits.bandits import ScheduledBernoulliBandit
+from rlsimulator.schedules.schedules import PeriodicSchedule
+from rlsimulator.utils.utils import RunsAggregator
+
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+import numpy as np
+
+POLICIES = {
+    "GreedyPolicy": lambda: GreedyPolicy(),
+    "EpsilonGreedyPolicy": lambda: EpsilonGreedyPolicy(0.1),
+    "UCBPolicy": lambda: UCBPolicy(2),
+    "NormalThompsonPolicy": lambda: NormalThompsonPolicy(5, 10),
+    "BetaThompsonPolicy": lambda: BetaThompsonPolicy(),
+    "NonStationaryEpsilonGreedyPolicy": lambda: NonStationaryEpsilonGreedyPolicy(0.1, SlidingWindowEstimator(1000)),
+    "NonStationaryUCBPolicy": lambda: NonStationaryUCBPolicy(2, DiscountedEstimator(0.99)),
+}
+
+BANDITS = {
+    "BernoulliBandit": lambda arm_p, nbArms_p: BernoulliBandit((arm_p+1) / (nbArms_p+1)),
+    "NormalBandit": lambda arm_p, nbArms_p: NormalBandit(arm_p, 5),
+    "IncrementalNormalBandit": lambda arm_p, nbArms_p: IncrementalNormalBandit(arm_p, 5, 100, 1),
+    "ScheduledNormalBandit": lambda arm_p, nbArms_p: ScheduledNormalBandit(PeriodicSchedule([arm_p, nbArms_p-arm_p], 100), 5),
+    "ScheduledBernoulliBandit": lambda arm_p, nbArms_p: ScheduledBernoulliBandit(PeriodicSchedule([(arm_p+1) / (nbArms_p+1), (nbArms_p-arm_p) / (nbArms_p+1)], 100)),
+}
+
+# policies only defined for rewards in [0, 1], benchmarked with these bandits only
+BERNOULLI_POLICIES = ("BetaThompsonPolicy",)
+BERNOULLI_BANDITS = ("BernoulliBandit", "ScheduledBernoulliBandit")
+
+def isCompatible(policyName_p, banditName_p):
+    return policyName_p not in BERNOULLI_POLICIES or banditName_p in BERNOULLI_BANDITS
+
+def buildSimulator(policyName_p, banditName_p, nbArms_p):
+    simulator_l = Simulator(POLICIES[policyName_p](), seed_p=0)
+    for arm_cntr in range(nbArms_p):
+        simulator_l.addBandit(BANDITS[banditName_p](arm_cntr, nbArms_p), 0)
+    return simulator_l
+
+def singleStepper(simulator_p, runs_p):
+    def step(nsteps_p):
+        for step_cntr in range(nsteps_p):
+            simulator_p.nextStep()
+    return step
+
+def runStepper(simulator_p, runs_p):
+    def step(nsteps_p):
+        simulator_p.run(nsteps_p)
+    return step
+
+def aggregateStepper(simulator_p, runs_p):
+    batchSimulator_l = BatchSimulator(simulator_p, runs_p)
+    def step(nsteps_p):
+        # the runs go on across calls, so that only the simulation is measured
+        batchSimulator_l.aggregate(nsteps_p, RunsAggregator(nsteps_p), RunsAggregator(nsteps_p, (simulator_p.nbBandits_,)))
+    return step
+
+MODES = {"single": singleStepper, "run": runStepper, "aggregate": aggregateStepper}
+
+def measureCase(policyName_p, banditName_p, nbArms_p, mode_p, runs_p, duration_p, memorySteps_p):
+    """
+    returns the result record of a case: its steps per second and its peak memory in bytes.
+    """
+    runs_l = runs_p if mode_p == "aggregate" else 1
+
+    # throughput, doubling the number of steps until the duration is reached
+    step_l = MODES[mode_p](buildSimulator(policyName_p, banditName_p, nbArms_p), runs_l)
+    nsteps_l = 16
+    while True:
+        start_l = time.perf_counter()
+        step_l(nsteps_l)
+        seconds_l = time.perf_counter() - start_l
+        if seconds_l >= duration_p:
+            break
+        nsteps_l *= 2
+
+    # peak memory of building the simulator and simulating a few steps
+    tracemalloc.start()
+    step_l = MODES[mode_p](buildSimulator(policyName_p, banditName_p, nbArms_p), runs_l)
+    step_l(memorySteps_p)
+    _, peakBytes_l = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"policy": policyName_p, "bandit": banditName_p, "arms": nbArms_p, "mode": mode_p, "runs": runs_l,
+            "steps": nsteps_l, "seconds": seconds_l, "stepsPerSec": nsteps_l / seconds_l, "peakBytes": peakBytes_l}
+
+def caseKey(record_p):
+    return (record_p["policy"], record_p["bandit"], record_p["arms"], record_p["mode"], record_p["runs"])
+
+def compare(results_p, baseline_p, tolerance_p):
+    """
+    returns the list of the messages describing the regressions of results_p against baseline_p.
+    """
+    baselineRecords_l = {caseKey(record_l): record_l for record_l in baseline_p["results"]}
+    regressions_l = []
+    for record_l in results_p["results"]:
+        baselineRecord_l = baselineRecords_l.get(caseKey(record_l))
+        if baselineRecord_l is None:
+            continue
+        speedRatio_l = record_l["stepsPerSec"] / baselineRecord_l["stepsPerSec"]
+        memoryRatio_l = record_l["peakBytes"] / max(1, baselineRecord_l["peakBytes"])
+        if speedRatio_l < 1 - tolerance_p:
+            regressions_l.append("%s: %.0f steps/s instead of %.0f (x%.2f)"
+                                 % (caseKey(record_l), record_l["stepsPerSec"], baselineRecord_l["stepsPerSec"], speedRatio_l))
+        if memoryRatio_l > 1 + tolerance_p:
+            regressions_l.append("%s: peak memory %i bytes instead of %i (x%.2f)"
+                                 % (caseKey(record_l), record_l["peakBytes"], baselineRecord_l["peakBytes"], memoryRatio_l))
+    return regressions_l
+
+def main(argv_p=None):
+    parser_l = argparse.ArgumentParser(description="Simulator throughput and memory benchmarks.")
+    parser_l.add_argument("--output", default="benchmarks.json", help="file the results are written to")
+    parser_l.add_argument("--compare", default=None, help="baseline results file to compare against")
+    parser_l.add_argument("--tolerance", type=float, default=0.2, help="relative slowdown or memory growth flagged")
+    parser_l.add_argument("--arms", type=int, nargs="+", default=[3, 100, 10**4, 10**5], help="numbers of arms")
+    parser_l.add_argument("--policies", nargs="+", default=list(POLICIES), choices=list(POLICIES))
+    parser_l.add_argument("--bandits", nargs="+", default=list(BANDITS), choices=list(BANDITS))
+    parser_l.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser_l.add_argument("--runs", type=int, default=16, help="number of runs in aggregate mode")
+    parser_l.add_argument("--duration", type=float, default=0.5, help="minimal duration of a throughput measure, in seconds")
+    parser_l.add_argument("--memory-steps", type=int, default=256, help="number of steps of a memory measure")
+    arguments_l = parser_l.parse_args(argv_p)
+
+    records_l = []
+    for policyName_l in arguments_l.policies:
+        for banditName_l in arguments_l.bandits:
+            if not isCompatible(policyName_l, banditName_l):
+                continue
+            for nbArms_l in arguments_l.arms:
+                for mode_l in arguments_l.modes:
+                    record_l = measureCase(policyName_l, banditName_l, nbArms_l, mode_l, arguments_l.runs,
+                                           arguments_l.duration, arguments_l.memory_steps)
+                    records_l.append(record_l)
+                    print("%-32s %-24s %7i arms %-9s %12.0f steps/s %12i bytes"
+                          % (policyName_l, banditName_l, nbArms_l, mode_l, record_l["stepsPerSec"], record_l["peakBytes"]))
+
+    results_l = {"machine": {"python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(),
+                             "processor": platform.processor()},
+                 "date": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": records_l}
+    with open(arguments_l.output, "w") as outputFile_l:
+        json.dump(results_l, outputFile_l, indent=1)
+
+    if arguments_l.compare is not None:
+        with open(arguments_l.compare, "r") as baselineFile_l:
+            regressions_l = compare(results_l, json.load(baselineFile_l), arguments_l.tolerance)
+        for regression_l in regressions_l:
+            print("REGRESSION " + regression_l)
+        if regressions_l:
+            return 1
+        print("no regression against %s" % arguments_l.compare)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,23 +9,35 @@ from rlsimulator.policies.policies import EpsilonGreedyPolicy
 from rlsimulator.policies.policies import UCBPolicy
 from rlsimulator.bandits.bandits import _BaseBandit
 from rlsimulator.bandits.bandits import NormalBandit
+from rlsimulator.bandits.bandits import ScheduledNormalBandit
+from rlsimulator.schedules.schedules import PeriodicSchedule
 from rlsimulator.plots.plots import plotRewards
 from rlsimulator.plots.plots import plotEvals
 from rlsimulator.plots.plots import plotAggregates
 
 from matplotlib import pyplot as plt
-import numpy as np
 
 class PeriodicNormalBandit(_BaseBandit):
+    # any bandit is a _BaseBandit implementing getReward, drawing from the Generator rng_ the
+    # simulator gives it, and getExpectedReward for the regret metrics
     def __init__(self, means_p, std_p, subPeriod_p):
         self.means_ = means_p
         self.std_ = std_p
         self.subPeriod_ = subPeriod_p
 
     def getReward(self, step_p):
+        return self.rng_.normal(self.getExpectedReward(step_p), self.std_)
+
+    def getExpectedReward(self, step_p):
         period_l = self.subPeriod_ * len(self.means_)
-        mean_l = self.means_[step_p % period_l // self.subPeriod_]
-        return np.random.normal(mean_l, self.std_, 1)[0]
+        return self.means_[step_p % period_l // self.subPeriod_]
+
+class ScheduledPeriodicNormalBandit(ScheduledNormalBandit):
+    # the same bandit built on a schedule: the means cycle through means_p, each one kept during
+    # subPeriod_p steps. The schedule computes the means, hence the rewards and the expected rewards,
+    # of many steps at once
+    def __init__(self, means_p, std_p, subPeriod_p):
+        super().__init__(PeriodicSchedule(means_p, subPeriod_p), std_p)
 
 
 policy_l = UCBPolicy(50)
@@ -33,7 +45,7 @@ policy_l = UCBPolicy(50)
 simulator_l = Simulator(policy_l)
 
 bandit_1 = PeriodicNormalBandit([20, 100, 10, 200], 5, 100)
-bandit_2 = PeriodicNormalBandit([200, 10, 100, 20], 5, 100)
+bandit_2 = ScheduledPeriodicNormalBandit([200, 10, 100, 20], 5, 100)
 bandit_3 = NormalBandit(100, 30)
 
 #optimistic evaluations
@@ -49,4 +61,11 @@ plotRewards(simulator_l, 5000)
 simulator_l.reinit()
 plotAggregates(simulator_l, 2500, 20, 50)
 
+simulator_l.reinit()
+regret_l = simulator_l.trackRegret()
+simulator_l.run(5000)
+plt.figure()
+plt.plot(regret_l.getHistory())
+plt.title(regret_l.label_)
+
 plt.show()
\ No newline at end of file
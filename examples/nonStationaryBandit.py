@@ -12,11 +12,13 @@ from rlsimulator.bandits.bandits import NormalBandit
 from rlsimulator.plots.plots import plotRewards
 from rlsimulator.plots.plots import plotEvals
 from rlsimulator.plots.plots import plotAggregates
+from rlsimulator.cache.cache import ResultCache
 
 from matplotlib import pyplot as plt
 
 policy_l = UCBPolicy(50)
-simulator_l = Simulator(policy_l)
+# a fixed seed lets reruns read the simulations from the cache
+simulator_l = Simulator(policy_l, seed_p=0)
 
 bandit_1 = IncrementalNormalBandit(20, 5, 100, 20)
 bandit_2 = NormalBandit(50, 5)
@@ -27,12 +29,13 @@ simulator_l.addBandit(bandit_1, 200)
 simulator_l.addBandit(bandit_2, 200)
 simulator_l.addBandit(bandit_3, 200)
 
-plotEvals(simulator_l, 500)
+cache_l = ResultCache()
+plotEvals(simulator_l, 500, cache_p=cache_l)
 
 simulator_l.reinit()
-plotRewards(simulator_l, 500)
+plotRewards(simulator_l, 500, cache_p=cache_l)
 
 simulator_l.reinit()
-plotAggregates(simulator_l, 2500, 20, 50)
+plotAggregates(simulator_l, 2500, 20, 50, cache_p=cache_l)
 
 plt.show()
\ No newline at end of file
@@ -0,0 +1,19 @@
+ # serving.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+from rlsimulator.policies.policies import EpsilonGreedyPolicy
+from rlsimulator.bandits.bandits import BernoulliBandit
+from rlsimulator.serving.serving import runLoadTest
+
+bandits_l = [BernoulliBandit(0.2), BernoulliBandit(0.5), BernoulliBandit(0.8)]
+
+# 128 concurrent clients whose rewards come back after 2ms on average, out of order
+for batchWindow_l in [0., 0.001]:
+    report_l = runLoadTest(EpsilonGreedyPolicy(0.1), bandits_l, [1, 1, 1], 50000, concurrency_p=128,
+                           feedbackDelay_p=0.002, batchWindow_p=batchWindow_l, seed_p=0)
+    print("batch window %.4fs : %.0f decisions/s, latency p50 %.3fms p99 %.3fms, mean reward %.3f, %i decision batches, %i update batches"
+          % (batchWindow_l, report_l["decisionsPerSec"], 1e3*report_l["p50Latency"], 1e3*report_l["p99Latency"],
+             report_l["meanReward"], report_l["decisionBatches"], report_l["updateBatches"]))
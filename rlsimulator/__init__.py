@@ -1,5 +1,17 @@
 from .simulator import Simulator
+from .simulator import SimulatorSpec
+from .batchSimulator import BatchSimulator
+from .delayedSimulator import DelayedSimulator
+from .parallelRunner import runParallel
+from .parallelRunner import aggregateParallel
+from .sweepRunner import runSweep
 
 __all__ = [
-    "Simulator"
+    "Simulator",
+    "SimulatorSpec",
+    "BatchSimulator",
+    "DelayedSimulator",
+    "runParallel",
+    "aggregateParallel",
+    "runSweep"
 ]
\ No newline at end of file
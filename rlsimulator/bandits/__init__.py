@@ -1,9 +1,13 @@
 from .bandits import BernoulliBandit
 from .bandits import NormalBandit
 from .bandits import IncrementalNormalBandit
+from .bandits import ScheduledNormalBandit
+from .bandits import ScheduledBernoulliBandit
 
 __all__ = [
     "BernoulliBandit",
     "NormalBandit",
-    "IncrementalNormalBandit"
+    "IncrementalNormalBandit",
+    "ScheduledNormalBandit",
+    "ScheduledBernoulliBandit"
 ]
\ No newline at end of file
@@ -6,20 +6,200 @@
 
 import numpy as np
 
+from ..schedules.schedules import _BaseSchedule
+from ..schedules.schedules import ConstantSchedule
+
 class _BaseBandit:
     """
     Abstract base class for bandits.
 
+    Built-in bandits draw their randomness from a buffer of pre-drawn variates refilled by blocks of
+     bufferSize_ draws, so that a single pull is an array indexing rather than a call to numpy.random.
+    The reward is then obtained by transforming the variate according to the bandit's distribution.
+
+    Attributes
+    ----------
+    rng_ : numpy Generator the bandit draws from. Shared by all the bandits until setRng is called,
+     which the Simulator does when the bandit is added.
+
+    stationary_ : whether the expected reward is the same at every step.
+
+    bufferSize_ : number of variates drawn each time the buffer is refilled.
+
+    variatesBuffer_ : array of the pre-drawn variates. None until the first pull.
+
+    bufferPosition_ : index of the next unused variate of the buffer.
+
     Methods
     -------
     getReward : abstract. returns the reward won upon choosing the bandit.
 
+    getRewards : returns the rewards won upon choosing the bandit at each of the given steps.
+     Falls back to getReward for bandits that do not provide a vectorized version.
 
+    getExpectedReward : abstract. returns the mean of the reward's distribution at a given step.
+
+    getExpectedRewards : returns the mean of the reward's distribution at each of the given steps.
+     Falls back to getExpectedReward for bandits that do not provide a vectorized version.
+
+    resetBuffer : discards the pre-drawn variates.
+
+    setRng : sets the numpy Generator the bandit draws from.
     """
 
+    rng_ = np.random.default_rng()
+    stationary_ = False
+    bufferSize_ = 4096
+    variatesBuffer_ = None
+    bufferPosition_ = 0
+
     def getReward(self, step_p):
         pass
 
+    def getRewards(self, steps_p):
+        """
+            returns an array of the rewards won upon choosing the bandit at each of the given steps.
+
+            steps_p : array of the time steps of pulling.
+        """
+        return np.array([self.getReward(step_l) for step_l in steps_p], dtype=float)
+
+    def getExpectedReward(self, step_p):
+        """
+            returns the mean of the reward's distribution at the time step step_p.
+        """
+        pass
+
+    def getExpectedRewards(self, steps_p):
+        """
+            returns an array of the means of the reward's distribution at each of the given steps.
+
+            steps_p : array of the time steps.
+        """
+        return np.array([self.getExpectedReward(step_l) for step_l in steps_p], dtype=float)
+
+    def resetBuffer(self):
+        self.variatesBuffer_ = None
+        self.bufferPosition_ = 0
+
+    def setRng(self, rng_p):
+        """
+            sets the numpy Generator the bandit draws from and discards the variates drawn from the
+             previous one.
+        """
+        self.rng_ = rng_p
+        self.resetBuffer()
+
+    def _drawVariates(self, rng_p, size_p):
+        """
+            abstract. returns an array of size_p variates drawn from rng_p used to produce the rewards.
+            Bandits that do not implement it are not buffered.
+        """
+        pass
+
+    def _rewardsFromVariates(self, steps_p, variates_p):
+        """
+            abstract. returns the rewards produced by variates_p at each of the steps steps_p.
+        """
+        pass
+
+    def _nextVariate(self):
+        if self.variatesBuffer_ is None or self.bufferPosition_ == len(self.variatesBuffer_):
+            self.variatesBuffer_ = self._drawVariates(self.rng_, self.bufferSize_)
+            self.bufferPosition_ = 0
+        variate_l = self.variatesBuffer_.item(self.bufferPosition_)
+        self.bufferPosition_ += 1
+        return variate_l
+
+    def _nextVariates(self, size_p):
+        if self.variatesBuffer_ is None:
+            self.variatesBuffer_ = self._drawVariates(self.rng_, max(size_p, self.bufferSize_))
+            self.bufferPosition_ = 0
+
+        available_l = len(self.variatesBuffer_) - self.bufferPosition_
+        if size_p <= available_l:
+            variates_l = self.variatesBuffer_[self.bufferPosition_:self.bufferPosition_+size_p]
+            self.bufferPosition_ += size_p
+            return variates_l
+
+        # use up the buffer before refilling it so that variates are consumed in the drawing order
+        missing_l = size_p - available_l
+        block_l = self._drawVariates(self.rng_, max(missing_l, self.bufferSize_))
+        variates_l = np.concatenate((self.variatesBuffer_[self.bufferPosition_:], block_l[:missing_l]))
+        self.variatesBuffer_ = block_l
+        self.bufferPosition_ = missing_l
+        return variates_l
+
+def _isBuffered(bandit_p):
+    # buffered bandits whose getReward is the one matching their _rewardsFromVariates
+    banditClass_l = type(bandit_p)
+    if banditClass_l._drawVariates is _BaseBandit._drawVariates:
+        return False
+    definingClass_l = next(class_l for class_l in banditClass_l.__mro__ if "_rewardsFromVariates" in vars(class_l))
+    return banditClass_l.getReward is definingClass_l.getReward
+
+def _isFusable(bandit_p):
+    # stationary buffered bandits
+    return bandit_p.stationary_ and _isBuffered(bandit_p)
+
+class _FusedRewards:
+    """
+    Rewards of bandits pulled one at a time by a fused simulation loop, drawn from the same variates
+     and in the same order as their getReward does.
+
+    The rewards of stationary buffered bandits are computed from their buffer of variates by slices
+     of chunkSize_ pulls and read back from a list, so that a pull is a list indexing. The other
+     bandits are pulled through getReward.
+
+    Parameters
+    ----------
+    banditsList_p : list of the bandits.
+
+    Methods
+    -------
+    pull : returns the reward of a bandit pulled at a given step.
+
+    close : hands the unused variates back to the bandits' buffers.
+    """
+
+    chunkSize_ = 512
+
+    def __init__(self, banditsList_p):
+        self.banditsList_ = banditsList_p
+        self.fusable_ = [_isFusable(bandit_l) for bandit_l in banditsList_p]
+        self.rewards_ = [[] for bandit_l in banditsList_p]
+        self.starts_ = [bandit_l.bufferPosition_ for bandit_l in banditsList_p]
+        self.positions_ = [0] * len(banditsList_p)
+
+    def pull(self, action_p, step_p):
+        position_l = self.positions_[action_p]
+        rewards_l = self.rewards_[action_p]
+        if position_l < len(rewards_l):
+            self.positions_[action_p] = position_l + 1
+            return rewards_l[position_l]
+        return self._pullChunk(action_p, step_p)
+
+    def _pullChunk(self, action_p, step_p):
+        bandit_l = self.banditsList_[action_p]
+        if not self.fusable_[action_p]:
+            return bandit_l.getReward(step_p)
+
+        # refilled exactly when _BaseBandit._nextVariate would
+        start_l = self.starts_[action_p] + self.positions_[action_p]
+        if bandit_l.variatesBuffer_ is None or start_l == len(bandit_l.variatesBuffer_):
+            bandit_l.variatesBuffer_ = bandit_l._drawVariates(bandit_l.rng_, bandit_l.bufferSize_)
+            start_l = 0
+        variates_l = bandit_l.variatesBuffer_[start_l:start_l+self.chunkSize_]
+        self.rewards_[action_p] = bandit_l._rewardsFromVariates(np.full(len(variates_l), step_p), variates_l).tolist()
+        self.starts_[action_p] = start_l
+        self.positions_[action_p] = 1
+        return self.rewards_[action_p][0]
+
+    def close(self):
+        for bandit_l, fusable_l, start_l, position_l in zip(self.banditsList_, self.fusable_, self.starts_, self.positions_):
+            if fusable_l:
+                bandit_l.bufferPosition_ = start_l + position_l
+
 class BernoulliBandit(_BaseBandit):
     """
     Implements a stationary bernoulli bandit.
@@ -40,8 +220,16 @@ class BernoulliBandit(_BaseBandit):
     Methods
     -------
     getReward : returns the reward won upon choosing the bandit.
+
+    getRewards : returns the rewards won upon choosing the bandit at each of the given steps.
+
+    getExpectedReward : returns the mean of the reward's distribution at a given step.
+
+    getExpectedRewards : returns the mean of the reward's distribution at each of the given steps.
     """
     
+    stationary_ = True
+
     def __init__(self, proba_p):
         self.proba_ = proba_p
 
@@ -52,7 +240,22 @@ class BernoulliBandit(_BaseBandit):
 
             step_p : the time step of pulling. Unused here but useful for non-stationary bandits.
         """
-        return np.random.binomial(1, self.proba_)
+        return int(self._nextVariate() < self.proba_)
+
+    def getRewards(self, steps_p):
+        return self._rewardsFromVariates(steps_p, self._nextVariates(len(steps_p)))
+
+    def _drawVariates(self, rng_p, size_p):
+        return rng_p.random(size_p)
+
+    def _rewardsFromVariates(self, steps_p, variates_p):
+        return (variates_p < self.proba_).astype(float)
+
+    def getExpectedReward(self, step_p):
+        return self.proba_
+
+    def getExpectedRewards(self, steps_p):
+        return np.full(len(steps_p), self.proba_, dtype=float)
 
 class NormalBandit(_BaseBandit):
     """
@@ -78,7 +281,15 @@ class NormalBandit(_BaseBandit):
     Methods
     -------
     getReward : returns the reward won upon choosing the bandit.
+
+    getRewards : returns the rewards won upon choosing the bandit at each of the given steps.
+
+    getExpectedReward : returns the mean of the reward's distribution at a given step.
+
+    getExpectedRewards : returns the mean of the reward's distribution at each of the given steps.
     """
+    stationary_ = True
+
     def __init__(self, mean_p, std_p):
         self.mean_ = mean_p
         self.std_ = std_p
@@ -90,7 +301,22 @@ class NormalBandit(_BaseBandit):
 
             step_p : the time step of pulling. Unused here but useful for non-stationary bandits.
         """
-        return np.random.normal(self.mean_, self.std_, 1)[0]
+        return self.mean_ + self.std_ * self._nextVariate()
+
+    def getRewards(self, steps_p):
+        return self._rewardsFromVariates(steps_p, self._nextVariates(len(steps_p)))
+
+    def _drawVariates(self, rng_p, size_p):
+        return rng_p.standard_normal(size_p)
+
+    def _rewardsFromVariates(self, steps_p, variates_p):
+        return self.mean_ + self.std_ * variates_p
+
+    def getExpectedReward(self, step_p):
+        return self.mean_
+
+    def getExpectedRewards(self, steps_p):
+        return np.full(len(steps_p), self.mean_, dtype=float)
 
 class IncrementalNormalBandit(_BaseBandit):
     """
@@ -125,6 +351,12 @@ class IncrementalNormalBandit(_BaseBandit):
     Methods
     -------
     getReward : returns the reward won upon choosing the bandit.
+
+    getRewards : returns the rewards won upon choosing the bandit at each of the given steps.
+
+    getExpectedReward : returns the mean of the reward's distribution at a given step.
+
+    getExpectedRewards : returns the mean of the reward's distribution at each of the given steps.
     """
     def __init__(self, mean_p, std_p, nbStepsToIncrement_p, increment_p):
         self.mean_ = mean_p
@@ -140,4 +372,136 @@ class IncrementalNormalBandit(_BaseBandit):
             step_p : the time step of pulling. Unused here but useful for non-stationary bandits.
         """
         increments_l = step_p // self.nbStepsToIncrement_
-        return np.random.normal(self.mean_ + increments_l*self.increment_ , self.std_, 1)[0]
\ No newline at end of file
+        return self.mean_ + increments_l*self.increment_ + self.std_ * self._nextVariate()
+
+    def getRewards(self, steps_p):
+        return self._rewardsFromVariates(steps_p, self._nextVariates(len(steps_p)))
+
+    def _drawVariates(self, rng_p, size_p):
+        return rng_p.standard_normal(size_p)
+
+    def _rewardsFromVariates(self, steps_p, variates_p):
+        increments_l = np.asarray(steps_p) // self.nbStepsToIncrement_
+        return self.mean_ + increments_l*self.increment_ + self.std_ * variates_p
+
+    def getExpectedReward(self, step_p):
+        return self.mean_ + (step_p // self.nbStepsToIncrement_)*self.increment_
+
+    def getExpectedRewards(self, steps_p):
+        increments_l = np.asarray(steps_p) // self.nbStepsToIncrement_
+        return (self.mean_ + increments_l*self.increment_).astype(float)
+
+def _asSchedule(value_p):
+    return value_p if isinstance(value_p, _BaseSchedule) else ConstantSchedule(value_p)
+
+class ScheduledNormalBandit(_BaseBandit):
+    """
+    Implements a normal bandit whose mean follows a schedule.
+
+    The means of many steps are computed at once by the schedule, so that rewards and expected
+     rewards of long non-stationary runs are produced in bulk.
+
+    Parameters 
+    ----------
+    meanSchedule_p : schedule of rlsimulator.schedules giving the mean at each step, or a constant mean.
+    
+    std_p : standard deviation of the reward's distribution
+
+
+    Attributes
+    ----------
+    meanSchedule_ : schedule of the mean of the reward's distribution
+    
+    std_ : standard deviation of the reward's distribution
+
+    Methods
+    -------
+    getReward : returns the reward won upon choosing the bandit.
+
+    getRewards : returns the rewards won upon choosing the bandit at each of the given steps.
+
+    getExpectedReward : returns the mean of the reward's distribution at a given step.
+
+    getExpectedRewards : returns the mean of the reward's distribution at each of the given steps.
+    """
+    def __init__(self, meanSchedule_p, std_p):
+        self.meanSchedule_ = _asSchedule(meanSchedule_p)
+        self.std_ = std_p
+        self.stationary_ = self.meanSchedule_.stationary_
+
+    def getReward(self, step_p):
+        """
+            returns the reward won upon choosing the bandit.
+            Produces a reward pulled from a normal distribution N(mean(step_p), std_)
+
+            step_p : the time step of pulling.
+        """
+        return self.meanSchedule_.getValue(step_p) + self.std_ * self._nextVariate()
+
+    def getRewards(self, steps_p):
+        return self._rewardsFromVariates(steps_p, self._nextVariates(len(steps_p)))
+
+    def _drawVariates(self, rng_p, size_p):
+        return rng_p.standard_normal(size_p)
+
+    def _rewardsFromVariates(self, steps_p, variates_p):
+        return self.meanSchedule_.getValues(steps_p) + self.std_ * variates_p
+
+    def getExpectedReward(self, step_p):
+        return self.meanSchedule_.getValue(step_p)
+
+    def getExpectedRewards(self, steps_p):
+        return np.asarray(self.meanSchedule_.getValues(steps_p), dtype=float)
+
+class ScheduledBernoulliBandit(_BaseBandit):
+    """
+    Implements a bernoulli bandit whose probability to issue a reward follows a schedule.
+    The scheduled values are clipped to [0, 1].
+
+    Parameters 
+    ----------
+    probaSchedule_p : schedule of rlsimulator.schedules giving the probability at each step, or a
+     constant probability.
+
+
+    Attributes
+    ----------
+    probaSchedule_ : schedule of the probability that the bandit will produce a reward when chosen
+
+    Methods
+    -------
+    getReward : returns the reward won upon choosing the bandit.
+
+    getRewards : returns the rewards won upon choosing the bandit at each of the given steps.
+
+    getExpectedReward : returns the mean of the reward's distribution at a given step.
+
+    getExpectedRewards : returns the mean of the reward's distribution at each of the given steps.
+    """
+    def __init__(self, probaSchedule_p):
+        self.probaSchedule_ = _asSchedule(probaSchedule_p)
+        self.stationary_ = self.probaSchedule_.stationary_
+
+    def getReward(self, step_p):
+        """
+            returns the reward won upon choosing the bandit.
+            Produces a reward of 1 with probability proba(step_p) otherwise 0
+
+            step_p : the time step of pulling.
+        """
+        return int(self._nextVariate() < self.probaSchedule_.getValue(step_p))
+
+    def getRewards(self, steps_p):
+        return self._rewardsFromVariates(steps_p, self._nextVariates(len(steps_p)))
+
+    def _drawVariates(self, rng_p, size_p):
+        return rng_p.random(size_p)
+
+    def _rewardsFromVariates(self, steps_p, variates_p):
+        return (variates_p < self.probaSchedule_.getValues(steps_p)).astype(float)
+
+    def getExpectedReward(self, step_p):
+        return min(max(self.probaSchedule_.getValue(step_p), 0.), 1.)
+
+    def getExpectedRewards(self, steps_p):
+        return np.clip(self.probaSchedule_.getValues(steps_p), 0., 1.)
@@ -0,0 +1,228 @@
+ # batchSimulator.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import copy
+import functools
+import numpy as np
+
+from .policies.policies import _BasePolicy
+from .bandits.bandits import _isBuffered
+from .utils.utils import progressBar
+from .utils.utils import RunsVariatesBuffer
+
+class BatchSimulator:
+    """
+    Class advancing several independent runs of a simulator in lockstep.
+
+    The policy state of all the runs is held in (nbRuns, nbBandits) arrays so that action selection,
+     reward draws and updates are performed with one array operation per step for all the runs.
+    Policies that do not implement the batch methods are simulated by one copy per run, and so are
+     bandits that do not draw buffered variates or override the getReward computing them.
+
+    The run r of the batch draws from the same random streams as the run firstRun_+r of the
+     replicated simulator, hence gives bit-identical results.
+
+    Parameters
+    ----------
+    simulator_p : the simulator whose policy, bandits and initial evaluations are replicated.
+
+    nbRuns_p : number of independent runs.
+
+    firstRun_p : index of the simulator's run replicated by the first run of the batch. Defaults to
+     the current run of the simulator.
+
+    runsOffsets_p : offsets from firstRun_p of the simulator's runs replicated by each run of the
+     batch, range(nbRuns_p) by default. Repeated offsets replicate the same random streams in several
+     runs, eg. to compare configurations on common random numbers.
+
+    initialEvals_p : (nbRuns_p, nbBandits) array of the initial evaluations of each run. Defaults to
+     the initial evaluations of the simulator.
+
+    Attributes
+    ----------
+    simulator_ : the replicated simulator.
+
+    nbRuns_ : number of independent runs.
+
+    firstRun_ : index of the simulator's run replicated by the first run of the batch.
+
+    runsOffsets_ : array of the offsets from firstRun_ of the runs replicated.
+
+    initialEvals_ : initial evaluations of the runs, None to use the simulator's ones.
+
+    step_ : timestep ie number of times actions were performed in each run.
+
+    state_ : BatchPolicyState of the runs when the policy supports batching otherwise None.
+
+    policies_ : copies of the policy, one per run, when the policy does not support batching.
+
+    banditsVariates_ : for each bandit, RunsVariatesBuffer of its variates in each run, or copies of
+     the bandit, one per run, when its rewards are not computed from buffered variates.
+
+    Methods
+    -------
+    reinit : restarts the batch with the next runs of the simulator.
+
+    nextStep : returns the chosen actions and their rewards for each run.
+
+    run : simulates nsteps steps of all the runs and returns their history.
+
+    aggregate : simulates nsteps steps of all the runs folding each step into RunsAggregators.
+
+    getEvals : returns the current (nbRuns, nbBandits) evaluations of the runs.
+    """
+
+    def __init__(self, simulator_p, nbRuns_p, firstRun_p=None, runsOffsets_p=None, initialEvals_p=None):
+        self.simulator_ = simulator_p
+        self.nbRuns_ = nbRuns_p
+        self.runsOffsets_ = np.arange(nbRuns_p) if runsOffsets_p is None else np.asarray(runsOffsets_p)
+        self.initialEvals_ = initialEvals_p
+        self.reinit(simulator_p.run_ if firstRun_p is None else firstRun_p)
+
+    def reinit(self, firstRun_p=None):
+        """
+        restarts the batch.
+
+        Parameters
+        ----------
+        firstRun_p : index of the simulator's run replicated by the first run of the batch. Defaults
+         to the run following the last run of the current batch.
+        """
+        self.step_ = 0
+        self.firstRun_ = self.firstRun_ + int(np.max(self.runsOffsets_)) + 1 if firstRun_p is None else firstRun_p
+
+        runsRngs_l = [self.simulator_.runRngs(self.firstRun_ + int(offset_l)) for offset_l in self.runsOffsets_]
+        policiesRngs_l = [policyRng_l for policyRng_l, _ in runsRngs_l]
+
+        policy_l = self.simulator_.policy_
+        initialEvals_l = self.simulator_.initialEvals_ if self.initialEvals_ is None else self.initialEvals_
+        if type(policy_l).getNexActionsBatch is _BasePolicy.getNexActionsBatch:
+            self.state_ = None
+            self.policies_ = []
+            runsInitialEvals_l = np.broadcast_to(np.asarray(initialEvals_l, dtype=float), (self.nbRuns_, self.simulator_.nbBandits_))
+            for policyRng_l, runInitialEvals_l in zip(policiesRngs_l, runsInitialEvals_l):
+                runPolicy_l = copy.deepcopy(policy_l)
+                runPolicy_l.reinit(runInitialEvals_l.tolist())
+                runPolicy_l.setRng(policyRng_l)
+                self.policies_.append(runPolicy_l)
+        else:
+            self.state_ = policy_l.newBatchState(initialEvals_l, self.nbRuns_, policiesRngs_l)
+            self.policies_ = None
+
+        self.banditsVariates_ = []
+        for bandit_cntr, bandit_l in enumerate(self.simulator_.banditsList_):
+            banditRngs_l = [banditsRngs_l[bandit_cntr] for _, banditsRngs_l in runsRngs_l]
+            if not _isBuffered(bandit_l):
+                runBandits_l = []
+                for banditRng_l in banditRngs_l:
+                    runBandit_l = copy.deepcopy(bandit_l)
+                    runBandit_l.setRng(banditRng_l)
+                    runBandits_l.append(runBandit_l)
+                self.banditsVariates_.append(runBandits_l)
+            else:
+                # bound the memory held by the buffers of all the runs and bandits
+                bufferSize_l = max(16, min(bandit_l.bufferSize_, 2**22 // (self.nbRuns_*self.simulator_.nbBandits_)))
+                draws_l = [functools.partial(bandit_l._drawVariates, banditRng_l) for banditRng_l in banditRngs_l]
+                self.banditsVariates_.append(RunsVariatesBuffer(draws_l, bufferSize_l))
+
+    def getEvals(self):
+        if self.state_ is not None:
+            return self.state_.vectBanditsEvals_
+        return np.array([runPolicy_l.vectBanditsEvals_ for runPolicy_l in self.policies_], dtype=float)
+
+    def nextStep(self):
+        """
+        returns the arrays of the chosen actions and of their rewards, one entry per run.
+        """
+        self.step_ += 1
+        policy_l = self.simulator_.policy_
+
+        if self.state_ is not None:
+            actions_l = policy_l.getNexActionsBatch(self.state_)
+        else:
+            actions_l = np.array([runPolicy_l.getNexAction() for runPolicy_l in self.policies_])
+
+        rewards_l = np.empty(self.nbRuns_)
+        for bandit_cntr, bandit_l in enumerate(self.simulator_.banditsList_):
+            pulledRuns_l = np.flatnonzero(actions_l == bandit_cntr)
+            if len(pulledRuns_l) == 0:
+                continue
+            banditVariates_l = self.banditsVariates_[bandit_cntr]
+            if isinstance(banditVariates_l, RunsVariatesBuffer):
+                variates_l = banditVariates_l.take(pulledRuns_l)
+                rewards_l[pulledRuns_l] = bandit_l._rewardsFromVariates(np.full(len(pulledRuns_l), self.step_), variates_l)
+            else:
+                rewards_l[pulledRuns_l] = [banditVariates_l[run_l].getReward(self.step_) for run_l in pulledRuns_l]
+
+        if self.state_ is not None:
+            policy_l.updateBatch(self.state_, actions_l, rewards_l)
+        else:
+            for runPolicy_l, action_l, reward_l in zip(self.policies_, actions_l, rewards_l):
+                runPolicy_l.update(action_l, reward_l)
+
+        return actions_l, rewards_l
+
+    def run(self, nsteps_p, recordEvals_p=False, showProgress_p=False):
+        """
+        simulates nsteps_p steps of all the runs.
+
+        Parameters
+        ----------
+        nsteps_p : number of steps to simulate.
+
+        recordEvals_p : whether to record the evaluations of the bandits before each step.
+
+        showProgress_p : whether to print a progress bar.
+
+        Returns
+        -------
+        actions : (nbRuns, nsteps) array of the actions performed.
+
+        rewards : (nbRuns, nsteps) array of the rewards obtained.
+
+        evals : (nbRuns, nsteps, nbBandits) array of the evaluations before each step, None when
+         recordEvals_p is False.
+        """
+        actions_l = np.empty((self.nbRuns_, nsteps_p), dtype=np.int64)
+        rewards_l = np.empty((self.nbRuns_, nsteps_p))
+        evals_l = None
+        if recordEvals_p:
+            evals_l = np.empty((self.nbRuns_, nsteps_p, self.simulator_.nbBandits_))
+
+        progressStride_l = max(1, nsteps_p // 100)
+        for step_cntr in range(nsteps_p):
+            if showProgress_p and step_cntr % progressStride_l == 0:
+                progressBar(step_cntr, nsteps_p)
+            if recordEvals_p:
+                evals_l[:, step_cntr, :] = self.getEvals()
+            actions_l[:, step_cntr], rewards_l[:, step_cntr] = self.nextStep()
+
+        return actions_l, rewards_l, evals_l
+
+    def aggregate(self, nsteps_p, rewardsAggregator_p, evalsAggregator_p=None, showProgress_p=False):
+        """
+        simulates nsteps_p steps of all the runs without keeping their history: the rewards, and the
+         evaluations of the bandits before each step, are folded into streaming aggregators.
+
+        Parameters
+        ----------
+        nsteps_p : number of steps to simulate.
+
+        rewardsAggregator_p : RunsAggregator of shape () the rewards are folded into.
+
+        evalsAggregator_p : RunsAggregator of shape (nbBandits,) the evaluations are folded into,
+         if not None.
+
+        showProgress_p : whether to print a progress bar.
+        """
+        progressStride_l = max(1, nsteps_p // 100)
+        for step_cntr in range(nsteps_p):
+            if showProgress_p and step_cntr % progressStride_l == 0:
+                progressBar(step_cntr, nsteps_p)
+            if evalsAggregator_p is not None:
+                evalsAggregator_p.addStep(step_cntr, self.getEvals())
+            _, rewards_l = self.nextStep()
+            rewardsAggregator_p.addStep(step_cntr, rewards_l)
@@ -0,0 +1,13 @@
+from .cache import simulationKey
+from .cache import ResultCache
+from .cache import cachedRun
+from .cache import cachedRuns
+from .cache import cachedAggregates
+
+__all__ = [
+    "simulationKey",
+    "ResultCache",
+    "cachedRun",
+    "cachedRuns",
+    "cachedAggregates"
+]
\ No newline at end of file
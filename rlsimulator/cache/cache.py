@@ -0,0 +1,251 @@
+ # cache.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+from ..batchSimulator import BatchSimulator
+from ..parallelRunner import runParallel
+from ..parallelRunner import aggregateParallel
+from ..utils.utils import RunsAggregator
+
+import os
+import copy
+import json
+import pickle
+import inspect
+import tempfile
+import hashlib
+import numpy as np
+
+# bumped whenever a change of the simulation code changes the results of a given spec
+CACHE_VERSION = 1
+
+# attributes holding random generators or values already drawn from them, which the seed describes
+RANDOM_STATE_ATTRIBUTES = ("rng_", "generator_", "uniformsBuffer_", "uniformsPosition_", "variatesBuffer_", "bufferPosition_", "greedyTree_", "walk_")
+
+def _describe(value_p):
+    """
+    returns a json-serializable description of value_p, identical for equal parameters.
+    """
+    if isinstance(value_p, np.ndarray):
+        return {"dtype": value_p.dtype.str, "shape": list(value_p.shape), "values": value_p.tolist()}
+    if isinstance(value_p, np.generic):
+        return value_p.item()
+    if value_p is None or isinstance(value_p, (bool, int, float, str)):
+        return value_p
+    if isinstance(value_p, (list, tuple)):
+        return [_describe(item_l) for item_l in value_p]
+    if isinstance(value_p, dict):
+        return {str(key_l): _describe(item_l) for key_l, item_l in value_p.items()}
+    if isinstance(value_p, type) or inspect.isroutine(value_p):
+        return getattr(value_p, "__module__", "") + "." + getattr(value_p, "__qualname__", repr(value_p))
+    if hasattr(value_p, "__dict__") or hasattr(value_p, "__slots__"):
+        # objects keeping their attributes in slots, the policies, give them as their pickled state
+        state_l = value_p.__getstate__() if hasattr(value_p, "__slots__") else vars(value_p)
+        attributes_l = {name_l: attribute_l for name_l, attribute_l in state_l.items() if name_l not in RANDOM_STATE_ATTRIBUTES}
+        return {"class": type(value_p).__module__ + "." + type(value_p).__qualname__, "attributes": _describe(attributes_l)}
+    return repr(value_p)
+
+def simulationKey(simulator_p, kind_p, **params_p):
+    """
+    returns the hexadecimal sha256 digest identifying a simulation of simulator_p: its policy class
+     and parameters, its bandits, its initial evaluations, its seed, the kind of results kind_p and
+     the parameters params_p of the simulation eg. the number of steps and runs.
+
+    The simulator's policy is described as reinitialized, so that the key does not depend on the
+     steps already simulated. Simulators seeded with fresh entropy never get the same key twice.
+    """
+    policy_l = copy.deepcopy(simulator_p.policy_)
+    policy_l.reinit(simulator_p.initialEvals_)
+    description_l = {"version": CACHE_VERSION, "kind": kind_p, "policy": _describe(policy_l),
+                     "bandits": _describe(simulator_p.banditsList_), "initialEvals": _describe(simulator_p.initialEvals_),
+                     "entropy": _describe(simulator_p.seedSequence_.entropy), "params": _describe(params_p)}
+    return hashlib.sha256(json.dumps(description_l, sort_keys=True).encode()).hexdigest()
+
+class ResultCache:
+    """
+    Content-addressed cache of simulation results on the local disk.
+
+    Each entry is a .npz file of arrays named after its key. Reading an entry marks it as recently
+     used, and entries are evicted least recently used first when the cache exceeds its size.
+    The entries of cachedRun hold pickled states, loaded on a hit: only share a cache directory with
+     writers you trust.
+
+    Parameters
+    ----------
+    directory_p : directory of the cache, created if needed. Defaults to ~/.cache/rlsimulator.
+
+    maxBytes_p : maximal size of the cache in bytes.
+
+    Attributes
+    ----------
+    directory_ : directory of the cache.
+
+    maxBytes_ : maximal size of the cache in bytes.
+
+    Methods
+    -------
+    get : returns the arrays of an entry, None on a miss.
+
+    put : stores the arrays of an entry and evicts the least recently used ones.
+
+    clear : removes every entry.
+    """
+
+    def __init__(self, directory_p=None, maxBytes_p=2**30):
+        if directory_p is None:
+            directory_p = os.path.join(os.path.expanduser("~"), ".cache", "rlsimulator")
+        self.directory_ = directory_p
+        self.maxBytes_ = maxBytes_p
+        os.makedirs(directory_p, exist_ok=True)
+
+    def _entryPath(self, key_p):
+        return os.path.join(self.directory_, key_p + ".npz")
+
+    def _entries(self):
+        entries_l = []
+        for name_l in os.listdir(self.directory_):
+            if name_l.endswith(".npz"):
+                try:
+                    stat_l = os.stat(os.path.join(self.directory_, name_l))
+                except FileNotFoundError:
+                    continue
+                entries_l.append((stat_l.st_mtime, stat_l.st_size, name_l))
+        return entries_l
+
+    def get(self, key_p):
+        """
+        returns the dict of the arrays stored under key_p, None if there are none.
+        """
+        path_l = self._entryPath(key_p)
+        try:
+            with np.load(path_l) as entry_l:
+                arrays_l = {name_l: entry_l[name_l] for name_l in entry_l.files}
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        # the modification time orders the entries for the eviction
+        os.utime(path_l)
+        return arrays_l
+
+    def put(self, key_p, arrays_p):
+        """
+        stores the dict of arrays arrays_p under key_p, then evicts the least recently used entries
+         until the cache fits in maxBytes_.
+        """
+        # written under a unique name that _entries skips, so that concurrent writers neither count
+        # nor evict the entries being written
+        temporaryFile_l, temporaryPath_l = tempfile.mkstemp(suffix=".npz.tmp", dir=self.directory_)
+        try:
+            with os.fdopen(temporaryFile_l, "wb") as entryFile_l:
+                np.savez(entryFile_l, **arrays_p)
+            os.replace(temporaryPath_l, self._entryPath(key_p))
+        except BaseException:
+            os.remove(temporaryPath_l)
+            raise
+
+        entries_l = sorted(self._entries())
+        totalBytes_l = sum(size_l for _, size_l, _ in entries_l)
+        for _, size_l, name_l in entries_l:
+            if totalBytes_l <= self.maxBytes_ or name_l == key_p + ".npz":
+                break
+            try:
+                os.remove(os.path.join(self.directory_, name_l))
+            except FileNotFoundError:
+                pass
+            totalBytes_l -= size_l
+
+    def clear(self):
+        for _, _, name_l in self._entries():
+            os.remove(os.path.join(self.directory_, name_l))
+
+def cachedRun(simulator_p, nsteps_p, cache_p, recordEvals_p=False, evalsStride_p=1):
+    """
+    returns the (actions, rewards, evals) of the next nsteps_p steps of the simulator, as returned by
+     Simulator.run, read from cache_p when the steps were already simulated.
+
+    Entries hold the actions, the rewards and the evaluations of the steps, along with the state of
+     the policy and of the bandits after them. On a hit, the policy and the bandits are set to that
+     state and the history, the counts, the metrics and the step of the simulator are updated from
+     the cached steps, so that the simulator continues as if it had simulated them.
+    Only steps from the start of a run are cached, since the key describes the simulator as
+     reinitialized. Steps from later on, and steps of a simulator being profiled, are simulated.
+    The state is pickled, and unpickling runs code chosen by whoever wrote the entry: only read
+     entries from a cache directory written by you or by writers you trust.
+    """
+    if simulator_p.step_ != 0 or simulator_p.profiler_ is not None:
+        return simulator_p.run(nsteps_p, recordEvals_p, evalsStride_p)
+
+    key_l = simulationKey(simulator_p, "run", nsteps=nsteps_p, run=simulator_p.run_, recordEvals=recordEvals_p, evalsStride=evalsStride_p)
+    arrays_l = cache_p.get(key_l)
+    if arrays_l is None:
+        actions_l, rewards_l, evals_l = simulator_p.run(nsteps_p, recordEvals_p, evalsStride_p)
+        state_l = pickle.dumps((simulator_p.policy_, simulator_p.banditsList_), pickle.HIGHEST_PROTOCOL)
+        arrays_l = {"actions": actions_l, "rewards": rewards_l, "state": np.frombuffer(state_l, dtype=np.uint8)}
+        if recordEvals_p:
+            arrays_l["evals"] = evals_l
+        cache_p.put(key_l, arrays_l)
+        return actions_l, rewards_l, evals_l
+
+    policy_l, banditsList_l = pickle.loads(arrays_l["state"].tobytes())
+    simulator_p.policy_.__setstate__(policy_l.__getstate__())
+    for bandit_l, cachedBandit_l in zip(simulator_p.banditsList_, banditsList_l):
+        vars(bandit_l).update(vars(cachedBandit_l))
+    simulator_p._recordSteps(arrays_l["actions"], arrays_l["rewards"])
+    return arrays_l["actions"], arrays_l["rewards"], arrays_l.get("evals")
+
+def cachedRuns(simulator_p, nsteps_p, runs_p, cache_p, recordEvals_p=False, nbWorkers_p=1, firstRun_p=None):
+    """
+    returns the (actions, rewards, evals) history of runs_p runs of the simulator, as returned by
+     BatchSimulator.run, read from cache_p when they were already simulated.
+    Runs are simulated in lockstep, spread over nbWorkers_p processes when greater than 1.
+    """
+    if firstRun_p is None:
+        firstRun_p = simulator_p.run_
+    key_l = simulationKey(simulator_p, "runs", nsteps=nsteps_p, runs=runs_p, firstRun=firstRun_p, recordEvals=recordEvals_p)
+    arrays_l = cache_p.get(key_l)
+    if arrays_l is None:
+        if nbWorkers_p > 1:
+            actions_l, rewards_l, evals_l = runParallel(simulator_p, nsteps_p, runs_p, nbWorkers_p, recordEvals_p, firstRun_p)
+        else:
+            actions_l, rewards_l, evals_l = BatchSimulator(simulator_p, runs_p, firstRun_p).run(nsteps_p, recordEvals_p)
+        arrays_l = {"actions": actions_l, "rewards": rewards_l}
+        if recordEvals_p:
+            arrays_l["evals"] = evals_l
+        cache_p.put(key_l, arrays_l)
+    return arrays_l["actions"], arrays_l["rewards"], arrays_l.get("evals")
+
+def _toArrays(aggregator_p, prefix_p):
+    return {prefix_p + "Counts": aggregator_p.counts_, prefix_p + "Mean": aggregator_p.mean_, prefix_p + "M2": aggregator_p.m2_}
+
+def _fromArrays(arrays_p, prefix_p):
+    aggregator_l = RunsAggregator(len(arrays_p[prefix_p + "Counts"]), arrays_p[prefix_p + "Mean"].shape[1:])
+    aggregator_l.counts_ = arrays_p[prefix_p + "Counts"]
+    aggregator_l.mean_ = arrays_p[prefix_p + "Mean"]
+    aggregator_l.m2_ = arrays_p[prefix_p + "M2"]
+    return aggregator_l
+
+def cachedAggregates(simulator_p, nsteps_p, runs_p, cache_p, aggregateEvals_p=False, nbWorkers_p=1, firstRun_p=None, showProgress_p=False):
+    """
+    returns the RunsAggregators of the rewards, and of the evaluations if aggregateEvals_p, of runs_p
+     runs of the simulator, read from cache_p when they were already simulated.
+    Runs are simulated in lockstep, spread over nbWorkers_p processes when greater than 1.
+    """
+    if firstRun_p is None:
+        firstRun_p = simulator_p.run_
+    key_l = simulationKey(simulator_p, "aggregates", nsteps=nsteps_p, runs=runs_p, firstRun=firstRun_p, aggregateEvals=aggregateEvals_p)
+    arrays_l = cache_p.get(key_l)
+    if arrays_l is not None:
+        return _fromArrays(arrays_l, "rewards"), _fromArrays(arrays_l, "evals") if aggregateEvals_p else None
+
+    if nbWorkers_p > 1:
+        rewardsAggregator_l, evalsAggregator_l = aggregateParallel(simulator_p, nsteps_p, runs_p, nbWorkers_p, aggregateEvals_p, firstRun_p)
+    else:
+        rewardsAggregator_l = RunsAggregator(nsteps_p)
+        evalsAggregator_l = RunsAggregator(nsteps_p, (simulator_p.nbBandits_,)) if aggregateEvals_p else None
+        BatchSimulator(simulator_p, runs_p, firstRun_p).aggregate(nsteps_p, rewardsAggregator_l, evalsAggregator_l, showProgress_p)
+    arrays_l = _toArrays(rewardsAggregator_l, "rewards")
+    if aggregateEvals_p:
+        arrays_l.update(_toArrays(evalsAggregator_l, "evals"))
+    cache_p.put(key_l, arrays_l)
+    return rewardsAggregator_l, evalsAggregator_l
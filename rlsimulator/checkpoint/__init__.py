@@ -0,0 +1,7 @@
+from .checkpoint import Checkpointer
+from .checkpoint import resumeCheckpoint
+
+__all__ = [
+    "Checkpointer",
+    "resumeCheckpoint"
+]
\ No newline at end of file
@@ -0,0 +1,190 @@
+ # checkpoint.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+from ..utils.utils import ArrayHistory
+
+import os
+import re
+import pickle
+import numpy as np
+
+# bumped whenever a change of the simulation classes makes older checkpoints unreadable
+CHECKPOINT_VERSION = 1
+CHECKPOINT_FILE = "checkpoint.pkl"
+STREAM_FILE_PATTERN = re.compile(r"stream(\d{4})_\d{5}\.npy$")
+
+def _chunkPath(path_p, stream_p, chunk_p):
+    return os.path.join(path_p, "stream%04i_%05i.npy" % (stream_p, chunk_p))
+
+class _CheckpointPickler(pickle.Pickler):
+    # growable histories are written to their own chunk files, the pickle only references them
+    def __init__(self, file_p, checkpointer_p):
+        super().__init__(file_p, pickle.HIGHEST_PROTOCOL)
+        self.checkpointer_ = checkpointer_p
+
+    def persistent_id(self, object_p):
+        if type(object_p) is ArrayHistory and object_p.length_ is None:
+            return self.checkpointer_._writeStream(object_p)
+        return None
+
+class _CheckpointUnpickler(pickle.Unpickler):
+    def __init__(self, file_p, checkpointer_p):
+        super().__init__(file_p)
+        self.checkpointer_ = checkpointer_p
+
+    def persistent_load(self, persistentId_p):
+        return self.checkpointer_._readStream(*persistentId_p)
+
+class Checkpointer:
+    """
+    Periodic checkpoints of a Simulator on disk, from which a simulation stopped at any point, eg.
+     by the preemption of its node, resumes with the results of an uninterrupted one.
+
+    A checkpoint is a directory holding the pickled simulator, with its step, counts, metrics, policy,
+     bandits and the states of their Generators and buffers, and the growable ArrayHistory of the
+     simulator and of its metrics as streams of .npy chunks of chunkSize_p values. History values are
+     only appended, so that each checkpoint writes the chunks filled since the previous one and
+     rewrites the last, partial, one: the cost of a checkpoint does not grow with the history.
+    The pickle is replaced atomically once the chunks are written, and chunks are written to a
+     temporary file then renamed, so that a checkpoint interrupted while being written leaves the
+     previous one readable. A reinit of the simulator starts new streams.
+    Checkpoints are pickles, only resume the ones you wrote.
+
+    Parameters
+    ----------
+    simulator_p : the simulator to checkpoint.
+
+    path_p : directory of the checkpoint, created if needed.
+
+    interval_p : number of steps between two checkpoints of runTo.
+
+    chunkSize_p : number of values of a history per chunk file.
+
+    Attributes
+    ----------
+    simulator_ : the simulator to checkpoint.
+
+    path_ : directory of the checkpoint.
+
+    interval_ : number of steps between two checkpoints of runTo.
+
+    lastCheckpointStep_ : step of the simulator at the last checkpoint written or resumed, None if none.
+
+    Methods
+    -------
+    save : writes a checkpoint of the simulator.
+
+    runTo : simulates up to a given step, checkpointing at regular intervals.
+    """
+
+    def __init__(self, simulator_p, path_p, interval_p=10**6, chunkSize_p=2**20):
+        self.simulator_ = simulator_p
+        self.path_ = path_p
+        self.interval_ = interval_p
+        self.chunkSize_ = chunkSize_p
+        self.lastCheckpointStep_ = None
+        self.lastCheckpointRun_ = None
+        # streams written, by id of their history, as [history, stream index, number of values written]
+        self.streams_ = {}
+
+        os.makedirs(path_p, exist_ok=True)
+        # streams of a checkpoint already in the directory are kept until this one replaces it
+        self.nextStream_ = max(self._streamFiles().values(), default=-1) + 1
+
+    def _streamFiles(self):
+        streamFiles_l = {}
+        for name_l in os.listdir(self.path_):
+            match_l = STREAM_FILE_PATTERN.match(name_l)
+            if match_l is not None:
+                streamFiles_l[name_l] = int(match_l.group(1))
+        return streamFiles_l
+
+    def _writeStream(self, history_p):
+        stream_l = self.streams_.get(id(history_p))
+        if stream_l is None:
+            stream_l = [history_p, self.nextStream_, 0]
+            self.streams_[id(history_p)] = stream_l
+            self.nextStream_ += 1
+        _, streamIndex_l, written_l = stream_l
+
+        if history_p.count_ > written_l:
+            values_l = history_p.values_[:history_p.count_]
+            for chunk_cntr in range(written_l // self.chunkSize_, -(-history_p.count_ // self.chunkSize_)):
+                temporaryPath_l = os.path.join(self.path_, "stream.tmp.npy")
+                np.save(temporaryPath_l, values_l[chunk_cntr*self.chunkSize_:(chunk_cntr+1)*self.chunkSize_])
+                os.replace(temporaryPath_l, _chunkPath(self.path_, streamIndex_l, chunk_cntr))
+            stream_l[2] = history_p.count_
+        return ("ArrayHistory", streamIndex_l, history_p.count_, history_p.total_, history_p.values_.dtype.str, self.chunkSize_)
+
+    def _readStream(self, kind_p, streamIndex_p, count_p, total_p, dtype_p, chunkSize_p):
+        history_l = ArrayHistory(np.dtype(dtype_p), capacity_p=count_p)
+        for chunk_cntr in range(-(-count_p // chunkSize_p)):
+            chunk_l = np.load(_chunkPath(self.path_, streamIndex_p, chunk_cntr), mmap_mode="r")
+            firstValue_l = chunk_cntr * chunkSize_p
+            lastValue_l = min(count_p, firstValue_l + chunkSize_p)
+            history_l.values_[firstValue_l:lastValue_l] = chunk_l[:lastValue_l-firstValue_l]
+        history_l.count_ = count_p
+        history_l.total_ = total_p
+        self.streams_[id(history_l)] = [history_l, streamIndex_p, count_p]
+        self.nextStream_ = max(self.nextStream_, streamIndex_p + 1)
+        return history_l
+
+    def save(self):
+        """
+        writes a checkpoint of the simulator at its current step, replacing the previous one.
+        """
+        simulator_l = self.simulator_
+        if simulator_l.run_ != self.lastCheckpointRun_ or (self.lastCheckpointStep_ is not None and simulator_l.step_ < self.lastCheckpointStep_):
+            # the histories were cleared by a reinit since the last checkpoint
+            self.streams_ = {}
+
+        state_l = {"version": CHECKPOINT_VERSION, "interval": self.interval_, "chunkSize": self.chunkSize_, "simulator": simulator_l}
+        temporaryPath_l = os.path.join(self.path_, CHECKPOINT_FILE + ".tmp")
+        with open(temporaryPath_l, "wb") as checkpointFile_l:
+            _CheckpointPickler(checkpointFile_l, self).dump(state_l)
+            checkpointFile_l.flush()
+            os.fsync(checkpointFile_l.fileno())
+        os.replace(temporaryPath_l, os.path.join(self.path_, CHECKPOINT_FILE))
+        self.lastCheckpointStep_ = simulator_l.step_
+        self.lastCheckpointRun_ = simulator_l.run_
+
+        # histories no longer referenced, eg. replaced by a reinit, have their chunks removed
+        liveStreams_l = set(stream_l[1] for stream_l in self.streams_.values())
+        for name_l, streamIndex_l in self._streamFiles().items():
+            if streamIndex_l not in liveStreams_l:
+                os.remove(os.path.join(self.path_, name_l))
+
+    def runTo(self, lastStep_p):
+        """
+        simulates the steps of the simulator up to the step lastStep_p with Simulator.run, writing a
+         checkpoint at each multiple of interval_ steps and at the end. A resumed simulation is
+         completed by the same call as the one interrupted.
+        The steps are run by the same pieces whatever the step resumed from, so that the running
+         totals of the histories, summed per piece, are also those of an uninterrupted call.
+        """
+        simulator_l = self.simulator_
+        while simulator_l.step_ < lastStep_p:
+            nextCheckpointStep_l = min(lastStep_p, (simulator_l.step_ // self.interval_ + 1) * self.interval_)
+            simulator_l.run(nextCheckpointStep_l - simulator_l.step_)
+            self.save()
+
+def resumeCheckpoint(path_p):
+    """
+    returns a Checkpointer of the simulator restored from the checkpoint in the directory path_p,
+     with the interval and chunk size it was written with.
+    """
+    checkpointer_l = Checkpointer(None, path_p)
+    with open(os.path.join(path_p, CHECKPOINT_FILE), "rb") as checkpointFile_l:
+        state_l = _CheckpointUnpickler(checkpointFile_l, checkpointer_l).load()
+    if state_l["version"] != CHECKPOINT_VERSION:
+        raise ValueError("the checkpoint %s was written by another version of rlsimulator" % path_p)
+
+    checkpointer_l.simulator_ = state_l["simulator"]
+    checkpointer_l.interval_ = state_l["interval"]
+    checkpointer_l.chunkSize_ = state_l["chunkSize"]
+    checkpointer_l.lastCheckpointStep_ = checkpointer_l.simulator_.step_
+    checkpointer_l.lastCheckpointRun_ = checkpointer_l.simulator_.run_
+    return checkpointer_l
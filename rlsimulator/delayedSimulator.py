@@ -0,0 +1,144 @@
+ # delayedSimulator.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import numpy as np
+
+class DelayedSimulator:
+    """
+    Class simulating a bandits problem where actions are decided by batches and their rewards are
+     revealed to the policy after a delay.
+
+    Each batch of actions is chosen from the current state of the policy with getNexActions, as the
+     actions of a batch of requests served before any of their rewards comes back. The rewards are
+     drawn at the steps of the decisions, per bandit with getRewards, and reach the policy delay
+     steps later: the rewards arrived by the end of a batch are applied with one updateMany before the
+     next batch is decided. With batches of one action and no delay, the results are those of
+     Simulator.nextStep.
+
+    The history, counts and metrics of the simulator are updated at the decisions, so that the
+     regret measures the cost of deciding on stale evaluations.
+
+    Parameters
+    ----------
+    simulator_p : the simulator whose policy, bandits, history and metrics are used.
+
+    batchSize_p : number of actions decided together.
+
+    delay_p : number of steps between a decision and the reveal of its reward, or function
+     delay_p(rng, size) returning an array of size random delays drawn from the numpy Generator rng.
+
+    Attributes
+    ----------
+    simulator_ : the simulator.
+
+    batchSize_ : number of actions decided together.
+
+    delay_ : delay of the rewards, or function drawing them.
+
+    pendingSteps_, pendingActions_, pendingRewards_ : arrays of the arrival step, of the action and
+     of the reward of the feedback not applied to the policy yet, in the order of the decisions.
+
+    Methods
+    -------
+    reinit : restarts the simulation, discarding the pending feedback.
+
+    nextBatch : applies the feedback arrived and returns the actions of the next batch and their rewards.
+
+    run : simulates several steps by batches and returns their actions and rewards.
+
+    flush : applies all the pending feedback.
+
+    getPendingCount : returns the number of rewards not revealed to the policy yet.
+    """
+
+    def __init__(self, simulator_p, batchSize_p, delay_p=0):
+        self.simulator_ = simulator_p
+        self.batchSize_ = batchSize_p
+        self.delay_ = delay_p
+        self._clearPending()
+
+    def _clearPending(self):
+        self.pendingSteps_ = np.zeros(0, dtype=np.int64)
+        self.pendingActions_ = np.zeros(0, dtype=np.int64)
+        self.pendingRewards_ = np.zeros(0)
+
+    def reinit(self, run_p=None):
+        """
+        restarts the simulation with the run run_p of the simulator, the next run by default.
+        """
+        self._clearPending()
+        self.simulator_.reinit(run_p)
+
+    def getPendingCount(self):
+        return len(self.pendingSteps_)
+
+    def _applyFeedback(self, step_p):
+        # rewards arrived by step_p, applied in the order of their arrival then of their decision
+        arrived_l = self.pendingSteps_ <= step_p
+        if not arrived_l.any():
+            return
+        order_l = np.argsort(self.pendingSteps_[arrived_l], kind="stable")
+        self.simulator_.policy_.updateMany(self.pendingActions_[arrived_l][order_l], self.pendingRewards_[arrived_l][order_l])
+        self.pendingSteps_ = self.pendingSteps_[~arrived_l]
+        self.pendingActions_ = self.pendingActions_[~arrived_l]
+        self.pendingRewards_ = self.pendingRewards_[~arrived_l]
+
+    def flush(self):
+        """
+        applies all the pending feedback to the policy.
+        """
+        self._applyFeedback(np.iinfo(np.int64).max)
+
+    def nextBatch(self, batchSize_p=None):
+        """
+        applies the feedback arrived by the current step and returns the arrays of the actions of
+         the next batch of batchSize_p decisions, batchSize_ by default, and of their rewards.
+        """
+        simulator_l = self.simulator_
+        batchSize_l = self.batchSize_ if batchSize_p is None else batchSize_p
+        self._applyFeedback(simulator_l.step_)
+
+        actions_l = simulator_l.policy_.getNexActions(batchSize_l)
+        steps_l = np.arange(simulator_l.step_+1, simulator_l.step_+1+batchSize_l)
+
+        # each bandit draws the rewards of its pulls at once, in the order of the steps
+        rewards_l = np.empty(batchSize_l)
+        order_l = np.argsort(actions_l, kind="stable")
+        bounds_l = np.flatnonzero(np.diff(actions_l[order_l])) + 1
+        for pulls_l in np.split(order_l, bounds_l):
+            if len(pulls_l) > 0:
+                rewards_l[pulls_l] = simulator_l.banditsList_[actions_l[pulls_l[0]]].getRewards(steps_l[pulls_l])
+
+        simulator_l.actionsHistory_.extend(actions_l)
+        simulator_l.rewardsHistory_.extend(rewards_l)
+        simulator_l.actionsCounts_ += np.bincount(actions_l, minlength=simulator_l.nbBandits_)
+        for metric_l in simulator_l.metricsList_:
+            for step_l, action_l, reward_l in zip(steps_l.tolist(), actions_l.tolist(), rewards_l.tolist()):
+                metric_l.update(step_l, action_l, reward_l)
+        simulator_l.step_ += batchSize_l
+
+        if callable(self.delay_):
+            delays_l = np.asarray(self.delay_(simulator_l.rng_, batchSize_l), dtype=np.int64)
+        else:
+            delays_l = self.delay_
+        self.pendingSteps_ = np.concatenate((self.pendingSteps_, steps_l + delays_l))
+        self.pendingActions_ = np.concatenate((self.pendingActions_, actions_l))
+        self.pendingRewards_ = np.concatenate((self.pendingRewards_, rewards_l))
+
+        return actions_l, rewards_l
+
+    def run(self, nsteps_p):
+        """
+        simulates nsteps_p steps by batches of batchSize_ decisions, the last one possibly smaller,
+         and returns the (nsteps,) arrays of the actions performed and of the rewards obtained.
+        The feedback still pending at the end is kept for the next steps.
+        """
+        actions_l = np.empty(nsteps_p, dtype=np.int64)
+        rewards_l = np.empty(nsteps_p)
+        for firstStep_l in range(0, nsteps_p, self.batchSize_):
+            batchSize_l = min(self.batchSize_, nsteps_p - firstStep_l)
+            actions_l[firstStep_l:firstStep_l+batchSize_l], rewards_l[firstStep_l:firstStep_l+batchSize_l] = self.nextBatch(batchSize_l)
+        return actions_l, rewards_l
@@ -0,0 +1,7 @@
+from .estimators import SlidingWindowEstimator
+from .estimators import DiscountedEstimator
+
+__all__ = [
+    "SlidingWindowEstimator",
+    "DiscountedEstimator"
+]
\ No newline at end of file
@@ -0,0 +1,190 @@
+ # estimators.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import numpy as np
+
+class _BaseEstimator:
+    """
+    Abstract base class for the estimators of the mean rewards of the bandits that forget old
+     rewards, used by the policies of non-stationary bandits.
+
+    Methods
+    -------
+    reinit : forgets all the rewards.
+
+    addBandit : adds a bandit to the estimated bandits.
+
+    update : abstract. adds a reward and returns the list of the bandits whose estimate changed.
+
+    getEstimate : abstract. returns the estimate of a bandit.
+
+    getEstimates : abstract. returns the array of the estimates of all the bandits.
+
+    getCounts : abstract. returns the array of the number of rewards of each bandit still weighing
+     in its estimate at a given step.
+
+    getHorizon : abstract. returns the number of rewards of all the bandits still weighing in the
+     estimates at a given step.
+    """
+
+    def reinit(self, initialEvals_p):
+        self.initialEvals_ = np.array(initialEvals_p, dtype=float)
+        self.counts_ = np.zeros(len(initialEvals_p))
+        self.sums_ = np.zeros(len(initialEvals_p))
+
+    def addBandit(self, initialEval_p):
+        self.initialEvals_ = np.append(self.initialEvals_, float(initialEval_p))
+        self.counts_ = np.append(self.counts_, 0.)
+        self.sums_ = np.append(self.sums_, 0.)
+
+    def update(self, step_p, action_p, reward_p):
+        pass
+
+    def getEstimate(self, action_p):
+        pass
+
+    def getEstimates(self):
+        pass
+
+    def getCounts(self, step_p):
+        pass
+
+    def getHorizon(self, step_p):
+        pass
+
+class SlidingWindowEstimator(_BaseEstimator):
+    """
+    Sample averages over the last window_ rewards observed, of all the bandits together.
+
+    The rewards of the window are kept in a ring buffer along with their bandit: each new reward
+     evicts the oldest one, so that an update adds one reward to a running sum and removes at most one
+     from another, in O(1) instead of a rescan of the window. A bandit without reward in the window is
+     estimated by its initial score.
+
+    Parameters
+    ----------
+    window_p : number of last rewards observed kept in the window.
+
+    Attributes
+    ----------
+    window_ : number of last rewards observed kept in the window.
+
+    windowActions_ : ring buffer of the bandits of the rewards of the window.
+
+    windowRewards_ : ring buffer of the rewards of the window.
+
+    nbObservations_ : number of rewards observed since the last reinit.
+
+    counts_ : array of the number of rewards of each bandit in the window.
+
+    sums_ : array of the running sum of the rewards of each bandit in the window.
+    """
+
+    def __init__(self, window_p):
+        self.window_ = window_p
+        self.reinit([])
+
+    def reinit(self, initialEvals_p):
+        super().reinit(initialEvals_p)
+        self.windowActions_ = [0] * self.window_
+        self.windowRewards_ = [0.] * self.window_
+        self.nbObservations_ = 0
+
+    def update(self, step_p, action_p, reward_p):
+        position_l = self.nbObservations_ % self.window_
+        changedActions_l = [action_p]
+        if self.nbObservations_ >= self.window_:
+            evictedAction_l = self.windowActions_[position_l]
+            self.counts_[evictedAction_l] -= 1
+            if self.counts_[evictedAction_l] == 0:
+                # reset rather than subtracted, so that rounding errors do not outlive the rewards
+                self.sums_[evictedAction_l] = 0.
+            else:
+                self.sums_[evictedAction_l] -= self.windowRewards_[position_l]
+            if evictedAction_l != action_p:
+                changedActions_l.append(evictedAction_l)
+
+        self.windowActions_[position_l] = action_p
+        self.windowRewards_[position_l] = reward_p
+        self.counts_[action_p] += 1
+        self.sums_[action_p] += reward_p
+        self.nbObservations_ += 1
+        return changedActions_l
+
+    def getEstimate(self, action_p):
+        count_l = self.counts_[action_p]
+        return float(self.sums_[action_p] / count_l) if count_l > 0 else float(self.initialEvals_[action_p])
+
+    def getEstimates(self):
+        return np.where(self.counts_ > 0, self.sums_ / np.maximum(self.counts_, 1), self.initialEvals_)
+
+    def getCounts(self, step_p):
+        return self.counts_
+
+    def getHorizon(self, step_p):
+        return min(self.nbObservations_, self.window_)
+
+class DiscountedEstimator(_BaseEstimator):
+    """
+    Discounted sample averages: a reward observed k steps ago weighs discount_**k.
+
+    The discounted sum and count of a bandit are stored as of the last step it was updated, and
+     brought to the current step by a single factor discount_**elapsedSteps when it is updated or
+     read, rather than decaying every bandit at every step. The estimate of a bandit, a ratio of its
+     discounted sum and count, does not change while it is not pulled.
+
+    Parameters
+    ----------
+    discount_p : discount factor applied to the weight of the rewards at each step, in ]0, 1].
+
+    Attributes
+    ----------
+    discount_ : discount factor applied at each step.
+
+    counts_ : array of the discounted count of each bandit as of its last update.
+
+    sums_ : array of the discounted sum of the rewards of each bandit as of its last update.
+
+    lastSteps_ : array of the step of the last update of each bandit.
+
+    total_ : discounted count of the rewards of all the bandits as of lastStep_.
+    """
+
+    def __init__(self, discount_p):
+        self.discount_ = discount_p
+        self.reinit([])
+
+    def reinit(self, initialEvals_p):
+        super().reinit(initialEvals_p)
+        self.lastSteps_ = np.zeros(len(initialEvals_p), dtype=np.int64)
+        self.total_ = 0.
+        self.lastStep_ = 0
+
+    def addBandit(self, initialEval_p):
+        super().addBandit(initialEval_p)
+        self.lastSteps_ = np.append(self.lastSteps_, 0)
+
+    def update(self, step_p, action_p, reward_p):
+        decay_l = self.discount_ ** (step_p - self.lastSteps_[action_p])
+        self.counts_[action_p] = self.counts_[action_p] * decay_l + 1
+        self.sums_[action_p] = self.sums_[action_p] * decay_l + reward_p
+        self.lastSteps_[action_p] = step_p
+        self.total_ = self.total_ * self.discount_ ** (step_p - self.lastStep_) + 1
+        self.lastStep_ = step_p
+        return [action_p]
+
+    def getEstimate(self, action_p):
+        count_l = self.counts_[action_p]
+        return float(self.sums_[action_p] / count_l) if count_l > 0 else float(self.initialEvals_[action_p])
+
+    def getEstimates(self):
+        return np.where(self.counts_ > 0, self.sums_ / np.where(self.counts_ > 0, self.counts_, 1), self.initialEvals_)
+
+    def getCounts(self, step_p):
+        return self.counts_ * self.discount_ ** (step_p - self.lastSteps_)
+
+    def getHorizon(self, step_p):
+        return self.total_ * self.discount_ ** (step_p - self.lastStep_)
@@ -0,0 +1,27 @@
+from .metrics import rollingMean
+from .metrics import ewma
+from .metrics import cumulativeAverage
+from .metrics import percentOptimalAction
+from .metrics import expectedRewards
+from .metrics import optimalActions
+from .metrics import regret
+from .metrics import RollingMean
+from .metrics import Ewma
+from .metrics import CumulativeAverage
+from .metrics import PercentOptimalAction
+from .metrics import Regret
+
+__all__ = [
+    "rollingMean",
+    "ewma",
+    "cumulativeAverage",
+    "percentOptimalAction",
+    "expectedRewards",
+    "optimalActions",
+    "regret",
+    "RollingMean",
+    "Ewma",
+    "CumulativeAverage",
+    "PercentOptimalAction",
+    "Regret"
+]
\ No newline at end of file
@@ -0,0 +1,338 @@
+ # metrics.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+from ..utils.utils import ArrayHistory
+from ..bandits.bandits import _BaseBandit
+
+import numpy as np
+
+def rollingMean(values_p, window_p):
+    """
+    returns the mean of each value and of the window_p-1 values preceding it, computed from cumulative
+     sums. The first values are averaged over the values available.
+    """
+    values_l = np.asarray(values_p, dtype=float)
+    cumsum_l = np.concatenate(([0.], np.cumsum(values_l)))
+    ends_l = np.arange(1, len(values_l)+1)
+    starts_l = np.maximum(0, ends_l - window_p)
+    return (cumsum_l[ends_l] - cumsum_l[starts_l]) / (ends_l - starts_l)
+
+def ewma(values_p, alpha_p):
+    """
+    returns the exponentially weighted moving average of the values,
+     ewma[t] = (1-alpha_p) * ewma[t-1] + alpha_p * values[t] with ewma[0] = values[0].
+
+    The recurrence is solved by a doubling scan: after the pass d each entry holds its weighted sum
+     over the last 2*d values, so that log2(len(values_p)) array operations are needed at most, fewer
+     when the weights vanish.
+    """
+    values_l = np.asarray(values_p, dtype=float)
+    if len(values_l) == 0:
+        return values_l
+    decay_l = 1 - alpha_p
+    sums_l = alpha_p * values_l
+    span_l = 1
+    weight_l = decay_l
+    while span_l < len(values_l) and weight_l != 0:
+        sums_l[span_l:] = sums_l[span_l:] + weight_l * sums_l[:-span_l]
+        span_l *= 2
+        weight_l *= weight_l
+    # the first value stands for the average before the first step
+    return sums_l + decay_l ** np.arange(1, len(values_l)+1) * values_l[0]
+
+def cumulativeAverage(values_p):
+    """
+    returns the average of the values up to each step.
+    """
+    values_l = np.asarray(values_p, dtype=float)
+    return np.cumsum(values_l) / np.arange(1, len(values_l)+1)
+
+def percentOptimalAction(actions_p, optimalActions_p):
+    """
+    returns the percentage of optimal actions.
+
+    For a single run, actions_p of shape (nsteps,), the percentage over the steps up to each step.
+    For several runs, actions_p of shape (nbRuns, nsteps), the percentage over the runs at each step.
+
+    optimalActions_p : index of the optimal bandit, or array of the optimal bandit at each step.
+    """
+    optimal_l = (np.asarray(actions_p) == np.asarray(optimalActions_p))
+    if optimal_l.ndim == 2:
+        return 100 * optimal_l.mean(axis=0)
+    return 100 * cumulativeAverage(optimal_l)
+
+def _lacksExpectedRewards(bandit_p):
+    # bandits inheriting the abstract getExpectedReward would give nan expected rewards
+    banditClass_l = type(bandit_p)
+    return banditClass_l.getExpectedReward is _BaseBandit.getExpectedReward and banditClass_l.getExpectedRewards is _BaseBandit.getExpectedRewards
+
+def implementsExpectedRewards(banditsList_p):
+    """
+    returns whether every bandit of banditsList_p implements getExpectedReward.
+    """
+    return not any(_lacksExpectedRewards(bandit_l) for bandit_l in banditsList_p)
+
+def _checkExpectedRewards(banditsList_p):
+    for bandit_l in banditsList_p:
+        if _lacksExpectedRewards(bandit_l):
+            raise TypeError("%s does not implement getExpectedReward, its expected rewards are unknown" % type(bandit_l).__name__)
+
+def expectedRewards(banditsList_p, steps_p):
+    """
+    returns the (nbBandits, len(steps_p)) array of the expected reward of each bandit at each step.
+    Raises a TypeError if a bandit does not implement getExpectedReward.
+    """
+    _checkExpectedRewards(banditsList_p)
+    return np.array([bandit_l.getExpectedRewards(steps_p) for bandit_l in banditsList_p], dtype=float).reshape(len(banditsList_p), len(steps_p))
+
+def optimalActions(banditsList_p, steps_p):
+    """
+    returns the array of the index of the bandit with the highest expected reward at each step.
+    """
+    return np.argmax(expectedRewards(banditsList_p, steps_p), axis=0)
+
+def regret(actions_p, banditsList_p):
+    """
+    returns the instantaneous and the cumulative regret of the actions performed at steps 1, 2, ...
+     ie. the expected reward of the best bandit minus the one of the pulled bandit, and its sum.
+
+    actions_p : actions of a run, shape (nsteps,), or of several runs, shape (nbRuns, nsteps).
+    """
+    actions_l = np.asarray(actions_p)
+    steps_l = np.arange(1, actions_l.shape[-1]+1)
+    expected_l = expectedRewards(banditsList_p, steps_l)
+    instantRegret_l = np.max(expected_l, axis=0) - expected_l[actions_l, steps_l-1]
+    return instantRegret_l, np.cumsum(instantRegret_l, axis=-1)
+
+
+class _BaseMetric:
+    """
+    Abstract base class for the metrics computed incrementally, in O(1) per step, while simulating.
+
+    Metrics are attached to a Simulator with Simulator.addMetric and updated after each step.
+
+    Parameters
+    ----------
+    keepHistory_p : whether to keep the value of the metric after each step.
+
+    Attributes
+    ----------
+    value_ : current value of the metric.
+
+    history_ : ArrayHistory of the values of the metric, None if not kept.
+
+    label_ : description of the metric used in plots.
+
+    Methods
+    -------
+    update : abstract. updates the metric with the action performed and the reward obtained at a step.
+
+    reinit : forgets all the steps.
+
+    getHistory : returns the values of the metric after each step.
+    """
+
+    label_ = ""
+
+    def __init__(self, keepHistory_p=True):
+        self.history_ = ArrayHistory(np.float64) if keepHistory_p else None
+        self.reinit()
+
+    def reinit(self):
+        self.value_ = np.nan
+        if self.history_ is not None:
+            self.history_.clear()
+
+    def update(self, step_p, action_p, reward_p):
+        """
+        updates the metric and returns its new value.
+
+        Parameters
+        ----------
+        step_p : the time step
+
+        action_p : the action performed
+
+        reward_p : the reward won upon performing the action
+        """
+        pass
+
+    def _record(self, value_p):
+        self.value_ = value_p
+        if self.history_ is not None:
+            self.history_.append(value_p)
+        return value_p
+
+    def getHistory(self):
+        return self.history_.view()
+
+class RollingMean(_BaseMetric):
+    """
+    Mean reward over the last window_ steps, kept with a ring buffer and a running sum.
+
+    Parameters
+    ----------
+    window_p : number of steps averaged.
+
+    keepHistory_p : whether to keep the value of the metric after each step.
+    """
+
+    def __init__(self, window_p, keepHistory_p=True):
+        self.window_ = window_p
+        self.label_ = "mean reward over last %i steps" % window_p
+        self.values_ = np.zeros(window_p)
+        super().__init__(keepHistory_p)
+
+    def reinit(self):
+        super().reinit()
+        self.sum_ = 0.
+        self.count_ = 0
+
+    def update(self, step_p, action_p, reward_p):
+        position_l = self.count_ % self.window_
+        if self.count_ >= self.window_:
+            self.sum_ -= self.values_[position_l]
+        self.values_[position_l] = reward_p
+        self.sum_ += reward_p
+        self.count_ += 1
+        return self._record(self.sum_ / min(self.count_, self.window_))
+
+class Ewma(_BaseMetric):
+    """
+    Exponentially weighted moving average of the rewards.
+
+    Parameters
+    ----------
+    alpha_p : weight of the last reward.
+
+    keepHistory_p : whether to keep the value of the metric after each step.
+    """
+
+    def __init__(self, alpha_p, keepHistory_p=True):
+        self.alpha_ = alpha_p
+        self.label_ = "exponentially weighted mean reward (alpha=%s)" % alpha_p
+        super().__init__(keepHistory_p)
+
+    def update(self, step_p, action_p, reward_p):
+        if np.isnan(self.value_):
+            return self._record(float(reward_p))
+        return self._record(self.value_ + self.alpha_ * (reward_p - self.value_))
+
+class CumulativeAverage(_BaseMetric):
+    """
+    Average reward since the first step.
+
+    Parameters
+    ----------
+    keepHistory_p : whether to keep the value of the metric after each step.
+    """
+
+    label_ = "average reward"
+
+    def reinit(self):
+        super().reinit()
+        self.sum_ = 0.
+        self.count_ = 0
+
+    def update(self, step_p, action_p, reward_p):
+        self.sum_ += reward_p
+        self.count_ += 1
+        return self._record(self.sum_ / self.count_)
+
+class PercentOptimalAction(_BaseMetric):
+    """
+    Percentage of the steps at which the optimal bandit was pulled.
+
+    Parameters
+    ----------
+    optimalAction_p : index of the optimal bandit, or function returning the index of the optimal
+     bandit at a given step for non-stationary problems.
+
+    keepHistory_p : whether to keep the value of the metric after each step.
+    """
+
+    label_ = "% optimal action"
+
+    def __init__(self, optimalAction_p, keepHistory_p=True):
+        self.optimalAction_ = optimalAction_p
+        super().__init__(keepHistory_p)
+
+    def reinit(self):
+        super().reinit()
+        self.optimalCount_ = 0
+        self.count_ = 0
+
+    def update(self, step_p, action_p, reward_p):
+        optimalAction_l = self.optimalAction_(step_p) if callable(self.optimalAction_) else self.optimalAction_
+        self.optimalCount_ += (action_p == optimalAction_l)
+        self.count_ += 1
+        return self._record(100 * self.optimalCount_ / self.count_)
+
+class Regret(_BaseMetric):
+    """
+    Cumulative regret ie. sum over the steps of the expected reward of the best bandit minus the one of
+     the pulled bandit.
+
+    The expected rewards of non-stationary bandits are computed for blocks of upcoming steps with
+     getExpectedRewards, so that each step costs O(1) amortized. Bandits that do not implement
+     getExpectedReward raise a TypeError, when the metric is created or when they are first needed.
+
+    Parameters
+    ----------
+    banditsList_p : list of the bandits of the simulator.
+
+    keepHistory_p : whether to keep the cumulative and instantaneous regrets after each step.
+
+    blockSize_p : number of steps whose expected rewards are computed at once.
+
+    Attributes
+    ----------
+    instantRegret_ : regret of the last step.
+
+    instantHistory_ : ArrayHistory of the instantaneous regrets, None if not kept.
+    """
+
+    label_ = "cumulative regret"
+
+    def __init__(self, banditsList_p, keepHistory_p=True, blockSize_p=4096):
+        _checkExpectedRewards(banditsList_p)
+        self.banditsList_ = banditsList_p
+        self.blockSize_ = max(1, min(blockSize_p, 2**20 // max(1, len(banditsList_p))))
+        self.instantHistory_ = ArrayHistory(np.float64) if keepHistory_p else None
+        super().__init__(keepHistory_p)
+
+    def reinit(self):
+        super().reinit()
+        self.value_ = 0.
+        self.instantRegret_ = np.nan
+        self.expected_ = None
+        self.blockStart_ = 0
+        if self.instantHistory_ is not None:
+            self.instantHistory_.clear()
+
+    def _computeBlock(self, step_p):
+        if all(bandit_l.stationary_ for bandit_l in self.banditsList_):
+            # a single column holds the expected rewards of every step
+            self.expected_ = expectedRewards(self.banditsList_, [step_p])
+            self.blockEnd_ = np.inf
+        else:
+            self.expected_ = expectedRewards(self.banditsList_, np.arange(step_p, step_p+self.blockSize_))
+            self.blockEnd_ = step_p + self.blockSize_
+        self.blockStart_ = step_p
+        self.bestExpected_ = np.max(self.expected_, axis=0).tolist()
+        self.expectedList_ = self.expected_.tolist()
+
+    def update(self, step_p, action_p, reward_p):
+        if self.expected_ is None or not (self.blockStart_ <= step_p < self.blockEnd_):
+            self._computeBlock(step_p)
+        offset_l = 0 if self.blockEnd_ == np.inf else step_p - self.blockStart_
+        self.instantRegret_ = self.bestExpected_[offset_l] - self.expectedList_[action_p][offset_l]
+        if self.instantHistory_ is not None:
+            self.instantHistory_.append(self.instantRegret_)
+        return self._record(self.value_ + self.instantRegret_)
+
+    def getInstantHistory(self):
+        return self.instantHistory_.view()
@@ -0,0 +1,163 @@
+ # parallelRunner.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+from .batchSimulator import BatchSimulator
+from .utils.utils import RunsAggregator
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+def _runChunk(spec_p, arrays_p, firstRun_p, firstRow_p, nbRuns_p, nsteps_p):
+    """
+    simulates nbRuns_p runs of spec_p in lockstep and writes their history in the shared arrays
+     arrays_p, a dict mapping each recorded quantity to the (name, shape, dtype) of its array.
+    """
+    simulator_l = spec_p.build(firstRun_p)
+    batchSimulator_l = BatchSimulator(simulator_l, nbRuns_p, firstRun_p)
+
+    sharedMemories_l = [shared_memory.SharedMemory(name=name_l) for name_l, _, _ in arrays_p.values()]
+    try:
+        rows_l = slice(firstRow_p, firstRow_p+nbRuns_p)
+        views_l = {key_l: np.ndarray(shape_l, dtype=dtype_l, buffer=sharedMemory_l.buf)[rows_l]
+                   for sharedMemory_l, (key_l, (_, shape_l, dtype_l)) in zip(sharedMemories_l, arrays_p.items())}
+        for step_cntr in range(nsteps_p):
+            if "evals" in views_l:
+                views_l["evals"][:, step_cntr, :] = batchSimulator_l.getEvals()
+            views_l["actions"][:, step_cntr], views_l["rewards"][:, step_cntr] = batchSimulator_l.nextStep()
+    finally:
+        # release the views before closing the shared memory they point to
+        views_l = None
+        for sharedMemory_l in sharedMemories_l:
+            sharedMemory_l.close()
+
+def runParallel(simulator_p, nsteps_p, runs_p, nbWorkers_p=None, recordEvals_p=False, firstRun_p=None):
+    """
+    simulates runs_p runs of a simulator spread over a pool of processes.
+
+    Each worker rebuilds the simulator from its SimulatorSpec, simulates a contiguous chunk of runs
+     in lockstep and writes their history straight into shared memory arrays, so that nothing but the
+     spec is pickled. Run r gives the same results as the run firstRun_p+r of the simulator.
+
+    Parameters
+    ----------
+    simulator_p : the simulator to replicate.
+
+    nsteps_p : number of steps of each run.
+
+    runs_p : number of runs.
+
+    nbWorkers_p : number of processes. Defaults to the number of CPUs.
+
+    recordEvals_p : whether to record the evaluations of the bandits before each step.
+
+    firstRun_p : index of the simulator's run replicated by the first run. Defaults to the current
+     run of the simulator.
+
+    Returns
+    -------
+    actions : (runs, nsteps) array of the actions performed.
+
+    rewards : (runs, nsteps) array of the rewards obtained.
+
+    evals : (runs, nsteps, nbBandits) array of the evaluations before each step, None when
+     recordEvals_p is False.
+    """
+    if nbWorkers_p is None:
+        nbWorkers_p = os.cpu_count()
+    if firstRun_p is None:
+        firstRun_p = simulator_p.run_
+
+    shapes_l = {"actions": ((runs_p, nsteps_p), np.int64), "rewards": ((runs_p, nsteps_p), np.float64)}
+    if recordEvals_p:
+        shapes_l["evals"] = ((runs_p, nsteps_p, simulator_p.nbBandits_), np.float64)
+
+    sharedMemories_l = {}
+    try:
+        for key_l, (shape_l, dtype_l) in shapes_l.items():
+            size_l = max(1, int(np.prod(shape_l)) * np.dtype(dtype_l).itemsize)
+            sharedMemories_l[key_l] = shared_memory.SharedMemory(create=True, size=size_l)
+        arrays_l = {key_l: (sharedMemories_l[key_l].name, shape_l, dtype_l) for key_l, (shape_l, dtype_l) in shapes_l.items()}
+
+        # one contiguous chunk of runs per worker, each simulated in lockstep
+        chunks_l = [chunk_l for chunk_l in np.array_split(np.arange(runs_p), min(nbWorkers_p, runs_p)) if len(chunk_l) > 0]
+        spec_l = simulator_p.getSpec()
+        with ProcessPoolExecutor(max_workers=len(chunks_l)) as executor_l:
+            futures_l = [executor_l.submit(_runChunk, spec_l, arrays_l, firstRun_p+int(chunk_l[0]), int(chunk_l[0]), len(chunk_l), nsteps_p)
+                         for chunk_l in chunks_l]
+            for future_l in futures_l:
+                future_l.result()
+
+        results_l = {key_l: np.ndarray(shape_l, dtype=dtype_l, buffer=sharedMemories_l[key_l].buf).copy()
+                     for key_l, (shape_l, dtype_l) in shapes_l.items()}
+    finally:
+        for sharedMemory_l in sharedMemories_l.values():
+            sharedMemory_l.close()
+            sharedMemory_l.unlink()
+
+    return results_l["actions"], results_l["rewards"], results_l.get("evals")
+
+def _aggregateChunk(spec_p, firstRun_p, nbRuns_p, nsteps_p, aggregateEvals_p):
+    """
+    simulates nbRuns_p runs of spec_p in lockstep and returns the aggregators of their rewards and
+     evaluations.
+    """
+    simulator_l = spec_p.build(firstRun_p)
+    rewardsAggregator_l = RunsAggregator(nsteps_p)
+    evalsAggregator_l = RunsAggregator(nsteps_p, (simulator_l.nbBandits_,)) if aggregateEvals_p else None
+    BatchSimulator(simulator_l, nbRuns_p, firstRun_p).aggregate(nsteps_p, rewardsAggregator_l, evalsAggregator_l)
+    return rewardsAggregator_l, evalsAggregator_l
+
+def aggregateParallel(simulator_p, nsteps_p, runs_p, nbWorkers_p=None, aggregateEvals_p=False, firstRun_p=None):
+    """
+    simulates runs_p runs of a simulator spread over a pool of processes, keeping only the per-step
+     mean and variance over the runs.
+
+    Each worker folds its chunk of runs into RunsAggregators that are merged by the parent, so that
+     the memory used does not depend on the number of runs.
+
+    Parameters
+    ----------
+    simulator_p : the simulator to replicate.
+
+    nsteps_p : number of steps of each run.
+
+    runs_p : number of runs.
+
+    nbWorkers_p : number of processes. Defaults to the number of CPUs.
+
+    aggregateEvals_p : whether to aggregate the evaluations of the bandits before each step.
+
+    firstRun_p : index of the simulator's run replicated by the first run. Defaults to the current
+     run of the simulator.
+
+    Returns
+    -------
+    rewardsAggregator : RunsAggregator of the rewards.
+
+    evalsAggregator : RunsAggregator of the evaluations, None when aggregateEvals_p is False.
+    """
+    if nbWorkers_p is None:
+        nbWorkers_p = os.cpu_count()
+    if firstRun_p is None:
+        firstRun_p = simulator_p.run_
+
+    rewardsAggregator_l = RunsAggregator(nsteps_p)
+    evalsAggregator_l = RunsAggregator(nsteps_p, (simulator_p.nbBandits_,)) if aggregateEvals_p else None
+
+    chunks_l = [chunk_l for chunk_l in np.array_split(np.arange(runs_p), min(nbWorkers_p, runs_p)) if len(chunk_l) > 0]
+    spec_l = simulator_p.getSpec()
+    with ProcessPoolExecutor(max_workers=len(chunks_l)) as executor_l:
+        futures_l = [executor_l.submit(_aggregateChunk, spec_l, firstRun_p+int(chunk_l[0]), len(chunk_l), nsteps_p, aggregateEvals_p)
+                     for chunk_l in chunks_l]
+        for future_l in futures_l:
+            chunkRewardsAggregator_l, chunkEvalsAggregator_l = future_l.result()
+            rewardsAggregator_l.merge(chunkRewardsAggregator_l)
+            if aggregateEvals_p:
+                evalsAggregator_l.merge(chunkEvalsAggregator_l)
+
+    return rewardsAggregator_l, evalsAggregator_l
@@ -1,9 +1,19 @@
 from .plots import plotRewards
 from .plots import plotAggregates
 from .plots import plotEvals
+from .plots import plotMetrics
+from .plots import plotStoredAggregates
+from .plots import plotStoredRewards
+from .plots import decimateMinMax
+from .plots import decimateLttb
 
 __all__ = [
     "plotRewards",
     "plotAggregates",
-    "plotEvals"
+    "plotEvals",
+    "plotMetrics",
+    "plotStoredAggregates",
+    "plotStoredRewards",
+    "decimateMinMax",
+    "decimateLttb"
 ]
\ No newline at end of file
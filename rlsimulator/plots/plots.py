@@ -5,104 +5,223 @@
  # License: GNU General Public License version 3
 
 from ..simulator import Simulator
-from ..utils.utils import rollingAverage
-from ..utils.utils import progressBar
+from ..batchSimulator import BatchSimulator
+from ..parallelRunner import aggregateParallel
+from ..cache.cache import cachedAggregates
+from ..metrics.metrics import rollingMean
+from ..utils.utils import RunsAggregator
 
 import sys
 import numpy as np
 from matplotlib import pyplot as plt
-from matplotlib import cm
 import matplotlib.patches as mpatches
 
-def plotRewards(simulator_p, nsteps_p):
-    for step_cntr in range(nsteps_p):
-        simulator_p.nextStep()
+def decimateMinMax(x_p, y_p, maxPoints_p):
+    """
+    returns the points of the line (x_p, y_p) kept when splitting it into maxPoints_p/2 buckets of
+     consecutive points and keeping the lowest and the highest point of each bucket, in order, so
+     that the peaks survive. The line is returned as is if it has at most maxPoints_p points.
+    """
+    x_l = np.asarray(x_p)
+    y_l = np.asarray(y_p)
+    nbPoints_l = len(y_l)
+    if nbPoints_l <= maxPoints_p:
+        return x_l, y_l
+    bucketSize_l = -(-nbPoints_l // max(1, maxPoints_p // 2))
+    nbBuckets_l = -(-nbPoints_l // bucketSize_l)
+    # the last bucket is padded with the last point
+    buckets_l = np.concatenate((y_l, np.full(nbBuckets_l*bucketSize_l - nbPoints_l, y_l[-1]))).reshape(nbBuckets_l, bucketSize_l)
+    starts_l = np.arange(nbBuckets_l) * bucketSize_l
+    indices_l = np.sort(np.stack((starts_l + np.argmin(buckets_l, axis=1), starts_l + np.argmax(buckets_l, axis=1)), axis=1), axis=1).ravel()
+    indices_l = np.minimum(indices_l, nbPoints_l-1)
+    indices_l = indices_l[np.concatenate(([True], indices_l[1:] != indices_l[:-1]))]
+    return x_l[indices_l], y_l[indices_l]
+
+def decimateLttb(x_p, y_p, maxPoints_p):
+    """
+    returns the maxPoints_p points of the line (x_p, y_p) selected by the Largest-Triangle-Three-
+     Buckets algorithm: the first and last points, and in each bucket of consecutive points the one
+     forming the largest triangle with the point selected in the previous bucket and the average of
+     the next bucket. The line is returned as is if it has at most maxPoints_p points.
+    """
+    x_l = np.asarray(x_p, dtype=float)
+    y_l = np.asarray(y_p, dtype=float)
+    nbPoints_l = len(y_l)
+    if nbPoints_l <= maxPoints_p or maxPoints_p < 3:
+        return np.asarray(x_p), np.asarray(y_p)
+    edges_l = np.linspace(1, nbPoints_l-1, maxPoints_p-1).astype(np.int64)
+    selected_l = np.empty(maxPoints_p, dtype=np.int64)
+    selected_l[0] = 0
+    selected_l[-1] = nbPoints_l-1
+    for bucket_cntr in range(maxPoints_p-2):
+        start_l, end_l = edges_l[bucket_cntr], edges_l[bucket_cntr+1]
+        nextEnd_l = edges_l[bucket_cntr+2] if bucket_cntr+2 < len(edges_l) else nbPoints_l
+        averageX_l = x_l[end_l:nextEnd_l].mean()
+        averageY_l = y_l[end_l:nextEnd_l].mean()
+        previous_l = selected_l[bucket_cntr]
+        areas_l = np.abs((x_l[previous_l] - averageX_l) * (y_l[start_l:end_l] - y_l[previous_l])
+                         - (x_l[previous_l] - x_l[start_l:end_l]) * (averageY_l - y_l[previous_l]))
+        selected_l[bucket_cntr+1] = start_l + np.argmax(areas_l)
+    return np.asarray(x_p)[selected_l], np.asarray(y_p)[selected_l]
+
+DECIMATIONS = {"minmax": decimateMinMax, "lttb": decimateLttb}
+
+def _plotLine(x_p, y_p, maxPoints_p, decimation_p, *args_p, **kwargs_p):
+    # Lines longer than the points budget are decimated before being drawn
+    return plt.plot(*DECIMATIONS[decimation_p](x_p, y_p, maxPoints_p), *args_p, **kwargs_p)
+
+def _fillBand(x_p, lower_p, upper_p, maxPoints_p, **kwargs_p):
+    # Bands longer than the points budget are drawn as the envelope of buckets of consecutive steps
+    x_l, lower_l, upper_l = np.asarray(x_p), np.asarray(lower_p), np.asarray(upper_p)
+    if len(x_l) > maxPoints_p:
+        bucketSize_l = -(-len(x_l) // maxPoints_p)
+        starts_l = np.arange(0, len(x_l), bucketSize_l)
+        x_l, lower_l, upper_l = x_l[starts_l], np.minimum.reduceat(lower_l, starts_l), np.maximum.reduceat(upper_l, starts_l)
+    return plt.fill_between(x_l, lower_l, upper_l, **kwargs_p)
+
+def _banditsColors(nbBandits_p):
+    return plt.get_cmap('viridis', nbBandits_p)(range(nbBandits_p))
+
+def _scatterRewards(rewards_p, actions_p, nbBandits_p, maxPoints_p):
+    steps_l = np.arange(1, len(rewards_p)+1)
+    if len(rewards_p) > maxPoints_p:
+        # Too many points to scatter: draw the density of the rewards instead
+        plt.hexbin(steps_l, rewards_p, gridsize=(200, 50), bins='log', mincnt=1, cmap='viridis')
+        plt.colorbar(label="number of steps")
+        return
+
+    cmap_l = _banditsColors(nbBandits_p)
+    plt.scatter(steps_l, rewards_p, c=cmap_l[actions_p])
+
+    patches_l = []
+    for bandit_cntr in range(nbBandits_p):
+        patch_l = mpatches.Patch(color=cmap_l[bandit_cntr], label='Bandit %s'%(bandit_cntr+1))
+        patches_l.append(patch_l)
+    plt.legend(handles = patches_l)
+
+def plotRewards(simulator_p, nsteps_p, maxPoints_p = 10**4, cache_p = None):
+    # Steps from the start of a run are read from the ResultCache cache_p when already simulated
+    simulator_p.run(nsteps_p, cache_p=cache_p)
     
     rewardsFig = plt.figure()
     plt.xlabel("step")
     plt.ylabel("reward")
     plt.title("reward per step")
     
-    cmap_l = cm.get_cmap('viridis', simulator_p.nbBandits_).colors
-    plt.scatter(range(1, nsteps_p+1), simulator_p.getRewardsList(), c=cmap_l[simulator_p.getActionsList()])
-    
-    patches_l = []
-    for bandit_cntr in range(simulator_p.nbBandits_):
-        patch_l = mpatches.Patch(color=cmap_l[bandit_cntr], label='Bandit %s'%(bandit_cntr+1))
-        patches_l.append(patch_l)
-    plt.legend(handles = patches_l)
+    _scatterRewards(simulator_p.getRewardsList(), simulator_p.getActionsList(), simulator_p.nbBandits_, maxPoints_p)
 
+    return rewardsFig
+
+def plotStoredRewards(store_p, run_p = 0, maxPoints_p = 10**4):
+    # Only the columns of the plotted run are read from the store
+    rewards_l = store_p.getRun(run_p, "rewards")
+    actions_l = store_p.getRun(run_p, "actions")
+
+    rewardsFig = plt.figure()
+    plt.xlabel("step")
+    plt.ylabel("reward")
+    plt.title("reward per step (run %s)"%run_p)
+
+    _scatterRewards(rewards_l, actions_l, store_p.nbBandits_, maxPoints_p)
 
     return rewardsFig
 
-def plotEvals(simulator_p, nsteps_p):
-    evals_l = []
-    for step_cntr in range(nsteps_p):
-        evals_l.append(simulator_p.policy_.vectBanditsEvals_.copy())
-        simulator_p.nextStep()
+def plotMetrics(simulator_p, nsteps_p, metrics_p, maxPoints_p = 10**4, decimation_p = "minmax", cache_p = None):
+    # Attach the metrics for the duration of the simulation, computed from the cached steps on a hit
+    for metric_l in metrics_p:
+        metric_l.reinit()
+        simulator_p.addMetric(metric_l)
+    simulator_p.run(nsteps_p, cache_p=cache_p)
+    for metric_l in metrics_p:
+        simulator_p.metricsList_.remove(metric_l)
+
+    metricsFig = plt.figure()
+    for metric_cntr, metric_l in enumerate(metrics_p):
+        plt.subplot(len(metrics_p), 1, metric_cntr+1)
+        plt.xlabel("step")
+        plt.ylabel(metric_l.label_)
+        _plotLine(np.arange(1, nsteps_p+1), metric_l.getHistory(), maxPoints_p, decimation_p)
+    plt.suptitle("metrics per step")
+
+    return metricsFig
+
+def plotEvals(simulator_p, nsteps_p, maxPoints_p = 10**4, decimation_p = "minmax", evalsStride_p = 1, cache_p = None):
+    # Evaluations recorded before one step out of evalsStride_p, read from the ResultCache cache_p when already simulated
+    _, _, evals_l = simulator_p.run(nsteps_p, True, evalsStride_p, cache_p)
+    steps_l = np.arange(0, nsteps_p, evalsStride_p)
     
     evalsFig = plt.figure()
     plt.xlabel("step")
     plt.ylabel("evaluation")
     plt.title("bandits evaluations evolution")
     
-    cmap_l = cm.get_cmap('viridis', simulator_p.nbBandits_).colors
-    for bandit_cntr in range(1, 1+len(evals_l[0])):
-        bandit_evals = [stepEvals_l[bandit_cntr-1] for stepEvals_l in evals_l]
-        plt.plot(bandit_evals, c=cmap_l[bandit_cntr-1],label='bandit %s'%bandit_cntr)
+    cmap_l = _banditsColors(simulator_p.nbBandits_)
+    for bandit_cntr in range(1, 1+simulator_p.nbBandits_):
+        _plotLine(steps_l, evals_l[:, bandit_cntr-1], maxPoints_p, decimation_p, c=cmap_l[bandit_cntr-1], label='bandit %s'%bandit_cntr)
     
     plt.legend()
     return evalsFig
 
-def plotAggregates(simulator_p, nsteps_p, runs_p, window_p = 10):
-    # Simulate runs and store results
-    evals_l = [] # eval[run][step][bandit]
-    rewards_l = [] # reward[run][step]
-    for run_cntr in range(runs_p):
-        progressBar(run_cntr, runs_p)
-        runEvals_l = []
-        for step_cntr in range(nsteps_p):
-            runEvals_l.append(simulator_p.policy_.vectBanditsEvals_.copy())
-            simulator_p.nextStep()
-        evals_l.append(runEvals_l)
-        rewards_l.append(simulator_p.getRewardsList())
-        simulator_p.reinit()
-    
-    # Aggregate evaluations 
-    evalsArray_l  = np.array(evals_l)
-    aggEvals_l = []
-    for step_cntr in range(nsteps_p):
-        aggStepEvals_l = []
-        for bandit_cntr in range(evalsArray_l.shape[2]):
-            aggStepEvals_l.append(np.mean(evalsArray_l[:, step_cntr, bandit_cntr]))
-        aggEvals_l.append(aggStepEvals_l) 
+def plotAggregates(simulator_p, nsteps_p, runs_p, window_p = 10, nbWorkers_p = 1, confidenceZ_p = 1.96, cache_p = None, maxPoints_p = 10**4, decimation_p = "minmax"):
+    # Simulate runs in lockstep, spread over nbWorkers_p processes, folding each step into streaming
+    # per-step means and variances. Runs already simulated are read from the ResultCache cache_p
+    if cache_p is not None:
+        rewardsAggregator_l, evalsAggregator_l = cachedAggregates(simulator_p, nsteps_p, runs_p, cache_p, True, nbWorkers_p, showProgress_p=True)
+    elif nbWorkers_p > 1:
+        rewardsAggregator_l, evalsAggregator_l = aggregateParallel(simulator_p, nsteps_p, runs_p, nbWorkers_p, aggregateEvals_p=True)
+    else:
+        rewardsAggregator_l = RunsAggregator(nsteps_p)
+        evalsAggregator_l = RunsAggregator(nsteps_p, (simulator_p.nbBandits_,))
+        batchSimulator_l = BatchSimulator(simulator_p, runs_p)
+        batchSimulator_l.aggregate(nsteps_p, rewardsAggregator_l, evalsAggregator_l, showProgress_p=True)
+    simulator_p.reinit(simulator_p.run_ + runs_p)
+
+    return _plotAggregators(rewardsAggregator_l, evalsAggregator_l, runs_p, window_p, confidenceZ_p, maxPoints_p, decimation_p)
+
+def plotStoredAggregates(store_p, window_p = 10, confidenceZ_p = 1.96, maxPoints_p = 10**4, decimation_p = "minmax"):
+    # Fold the stored runs one memory-mapped chunk at a time
+    rewardsAggregator_l = store_p.aggregate("rewards")
+    evalsAggregator_l = store_p.aggregate("evals") if store_p.recordEvals_ else None
+    return _plotAggregators(rewardsAggregator_l, evalsAggregator_l, store_p.nbRuns_, window_p, confidenceZ_p, maxPoints_p, decimation_p)
+
+def _plotAggregators(rewardsAggregator_p, evalsAggregator_p, runs_p, window_p, confidenceZ_p, maxPoints_p, decimation_p):
+    nsteps_l = len(rewardsAggregator_p.counts_)
+    aggEvalsFig = None
+    if evalsAggregator_p is not None:
+        # Aggregate evaluations 
+        aggEvals_l = evalsAggregator_p.getMean()
+        evalsBands_l = confidenceZ_p * evalsAggregator_p.getStandardError()
     
-    # Plot aggregate evaluations 
-    aggEvalsFig = plt.figure()
-    plt.xlabel("step")
-    plt.ylabel("evaluation")
-    plt.title("bandits aggregate evaluations evolution (%s runs)"%runs_p)
-    for bandit_cntr in range(1, 1+len(aggEvals_l[0])):
-        banditEvals_l = [stepEvals_l[bandit_cntr-1] for stepEvals_l in aggEvals_l]
-        plt.plot(banditEvals_l, label='bandit %s'%bandit_cntr)
-    plt.legend()
+        # Plot aggregate evaluations 
+        aggEvalsFig = plt.figure()
+        plt.xlabel("step")
+        plt.ylabel("evaluation")
+        plt.title("bandits aggregate evaluations evolution (%s runs)"%runs_p)
+        for bandit_cntr in range(1, 1+aggEvals_l.shape[1]):
+            banditEvals_l = aggEvals_l[:, bandit_cntr-1]
+            banditBand_l = evalsBands_l[:, bandit_cntr-1]
+            lines_l = _plotLine(np.arange(nsteps_l), banditEvals_l, maxPoints_p, decimation_p, label='bandit %s'%bandit_cntr)
+            _fillBand(np.arange(nsteps_l), banditEvals_l - banditBand_l, banditEvals_l + banditBand_l, maxPoints_p,
+                      color=lines_l[0].get_color(), alpha=0.2, linewidth=0)
+        plt.legend()
 
     # Aggregate rewards 
-    rewardsArray_l = np.array(rewards_l)
-    aggRewards_l = []
-    for step_cntr in range(nsteps_p):
-        aggRewards_l.append(np.mean(rewardsArray_l[:, step_cntr]))
+    aggRewards_l = rewardsAggregator_p.getMean()
+    rewardsBand_l = confidenceZ_p * rewardsAggregator_p.getStandardError()
     
     # Rolling average rewards 
-    rollingRewards_l = rollingAverage(aggRewards_l, window_p)
+    rollingRewards_l = rollingMean(aggRewards_l, window_p)
     
     # Plot aggregate rewards 
     aggRewardsFig = plt.figure()
     plt.xlabel("step")
     plt.ylabel("reward")
     plt.title("aggregate rewards evolution (%s runs)"%runs_p)
-    plt.plot(range(1, nsteps_p+1), aggRewards_l, label="reward per step")
-    plt.plot(range(1, nsteps_p+1), rollingRewards_l, "r", label='mean reward over last %i steps'%window_p)
+    steps_l = np.arange(1, nsteps_l+1)
+    _plotLine(steps_l, aggRewards_l, maxPoints_p, decimation_p, label="reward per step")
+    _fillBand(steps_l, aggRewards_l - rewardsBand_l, aggRewards_l + rewardsBand_l, maxPoints_p,
+              alpha=0.2, linewidth=0, label="confidence band (%s standard errors)"%confidenceZ_p)
+    _plotLine(steps_l, rollingRewards_l, maxPoints_p, decimation_p, "r", label='mean reward over last %i steps'%window_p)
     plt.legend()
 
     return aggEvalsFig, aggRewardsFig
\ No newline at end of file
@@ -1,9 +1,17 @@
 from .policies import GreedyPolicy
 from .policies import EpsilonGreedyPolicy
 from .policies import UCBPolicy
+from .policies import NonStationaryEpsilonGreedyPolicy
+from .policies import NonStationaryUCBPolicy
+from .policies import BetaThompsonPolicy
+from .policies import NormalThompsonPolicy
 
 __all__ = [
     "GreedyPolicy",
     "EpsilonGreedyPolicy",
-    "UCBPolicy"
+    "UCBPolicy",
+    "NonStationaryEpsilonGreedyPolicy",
+    "NonStationaryUCBPolicy",
+    "BetaThompsonPolicy",
+    "NormalThompsonPolicy"
 ]
\ No newline at end of file
@@ -6,18 +6,221 @@
 
 import numpy as np
 
+from ..utils.utils import RunsVariatesBuffer
+
+class BatchPolicyState:
+    """
+    State of a policy replicated over several independent runs that are advanced in lockstep.
+    Each attribute mirrors the corresponding attribute of _BasePolicy with one row per run.
+
+    Parameters
+    ----------
+    initialEvals_p : initial scores associated to the bandits, shared by all the runs, or
+     (nbRuns_p, nbBandits) array of the initial scores of each run.
+
+    nbRuns_p : number of independent runs.
+
+    rngs_p : list of numpy Generators, one per run. Independent generators are created if None.
+
+    bufferSize_p : number of uniforms drawn each time the buffer of a run is refilled.
+
+    Attributes
+    ----------
+    nbRuns_ : number of independent runs.
+
+    vectCountBanditsPulls_ : (nbRuns_, nbBandits) array of the number of times each bandit was pulled.
+
+    vectBanditsEvals_ : (nbRuns_, nbBandits) array of the scores associated to the bandits.
+
+    vectBanditsParamEstimates_ : (nbRuns_, nbBandits) array of the estimates associated to the key
+     parameter of the bandits' probability distributions.
+
+    step_ : timestep ie number of times actions were performed. Shared by all the runs.
+
+    uniforms_ : RunsVariatesBuffer of the uniforms drawn by each run.
+    """
+
+    def __init__(self, initialEvals_p, nbRuns_p, rngs_p=None, bufferSize_p=4096):
+        initialEvals_l = np.asarray(initialEvals_p, dtype=float)
+        self.nbRuns_ = nbRuns_p
+        self.vectCountBanditsPulls_ = np.zeros((nbRuns_p, initialEvals_l.shape[-1]), dtype=np.int64)
+        self.vectBanditsEvals_ = np.broadcast_to(initialEvals_l, self.vectCountBanditsPulls_.shape).copy()
+        self.vectBanditsParamEstimates_ = self.vectBanditsEvals_.copy()
+        self.step_ = 0
+
+        if rngs_p is None:
+            rngs_p = [np.random.default_rng(seedSequence_l) for seedSequence_l in np.random.SeedSequence().spawn(nbRuns_p)]
+        self.uniforms_ = RunsVariatesBuffer([rng_l.random for rng_l in rngs_p], bufferSize_p)
+
+    def nextUniforms(self):
+        """
+        returns an array of the next uniform of each run.
+        """
+        return self.uniforms_.take()
+
+    def exploitActionsMask(self):
+        """
+        returns a boolean mask of the greedy actions of each run ie. those having the highest score.
+        """
+        greedyEvaluations_l = np.max(self.vectBanditsEvals_, axis=1, keepdims=True)
+        return self.vectBanditsEvals_ == greedyEvaluations_l
+
+    def exploreActionsMask(self):
+        """
+        returns a boolean mask of the exploration actions of each run ie. those not having the
+         highest score.
+        """
+        greedyEvaluations_l = np.max(self.vectBanditsEvals_, axis=1, keepdims=True)
+        return self.vectBanditsEvals_ < greedyEvaluations_l
+
+def _randomChoiceRows(mask_p, uniforms_p):
+    """
+    returns for each row of a boolean mask the index of one of its True entries, picked by the
+     uniform of the row in the same way _BasePolicy._randomChoice picks among sorted actions.
+    Every row must contain at least one True entry.
+    """
+    counts_l = np.count_nonzero(mask_p, axis=1)
+    ranks_l = np.minimum((uniforms_p * counts_l).astype(np.int64), counts_l-1)
+    return np.argmax(np.cumsum(mask_p, axis=1) > ranks_l[:, None], axis=1)
+
+class _GreedyTree:
+    """
+    Segment tree over the evaluations of the bandits maintained incrementally by the policies
+     updating one evaluation per step.
+
+    Each node holds the highest evaluation of its leaves and how many leaves reach it, so that the
+     greedy actions count is read at the root and the rank-th greedy (or non-greedy) action, in index
+     order, is found by descending the tree. Updating an evaluation and picking an action cost
+     O(log(nbBandits)) instead of a scan of every bandit.
+
+    Parameters
+    ----------
+    evals_p : list of the evaluations of the bandits.
+    """
+
+    def __init__(self, evals_p):
+        self.nbActions_ = len(evals_p)
+        self.size_ = 1
+        while self.size_ < self.nbActions_:
+            self.size_ *= 2
+
+        maxs_l = np.full(2*self.size_, -np.inf)
+        counts_l = np.zeros(2*self.size_, dtype=np.int64)
+        leaves_l = np.zeros(2*self.size_, dtype=np.int64)
+        maxs_l[self.size_:self.size_+self.nbActions_] = np.asarray(evals_p, dtype=float)
+        counts_l[self.size_:self.size_+self.nbActions_] = 1
+        leaves_l[self.size_:self.size_+self.nbActions_] = 1
+
+        # build each level from the one below it
+        levelSize_l = self.size_
+        while levelSize_l > 1:
+            left_l = slice(levelSize_l, 2*levelSize_l, 2)
+            right_l = slice(levelSize_l+1, 2*levelSize_l, 2)
+            parents_l = slice(levelSize_l//2, levelSize_l)
+            maxs_l[parents_l] = np.maximum(maxs_l[left_l], maxs_l[right_l])
+            counts_l[parents_l] = (counts_l[left_l] * (maxs_l[left_l] == maxs_l[parents_l])
+                                   + counts_l[right_l] * (maxs_l[right_l] == maxs_l[parents_l]))
+            leaves_l[parents_l] = leaves_l[left_l] + leaves_l[right_l]
+            levelSize_l //= 2
+
+        self.maxs_ = maxs_l.tolist()
+        self.counts_ = counts_l.tolist()
+        self.leaves_ = leaves_l.tolist()
+
+    def update(self, action_p, eval_p):
+        maxs_l = self.maxs_
+        counts_l = self.counts_
+        node_l = self.size_ + action_p
+        maxs_l[node_l] = eval_p
+        node_l //= 2
+        while node_l > 0:
+            leftMax_l = maxs_l[2*node_l]
+            rightMax_l = maxs_l[2*node_l+1]
+            if leftMax_l > rightMax_l:
+                maxs_l[node_l] = leftMax_l
+                counts_l[node_l] = counts_l[2*node_l]
+            elif leftMax_l < rightMax_l:
+                maxs_l[node_l] = rightMax_l
+                counts_l[node_l] = counts_l[2*node_l+1]
+            else:
+                maxs_l[node_l] = leftMax_l
+                counts_l[node_l] = counts_l[2*node_l] + counts_l[2*node_l+1]
+            node_l //= 2
+
+    def greedyCount(self):
+        return self.counts_[1]
+
+    def exploreCount(self):
+        return self.nbActions_ - self.counts_[1]
+
+    def greedyAction(self, rank_p):
+        """
+        returns the rank_p-th greedy action in index order.
+        """
+        greedyEvaluation_l = self.maxs_[1]
+        node_l = 1
+        while node_l < self.size_:
+            node_l *= 2
+            leftCount_l = self.counts_[node_l] if self.maxs_[node_l] == greedyEvaluation_l else 0
+            if rank_p >= leftCount_l:
+                rank_p -= leftCount_l
+                node_l += 1
+        return node_l - self.size_
+
+    def exploreAction(self, rank_p):
+        """
+        returns the rank_p-th exploration action in index order.
+        """
+        greedyEvaluation_l = self.maxs_[1]
+        node_l = 1
+        while node_l < self.size_:
+            node_l *= 2
+            leftCount_l = self.leaves_[node_l]
+            if self.maxs_[node_l] == greedyEvaluation_l:
+                leftCount_l -= self.counts_[node_l]
+            if rank_p >= leftCount_l:
+                rank_p -= leftCount_l
+                node_l += 1
+        return node_l - self.size_
+
+def _isFusable(policy_p):
+    # policies whose runSteps is the one matching their getNexAction and update. Loops computing on
+    # lists only match the updates of float64 evaluations
+    policyClass_l = type(policy_p)
+    definingClass_l = next(class_l for class_l in policyClass_l.__mro__ if "runSteps" in vars(class_l))
+    return (definingClass_l is not _BasePolicy and policyClass_l.getNexAction is definingClass_l.getNexAction
+            and policyClass_l.update is definingClass_l.update and (policy_p.dtype_ == np.float64 or not definingClass_l.listsLoop_))
+
 class _BasePolicy:
     """
     Abstract base class for drawing policies.
     Policies describe the way we score bandits and how do we choose among them.
 
+    Parameters
+    ----------
+    dtype_p : dtype of the evaluations and estimates, float32 halving their memory. Batch states
+     and rewards are float64 whatever the policy's dtype.
+
     Attributes
     ----------
-    vectCountBanditsPulls_ : list describing the number of times we pulled the corresponding bandit.
-    vectBanditsEvals_ : list describing the scores associated to the corresponding bandit.
-    vectBanditsParamEstimates_ : list describing the estimate associated to the key parameter of
+    vectCountBanditsPulls_ : int64 array describing the number of times we pulled the corresponding bandit.
+    vectBanditsEvals_ : array describing the scores associated to the corresponding bandit.
+    vectBanditsParamEstimates_ : array describing the estimate associated to the key parameter of
      the bandit's probability distribution.
     step_ : timestep ie number of times actions were performed.
+    rng_ : numpy Generator the policy draws from. Created from fresh entropy on first use if setRng
+     was not called.
+    dtype_ : dtype of the evaluations and estimates.
+
+    Policies draw a fixed number of uniforms from a buffer at each step, so that runs advanced in
+     lockstep consume their random streams exactly like runs simulated one by one.
+
+    The state of a policy is held in typed arrays, one entry per bandit, listed by _arraysAttributes,
+     and in slots rather than an instance dict, so that a policy stays small enough to hold very many
+     of them. The arrays are views on buffers allocated by the policy, kept in capacityBuffers_: reinit
+     resets them in place when their buffers already hold enough bandits, and the buffers grow by
+     doubling their capacity, so that adding the bandits one by one costs O(1) amortized per bandit.
+     Arrays set otherwise, eg. unpickled, are copied into new buffers when resized.
 
     Methods
     -------
@@ -29,24 +232,110 @@ class _BasePolicy:
     exploitActionsList : returns the list of greedy actions ie. those having the highest score. 
 
     exploreActionsList : returns the list of exploration actions ie. those not having the highest score.
+     Both scan every bandit, policies changing one evaluation per step rather pick their actions from
+     an incrementally maintained _GreedyTree.
+
+    setRng : sets the numpy Generator the policy draws from.
+
+    newBatchState : returns the state of the policy replicated over several runs.
+
+    getNexActionsBatch : abstract. returns the actions of several runs advanced in lockstep.
+
+    updateBatch : abstract. updates the state of several runs advanced in lockstep.
+
+    runSteps : abstract. performs several steps in a fused loop, used by Simulator.run.
+
+    getNexActions : returns several actions chosen from the current state, before any of their
+     rewards is revealed.
+
+    updateMany : updates the policy's attributes with the rewards of several actions at once.
+
+    batchParams_ lists the parameters of the constructor that may be given one value per run, as
+     arrays, to a policy whose only use is to be replicated by a BatchSimulator.
+
+    listsLoop_ tells whether runSteps works on lists of the values, rather than on the arrays.
     """
 
-    def __init__(self):
-        self.vectCountBanditsPulls_ = []
-        self.vectBanditsEvals_ = []
-        self.vectBanditsParamEstimates_ = []
-        self.step_ = 0
+    __slots__ = ("vectCountBanditsPulls_", "vectBanditsEvals_", "vectBanditsParamEstimates_", "step_", "greedyTree_",
+                 "generator_", "uniformsBuffer_", "uniformsPosition_", "dtype_", "capacityBuffers_")
+
+    bufferSize_ = 4096
+    batchParams_ = ()
+    listsLoop_ = False
+
+    def __init__(self, dtype_p=np.float64):
+        self.dtype_ = np.dtype(dtype_p)
+        self.capacityBuffers_ = {}
+        self.setRng(None)
+        self.reinit([])
+
+    def _slotsNames(self):
+        # the evaluations some policies derive from other attributes are properties, not state
+        class_l = type(self)
+        return [name_l for slotsClass_l in class_l.__mro__ for name_l in vars(slotsClass_l).get("__slots__", ())
+                if not isinstance(getattr(class_l, name_l), property)]
+
+    def __getstate__(self):
+        # the capacity buffers are not state: unpickled arrays own their memory and get new buffers when resized.
+        # Subclasses declaring no slots keep their own attributes in an instance dict
+        state_l = dict(getattr(self, "__dict__", {}))
+        state_l.update((name_l, getattr(self, name_l)) for name_l in self._slotsNames() if name_l != "capacityBuffers_" and hasattr(self, name_l))
+        return state_l
+
+    def __setstate__(self, state_p):
+        self.capacityBuffers_ = {}
+        for name_l, value_l in state_p.items():
+            setattr(self, name_l, value_l)
+
+    def _arraysAttributes(self):
+        """
+        returns the names and dtypes of the arrays holding one entry per bandit.
+        """
+        return (("vectCountBanditsPulls_", np.int64), ("vectBanditsEvals_", self.dtype_), ("vectBanditsParamEstimates_", self.dtype_))
+
+    def _initArrays(self, index_p, initialEvals_p):
+        """
+        sets the entries index_p of the arrays to their initial values.
+
+        initialEvals_p : array of the initial scores of the bandits index_p.
+        """
+        self.vectCountBanditsPulls_[index_p] = 0
+        self.vectBanditsEvals_[index_p] = initialEvals_p
+        self.vectBanditsParamEstimates_[index_p] = initialEvals_p
+
+    def _capacityBuffer(self, name_p, array_p):
+        # the buffer allocated by the policy that array_p is a view of, None if array_p was set otherwise
+        buffer_l = self.capacityBuffers_.get(name_p)
+        if buffer_l is not None and (array_p is buffer_l or array_p.base is buffer_l):
+            return buffer_l
+        return None
 
     def reinit(self, initialEvals_p):
-        self.vectCountBanditsPulls_ = [0] * len(initialEvals_p)
-        self.vectBanditsEvals_ = initialEvals_p.copy()
-        self.vectBanditsParamEstimates_ = initialEvals_p.copy()
+        nbBandits_l = len(initialEvals_p)
+        for name_l, dtype_l in self._arraysAttributes():
+            # the buffer of the array is reused when it can hold every bandit
+            array_l = getattr(self, name_l, None)
+            buffer_l = None if array_l is None else self._capacityBuffer(name_l, array_l)
+            if buffer_l is None or buffer_l.dtype != dtype_l or len(buffer_l) < nbBandits_l:
+                buffer_l = np.empty(nbBandits_l, dtype=dtype_l)
+                self.capacityBuffers_[name_l] = buffer_l
+            setattr(self, name_l, buffer_l[:nbBandits_l])
+        self._initArrays(slice(None), np.asarray(initialEvals_p, dtype=float))
         self.step_ = 0
+        self.greedyTree_ = None
 
     def addBandit(self, initialEval_p):
-        self.vectBanditsEvals_.append(initialEval_p)
-        self.vectBanditsParamEstimates_.append(initialEval_p)
-        self.vectCountBanditsPulls_.append(0)
+        nbBandits_l = len(self.vectCountBanditsPulls_)
+        for name_l, dtype_l in self._arraysAttributes():
+            array_l = getattr(self, name_l)
+            buffer_l = self._capacityBuffer(name_l, array_l)
+            if buffer_l is None or len(buffer_l) == nbBandits_l:
+                buffer_l = np.empty(max(16, 2*nbBandits_l), dtype=dtype_l)
+                buffer_l[:nbBandits_l] = array_l
+                self.capacityBuffers_[name_l] = buffer_l
+            setattr(self, name_l, buffer_l[:nbBandits_l+1])
+        self._initArrays(slice(nbBandits_l, nbBandits_l+1), np.array([float(initialEval_p)]))
+        self.greedyTree_ = None
 
     def getNexAction(self):
         pass
@@ -63,6 +352,193 @@ class _BasePolicy:
         """
         pass
 
+    def setRng(self, rng_p):
+        """
+        sets the numpy Generator the policy draws from and discards the uniforms drawn from the
+         previous one. A Generator of fresh entropy is created on first use if rng_p is None.
+        """
+        self.generator_ = rng_p
+        self.uniformsBuffer_ = None
+        self.uniformsPosition_ = 0
+
+    @property
+    def rng_(self):
+        # most policies are given their Generator by a simulator, seeding one beforehand is wasted
+        if self.generator_ is None:
+            self.generator_ = np.random.default_rng()
+        return self.generator_
+
+    def _nextUniform(self):
+        if self.uniformsBuffer_ is None or self.uniformsPosition_ == self.bufferSize_:
+            self.uniformsBuffer_ = self.rng_.random(self.bufferSize_)
+            self.uniformsPosition_ = 0
+        uniform_l = self.uniformsBuffer_.item(self.uniformsPosition_)
+        self.uniformsPosition_ += 1
+        return uniform_l
+
+    def _remainingUniforms(self):
+        # list of the buffered uniforms and position of the next one, read by the fused loops
+        if self.uniformsBuffer_ is None:
+            return [], 0
+        return self.uniformsBuffer_.tolist(), self.uniformsPosition_
+
+    def _nextUniforms(self, size_p):
+        """
+        returns an array of the next size_p uniforms, the same as size_p calls to _nextUniform.
+        """
+        uniforms_l = np.empty(size_p)
+        filled_l = 0
+        while filled_l < size_p:
+            if self.uniformsBuffer_ is None or self.uniformsPosition_ == self.bufferSize_:
+                self.uniformsBuffer_ = self.rng_.random(self.bufferSize_)
+                self.uniformsPosition_ = 0
+            taken_l = min(size_p - filled_l, self.bufferSize_ - self.uniformsPosition_)
+            uniforms_l[filled_l:filled_l+taken_l] = self.uniformsBuffer_[self.uniformsPosition_:self.uniformsPosition_+taken_l]
+            self.uniformsPosition_ += taken_l
+            filled_l += taken_l
+        return uniforms_l
+
+    def _randomChoices(self, actions_p, uniforms_p):
+        """
+        returns the actions of the sorted array actions_p picked by each of the uniforms uniforms_p,
+         as _randomChoice does.
+        """
+        ranks_l = np.minimum((uniforms_p * len(actions_p)).astype(np.int64), len(actions_p)-1)
+        return actions_p[ranks_l]
+
+    def _refillUniforms(self):
+        self.uniformsBuffer_ = self.rng_.random(self.bufferSize_)
+        return self.uniformsBuffer_.tolist()
+
+    def _randomRank(self, count_p, uniform_p):
+        """
+        returns the rank among count_p items picked by the uniform uniform_p.
+        """
+        return min(int(uniform_p * count_p), count_p-1)
+
+    def _randomChoice(self, actions_p, uniform_p):
+        """
+        returns the action of the sorted array actions_p picked by the uniform uniform_p.
+        """
+        return actions_p[self._randomRank(len(actions_p), uniform_p)]
+
+    def _greedyTree(self):
+        """
+        returns the _GreedyTree of the evaluations, built on first use after a reinit.
+        Policies using it must call _updateGreedyTree each time they change an evaluation.
+        """
+        if self.greedyTree_ is None:
+            self.greedyTree_ = _GreedyTree(self.vectBanditsEvals_)
+        return self.greedyTree_
+
+    def _updateGreedyTree(self, action_p):
+        if self.greedyTree_ is not None:
+            self.greedyTree_.update(action_p, self.vectBanditsEvals_.item(action_p))
+
+    def _loopValues(self):
+        """
+        returns the lists of the counts, evaluations and estimates, faster to index one entry at a time
+         than the arrays, used by the fused loops. _storeLoopValues writes them back.
+        """
+        return self.vectCountBanditsPulls_.tolist(), self.vectBanditsEvals_.tolist(), self.vectBanditsParamEstimates_.tolist()
+
+    def _storeLoopValues(self, counts_p, evals_p, estimates_p):
+        self.vectCountBanditsPulls_[:] = counts_p
+        self.vectBanditsEvals_[:] = evals_p
+        self.vectBanditsParamEstimates_[:] = estimates_p
+
+    def newBatchState(self, initialEvals_p, nbRuns_p, rngs_p=None):
+        """
+        returns the state of the policy replicated over nbRuns_p independent runs.
+
+        rngs_p : list of numpy Generators, one per run, the runs draw from.
+        """
+        return BatchPolicyState(initialEvals_p, nbRuns_p, rngs_p, self.bufferSize_)
+
+    def getNexActionsBatch(self, state_p):
+        """
+        returns an array holding the next action of each run of state_p.
+        Policies that can not be vectorized over runs leave it unimplemented.
+        """
+        pass
+
+    def updateBatch(self, state_p, actions_p, rewards_p):
+        """
+        updates the state of each run of state_p.
+
+        parameters
+        ----------
+        state_p : the BatchPolicyState to update
+
+        actions_p : array of the actions performed in each run
+
+        rewards_p : array of the rewards won upon performing the actions
+        """
+        pass
+
+    def runSteps(self, nsteps_p, firstStep_p, pull_p, actions_p, rewards_p, evals_p=None, evalsStride_p=1):
+        """
+        performs nsteps_p steps in one loop, drawing the same uniforms and making the same updates
+         as nsteps_p calls to getNexAction and update.
+        Policies that do not implement it are simulated by Simulator.run one step at a time.
+
+        parameters
+        ----------
+        nsteps_p : number of steps to perform
+
+        firstStep_p : time step of the simulator before the first step
+
+        pull_p : function returning the reward of an action performed at a given step
+
+        actions_p : array the action of each step is written to
+
+        rewards_p : array the reward of each step is written to
+
+        evals_p : array the evaluations before one step out of evalsStride_p are written to, if not None
+        """
+        pass
+
+    def getNexActions(self, nbActions_p):
+        """
+        returns an array of nbActions_p actions chosen from the current state of the policy, the same
+         as nbActions_p calls to getNexAction with no update in between.
+        """
+        return np.array([self.getNexAction() for action_cntr in range(nbActions_p)], dtype=np.int64)
+
+    def updateMany(self, actions_p, rewards_p):
+        """
+        updates the policy's attributes with the rewards of several actions, revealed together.
+        Policies that do not provide a vectorized version are updated once per action, in order.
+
+        parameters
+        ----------
+        actions_p : array of the actions performed
+
+        rewards_p : array of the rewards won upon performing the actions
+        """
+        for action_l, reward_l in zip(np.asarray(actions_p).tolist(), np.asarray(rewards_p).tolist()):
+            self.update(action_l, reward_l)
+
+    def _groupRewards(self, actions_p, rewards_p):
+        """
+        returns the array of the distinct actions of actions_p, the number of times each one was
+         performed and the mean of its rewards.
+        """
+        actions_l, inverse_l = np.unique(np.asarray(actions_p), return_inverse=True)
+        counts_l = np.bincount(inverse_l, minlength=len(actions_l))
+        return actions_l, counts_l, np.bincount(inverse_l, weights=rewards_p, minlength=len(actions_l)) / counts_l
+
+    def _sampleAverageUpdateMany(self, actions_p, rewards_p):
+        # the mean of n rewards moves the sample average by n/(observations+n) of the gap, which is
+        # the update of a single reward when n is 1
+        actions_l, counts_l, means_l = self._groupRewards(actions_p, rewards_p)
+        self.vectCountBanditsPulls_[actions_l] += counts_l
+        weights_l = counts_l/(1+self.vectCountBanditsPulls_[actions_l])
+        self.vectBanditsEvals_[actions_l] += weights_l*(means_l - self.vectBanditsEvals_[actions_l])
+        self.vectBanditsParamEstimates_[actions_l] += weights_l*(means_l - self.vectBanditsParamEstimates_[actions_l])
+        for action_l in actions_l.tolist():
+            self._updateGreedyTree(action_l)
+
     def exploitActionsList(self):
         greedyEvaluation_l = np.max(self.vectBanditsEvals_)
         return np.flatnonzero(self.vectBanditsEvals_ == greedyEvaluation_l)
@@ -79,9 +555,9 @@ class GreedyPolicy(_BasePolicy):
 
     Attributes
     ----------
-    vectCountBanditsPulls_ : list describing the number of times we pulled the corresponding bandit.
-    vectBanditsEvals_ : list describing the scores associated to the corresponding bandit.
-    vectBanditsParamEstimates_ : list describing the estimate associated to the key parameter of
+    vectCountBanditsPulls_ : array describing the number of times we pulled the corresponding bandit.
+    vectBanditsEvals_ : array describing the scores associated to the corresponding bandit.
+    vectBanditsParamEstimates_ : array describing the estimate associated to the key parameter of
      the bandit's probability distribution.
     step_ : timestep ie number of times actions were performed.
 
@@ -93,14 +569,74 @@ class GreedyPolicy(_BasePolicy):
      drawn. Needs to be called each time after the reward of getNextAction is revealed.  
     """
 
+    __slots__ = ()
+
+    listsLoop_ = True
+
     def getNexAction(self):
         self.step_ += 1
-        return np.random.choice(self.exploitActionsList())
+        greedyTree_l = self._greedyTree()
+        return greedyTree_l.greedyAction(self._randomRank(greedyTree_l.greedyCount(), self._nextUniform()))
 
     def update(self, action_p, reward_p):
-        self.vectCountBanditsPulls_[action_p] += 1
-        self.vectBanditsEvals_[action_p] += (1/(1+self.vectCountBanditsPulls_[action_p]))*(reward_p - self.vectBanditsEvals_[action_p])
-        self.vectBanditsParamEstimates_[action_p] += (1/(1+self.vectCountBanditsPulls_[action_p]))*(reward_p - self.vectBanditsParamEstimates_[action_p])
+        # values are read as floats, computed on then stored, cheaper than arithmetic on array scalars
+        pullsCount_l = self.vectCountBanditsPulls_.item(action_p) + 1
+        self.vectCountBanditsPulls_[action_p] = pullsCount_l
+        eval_l = self.vectBanditsEvals_.item(action_p)
+        self.vectBanditsEvals_[action_p] = eval_l + (1/(1+pullsCount_l))*(reward_p - eval_l)
+        estimate_l = self.vectBanditsParamEstimates_.item(action_p)
+        self.vectBanditsParamEstimates_[action_p] = estimate_l + (1/(1+pullsCount_l))*(reward_p - estimate_l)
+        self._updateGreedyTree(action_p)
+
+    def runSteps(self, nsteps_p, firstStep_p, pull_p, actions_p, rewards_p, evals_p=None, evalsStride_p=1):
+        counts_l, evals_l, estimates_l = self._loopValues()
+        greedyTree_l = self._greedyTree()
+        greedyCounts_l = greedyTree_l.counts_
+        uniforms_l, position_l = self._remainingUniforms()
+
+        for step_cntr in range(nsteps_p):
+            if evals_p is not None and step_cntr % evalsStride_p == 0:
+                evals_p[step_cntr // evalsStride_p] = evals_l
+            if position_l == len(uniforms_l):
+                uniforms_l = self._refillUniforms()
+                position_l = 0
+            uniform_l = uniforms_l[position_l]
+            position_l += 1
+
+            greedyCount_l = greedyCounts_l[1]
+            action_l = greedyTree_l.greedyAction(min(int(uniform_l * greedyCount_l), greedyCount_l-1))
+            reward_l = pull_p(action_l, firstStep_p + step_cntr + 1)
+
+            counts_l[action_l] += 1
+            weight_l = 1/(1+counts_l[action_l])
+            evals_l[action_l] += weight_l*(reward_l - evals_l[action_l])
+            estimates_l[action_l] += weight_l*(reward_l - estimates_l[action_l])
+            greedyTree_l.update(action_l, evals_l[action_l])
+
+            actions_p[step_cntr] = action_l
+            rewards_p[step_cntr] = reward_l
+
+        self._storeLoopValues(counts_l, evals_l, estimates_l)
+        self.step_ += nsteps_p
+        self.uniformsPosition_ = position_l
+
+    def getNexActions(self, nbActions_p):
+        self.step_ += nbActions_p
+        return self._randomChoices(self.exploitActionsList(), self._nextUniforms(nbActions_p))
+
+    def updateMany(self, actions_p, rewards_p):
+        self._sampleAverageUpdateMany(actions_p, rewards_p)
+
+    def getNexActionsBatch(self, state_p):
+        state_p.step_ += 1
+        return _randomChoiceRows(state_p.exploitActionsMask(), state_p.nextUniforms())
+
+    def updateBatch(self, state_p, actions_p, rewards_p):
+        runs_l = np.arange(state_p.nbRuns_)
+        state_p.vectCountBanditsPulls_[runs_l, actions_p] += 1
+        weights_l = 1/(1+state_p.vectCountBanditsPulls_[runs_l, actions_p])
+        state_p.vectBanditsEvals_[runs_l, actions_p] += weights_l*(rewards_p - state_p.vectBanditsEvals_[runs_l, actions_p])
+        state_p.vectBanditsParamEstimates_[runs_l, actions_p] += weights_l*(rewards_p - state_p.vectBanditsParamEstimates_[runs_l, actions_p])
 
 class EpsilonGreedyPolicy(_BasePolicy):
     """
@@ -111,11 +647,11 @@ class EpsilonGreedyPolicy(_BasePolicy):
 
     Attributes
     ----------
-    vectCountBanditsPulls_ : list describing the number of times we pulled the corresponding bandit.
+    vectCountBanditsPulls_ : array describing the number of times we pulled the corresponding bandit.
     
-    vectBanditsEvals_ : list describing the scores associated to the corresponding bandit.
+    vectBanditsEvals_ : array describing the scores associated to the corresponding bandit.
     
-    vectBanditsParamEstimates_ : list describing the estimate associated to the key parameter of
+    vectBanditsParamEstimates_ : array describing the estimate associated to the key parameter of
      the bandit's probability distribution.
     
     step_ : timestep ie number of times actions were performed.
@@ -130,31 +666,118 @@ class EpsilonGreedyPolicy(_BasePolicy):
      drawn. Needs to be called each time after the reward of getNextAction is revealed.  
     """
 
-    def __init__(self, epsilon_p):
-        super().__init__()
+    __slots__ = ("epsilon_",)
+
+    batchParams_ = ("epsilon_p",)
+    listsLoop_ = True
+
+    def __init__(self, epsilon_p, dtype_p=np.float64):
+        super().__init__(dtype_p)
         self.epsilon_ = epsilon_p
 
     def getNexAction(self):
         self.step_ += 1
         
-        doExploreAction_l = ( np.random.binomial(1, self.epsilon_) == 1 )
-        greedyEvaluation_l = np.max(self.vectBanditsEvals_)
+        doExploreAction_l = ( self._nextUniform() < self.epsilon_ )
+        choiceUniform_l = self._nextUniform()
+        greedyTree_l = self._greedyTree()
 
         if doExploreAction_l:
-            exploreActionsList_l = self.exploreActionsList()
-            if len(exploreActionsList_l) != 0 :
-                return np.random.choice(exploreActionsList_l)
+            exploreCount_l = greedyTree_l.exploreCount()
+            if exploreCount_l != 0 :
+                return greedyTree_l.exploreAction(self._randomRank(exploreCount_l, choiceUniform_l))
             else:
-                return np.random.choice(np.arange(len(self.vectBanditsEvals_)))
+                return self._randomRank(len(self.vectBanditsEvals_), choiceUniform_l)
         else:
-            greedyActions_l = self.exploitActionsList()
-            return np.random.choice(greedyActions_l)
+            return greedyTree_l.greedyAction(self._randomRank(greedyTree_l.greedyCount(), choiceUniform_l))
 
     def update(self, action_p, reward_p):
-        self.vectCountBanditsPulls_[action_p] += 1
-        observationsCount_l = 1+self.vectCountBanditsPulls_[action_p]
-        self.vectBanditsEvals_[action_p] += (1/(observationsCount_l))*(reward_p - self.vectBanditsEvals_[action_p])
-        self.vectBanditsParamEstimates_[action_p] += (1/(observationsCount_l))*(reward_p - self.vectBanditsParamEstimates_[action_p])
+        pullsCount_l = self.vectCountBanditsPulls_.item(action_p) + 1
+        self.vectCountBanditsPulls_[action_p] = pullsCount_l
+        observationsCount_l = 1+pullsCount_l
+        eval_l = self.vectBanditsEvals_.item(action_p)
+        self.vectBanditsEvals_[action_p] = eval_l + (1/(observationsCount_l))*(reward_p - eval_l)
+        estimate_l = self.vectBanditsParamEstimates_.item(action_p)
+        self.vectBanditsParamEstimates_[action_p] = estimate_l + (1/(observationsCount_l))*(reward_p - estimate_l)
+        self._updateGreedyTree(action_p)
+
+    def runSteps(self, nsteps_p, firstStep_p, pull_p, actions_p, rewards_p, evals_p=None, evalsStride_p=1):
+        counts_l, evals_l, estimates_l = self._loopValues()
+        nbActions_l = len(evals_l)
+        greedyTree_l = self._greedyTree()
+        greedyCounts_l = greedyTree_l.counts_
+        uniforms_l, position_l = self._remainingUniforms()
+
+        for step_cntr in range(nsteps_p):
+            if evals_p is not None and step_cntr % evalsStride_p == 0:
+                evals_p[step_cntr // evalsStride_p] = evals_l
+            if position_l == len(uniforms_l):
+                uniforms_l = self._refillUniforms()
+                position_l = 0
+            exploreUniform_l = uniforms_l[position_l]
+            position_l += 1
+            if position_l == len(uniforms_l):
+                uniforms_l = self._refillUniforms()
+                position_l = 0
+            choiceUniform_l = uniforms_l[position_l]
+            position_l += 1
+
+            greedyCount_l = greedyCounts_l[1]
+            if exploreUniform_l < self.epsilon_:
+                exploreCount_l = nbActions_l - greedyCount_l
+                if exploreCount_l != 0:
+                    action_l = greedyTree_l.exploreAction(min(int(choiceUniform_l * exploreCount_l), exploreCount_l-1))
+                else:
+                    action_l = min(int(choiceUniform_l * nbActions_l), nbActions_l-1)
+            else:
+                action_l = greedyTree_l.greedyAction(min(int(choiceUniform_l * greedyCount_l), greedyCount_l-1))
+            reward_l = pull_p(action_l, firstStep_p + step_cntr + 1)
+
+            counts_l[action_l] += 1
+            observationsCount_l = 1+counts_l[action_l]
+            evals_l[action_l] += (1/(observationsCount_l))*(reward_l - evals_l[action_l])
+            estimates_l[action_l] += (1/(observationsCount_l))*(reward_l - estimates_l[action_l])
+            greedyTree_l.update(action_l, evals_l[action_l])
+
+            actions_p[step_cntr] = action_l
+            rewards_p[step_cntr] = reward_l
+
+        self._storeLoopValues(counts_l, evals_l, estimates_l)
+        self.step_ += nsteps_p
+        self.uniformsPosition_ = position_l
+
+    def getNexActions(self, nbActions_p):
+        self.step_ += nbActions_p
+        # two uniforms per action, drawn in the same order as getNexAction
+        uniforms_l = self._nextUniforms(2*nbActions_p).reshape(nbActions_p, 2)
+        exploreActions_l = self.exploreActionsList()
+        if len(exploreActions_l) == 0:
+            exploreActions_l = np.arange(len(self.vectBanditsEvals_))
+        return np.where(uniforms_l[:, 0] < self.epsilon_,
+                        self._randomChoices(exploreActions_l, uniforms_l[:, 1]),
+                        self._randomChoices(self.exploitActionsList(), uniforms_l[:, 1]))
+
+    def updateMany(self, actions_p, rewards_p):
+        self._sampleAverageUpdateMany(actions_p, rewards_p)
+
+    def getNexActionsBatch(self, state_p):
+        state_p.step_ += 1
+
+        doExploreActions_l = state_p.nextUniforms() < self.epsilon_
+        choiceUniforms_l = state_p.nextUniforms()
+        greedyActions_l = state_p.exploitActionsMask()
+        exploreActions_l = ~greedyActions_l
+        # runs where every bandit is greedy explore among all of them
+        exploreActions_l[~exploreActions_l.any(axis=1)] = True
+
+        return _randomChoiceRows(np.where(doExploreActions_l[:, None], exploreActions_l, greedyActions_l), choiceUniforms_l)
+
+    def updateBatch(self, state_p, actions_p, rewards_p):
+        runs_l = np.arange(state_p.nbRuns_)
+        state_p.vectCountBanditsPulls_[runs_l, actions_p] += 1
+        observationsCount_l = 1+state_p.vectCountBanditsPulls_[runs_l, actions_p]
+        state_p.vectBanditsEvals_[runs_l, actions_p] += (1/(observationsCount_l))*(rewards_p - state_p.vectBanditsEvals_[runs_l, actions_p])
+        state_p.vectBanditsParamEstimates_[runs_l, actions_p] += (1/(observationsCount_l))*(rewards_p - state_p.vectBanditsParamEstimates_[runs_l, actions_p])
 
 
 
@@ -168,19 +791,27 @@ class UCBPolicy(_BasePolicy):
     
     Eval(Action, step) = SampleAverage(Action, step) + exploreParam_ * sqrt( ln(step) / PriorCount(Action, step) )
 
+    Counts and estimates are held in arrays and updated for the pulled bandit only, the uncertainty
+     component of every bandit is computed in one array operation when the evaluations are needed.
+
     Attributes
     ----------
-    vectCountBanditsPulls_ : list describing the number of times we pulled the corresponding bandit.
+    vectCountBanditsPulls_ : array describing the number of times we pulled the corresponding bandit.
     
-    vectBanditsEvals_ : list describing the scores associated to the corresponding bandit.
+    vectBanditsEvals_ : array describing the scores associated to the corresponding bandit. Computed
+     from the counts and the estimates when read, equal to the initial scores until the first update.
     
-    vectBanditsParamEstimates_ : list describing the estimate associated to the key parameter of
+    vectBanditsParamEstimates_ : array describing the estimate associated to the key parameter of
      the bandit's probability distribution.
     
     step_ : timestep ie number of times actions were performed.
     
     exploreParam_ : exploration coefficient.
 
+    vectInitialEvals_ : array of the initial scores associated to the bandits.
+
+    lastUpdateStep_ : timestep of the last update, None before the first one.
+
     Methods
     -------
     getNexAction : returns the best action to be performed according to the policy.
@@ -189,20 +820,517 @@ class UCBPolicy(_BasePolicy):
      drawn. Needs to be called each time after the reward of getNextAction is revealed.  
     """
 
-    def __init__(self, exploreParam_p):
-        super().__init__()
+    __slots__ = ("exploreParam_", "vectInitialEvals_", "lastUpdateStep_")
+
+    batchParams_ = ("exploreParam_p",)
+
+    def __init__(self, exploreParam_p, dtype_p=np.float64):
         self.exploreParam_ = exploreParam_p
+        super().__init__(dtype_p)
+
+    @property
+    def vectBanditsEvals_(self):
+        if self.lastUpdateStep_ is None:
+            return self.vectInitialEvals_.copy()
+        uncertainties_l = np.sqrt(np.log(self.lastUpdateStep_+1) / (1+self.vectCountBanditsPulls_))
+        return self.vectBanditsParamEstimates_ + self.exploreParam_ * uncertainties_l
+
+    @vectBanditsEvals_.setter
+    def vectBanditsEvals_(self, evals_p):
+        # evaluations are derived from the other attributes, setting them sets the initial scores
+        self.vectInitialEvals_ = np.array(evals_p, dtype=self.dtype_)
+        self.lastUpdateStep_ = None
+
+    def _arraysAttributes(self):
+        return (("vectCountBanditsPulls_", np.int64), ("vectInitialEvals_", self.dtype_), ("vectBanditsParamEstimates_", self.dtype_))
+
+    def _initArrays(self, index_p, initialEvals_p):
+        self.vectCountBanditsPulls_[index_p] = 0
+        self.vectInitialEvals_[index_p] = initialEvals_p
+        self.vectBanditsParamEstimates_[index_p] = initialEvals_p
+
+    def reinit(self, initialEvals_p):
+        super().reinit(initialEvals_p)
+        self.lastUpdateStep_ = None
 
     def getNexAction(self):
         self.step_ += 1
-        return np.random.choice(self.exploitActionsList())
+        evals_l = self.vectBanditsEvals_
+        return self._randomChoice(np.flatnonzero(evals_l == np.max(evals_l)), self._nextUniform())
 
     def update(self, action_p, reward_p):
-        self.vectCountBanditsPulls_[action_p] += 1
+        pullsCount_l = self.vectCountBanditsPulls_.item(action_p) + 1
+        self.vectCountBanditsPulls_[action_p] = pullsCount_l
         #actual estimate : ignores the initial estimate
-        self.vectBanditsParamEstimates_[action_p] += (1/self.vectCountBanditsPulls_[action_p])*(reward_p - self.vectBanditsParamEstimates_[action_p])        
+        estimate_l = self.vectBanditsParamEstimates_.item(action_p)
+        self.vectBanditsParamEstimates_[action_p] = estimate_l + (1/pullsCount_l)*(reward_p - estimate_l)
+        self.lastUpdateStep_ = self.step_
+
+    def runSteps(self, nsteps_p, firstStep_p, pull_p, actions_p, rewards_p, evals_p=None, evalsStride_p=1):
+        counts_l = self.vectCountBanditsPulls_
+        estimates_l = self.vectBanditsParamEstimates_
+        # 1+counts kept as floats, dividing by them gives the same uncertainties
+        observationsCounts_l = 1. + counts_l
+        evalsBuffer_l = np.empty(len(counts_l))
+        uniforms_l, position_l = self._remainingUniforms()
+
+        for step_cntr in range(nsteps_p):
+            if self.lastUpdateStep_ is None:
+                stepEvals_l = self.vectInitialEvals_
+            else:
+                # same operations as vectBanditsEvals_, computed in place
+                stepEvals_l = evalsBuffer_l
+                np.divide(np.log(self.lastUpdateStep_+1), observationsCounts_l, out=stepEvals_l)
+                np.sqrt(stepEvals_l, out=stepEvals_l)
+                np.multiply(self.exploreParam_, stepEvals_l, out=stepEvals_l)
+                np.add(estimates_l, stepEvals_l, out=stepEvals_l)
+            if evals_p is not None and step_cntr % evalsStride_p == 0:
+                evals_p[step_cntr // evalsStride_p] = stepEvals_l
+            if position_l == len(uniforms_l):
+                uniforms_l = self._refillUniforms()
+                position_l = 0
+            uniform_l = uniforms_l[position_l]
+            position_l += 1
+
+            greedyActions_l = np.flatnonzero(stepEvals_l == stepEvals_l.max())
+            action_l = int(greedyActions_l[min(int(uniform_l * len(greedyActions_l)), len(greedyActions_l)-1)])
+            reward_l = pull_p(action_l, firstStep_p + step_cntr + 1)
+
+            pullsCount_l = counts_l.item(action_l) + 1
+            counts_l[action_l] = pullsCount_l
+            observationsCounts_l[action_l] += 1
+            estimate_l = estimates_l.item(action_l)
+            estimates_l[action_l] = estimate_l + (1/pullsCount_l)*(reward_l - estimate_l)
+            self.step_ += 1
+            self.lastUpdateStep_ = self.step_
+
+            actions_p[step_cntr] = action_l
+            rewards_p[step_cntr] = reward_l
+
+        self.uniformsPosition_ = position_l
+
+    def getNexActions(self, nbActions_p):
+        self.step_ += nbActions_p
+        evals_l = self.vectBanditsEvals_
+        return self._randomChoices(np.flatnonzero(evals_l == np.max(evals_l)), self._nextUniforms(nbActions_p))
+
+    def updateMany(self, actions_p, rewards_p):
+        actions_l, counts_l, means_l = self._groupRewards(actions_p, rewards_p)
+        self.vectCountBanditsPulls_[actions_l] += counts_l
+        #actual estimate : ignores the initial estimate. n rewards move it by n/count of the gap to their mean
+        self.vectBanditsParamEstimates_[actions_l] += (counts_l/self.vectCountBanditsPulls_[actions_l])*(means_l - self.vectBanditsParamEstimates_[actions_l])
+        self.lastUpdateStep_ = self.step_
+
+    def getNexActionsBatch(self, state_p):
+        state_p.step_ += 1
+        return _randomChoiceRows(state_p.exploitActionsMask(), state_p.nextUniforms())
+
+    def updateBatch(self, state_p, actions_p, rewards_p):
+        runs_l = np.arange(state_p.nbRuns_)
+        state_p.vectCountBanditsPulls_[runs_l, actions_p] += 1
+        #actual estimate : ignores the initial estimate
+        state_p.vectBanditsParamEstimates_[runs_l, actions_p] += (1/state_p.vectCountBanditsPulls_[runs_l, actions_p])*(rewards_p - state_p.vectBanditsParamEstimates_[runs_l, actions_p])
+
+        uncertainties_l = np.sqrt(np.log(state_p.step_+1) / (1+state_p.vectCountBanditsPulls_))
+        # the exploration coefficient may hold one value per run
+        exploreParams_l = np.reshape(self.exploreParam_, (-1, 1))
+        state_p.vectBanditsEvals_[:] = state_p.vectBanditsParamEstimates_ + exploreParams_l * uncertainties_l
+
+class NonStationaryEpsilonGreedyPolicy(EpsilonGreedyPolicy):
+    """
+    Class implementing an epsilon-greedy policy for non-stationary bandits.
+    The policy chooses its actions as EpsilonGreedyPolicy does, but the bandits' evaluations are the
+     estimates of an estimator forgetting the old rewards, eg. a SlidingWindowEstimator or a
+     DiscountedEstimator, so that they follow the bandits that drift.
+
+    An update changes the estimates of at most two bandits in O(1), the pulled one and the one whose
+     oldest reward leaves a sliding window, and only those are updated in the greedy tree.
+    Runs are not vectorized nor fused: the batched and fused simulations replay the steps one by one.
+
+    Parameters
+    ----------
+    epsilon_p : probability of performing an exploration action.
+
+    estimator_p : the estimator of the bandits' mean rewards, owned by the policy.
+
+    Attributes
+    ----------
+    estimator_ : the estimator of the bandits' mean rewards.
+
+    vectCountBanditsPulls_ counts every pull, including the ones the estimator forgot.
+    """
+
+    __slots__ = ("estimator_",)
+
+    getNexActionsBatch = _BasePolicy.getNexActionsBatch
+    updateBatch = _BasePolicy.updateBatch
+    updateMany = _BasePolicy.updateMany
+
+    def __init__(self, epsilon_p, estimator_p, dtype_p=np.float64):
+        self.estimator_ = estimator_p
+        super().__init__(epsilon_p, dtype_p)
+
+    def reinit(self, initialEvals_p):
+        super().reinit(initialEvals_p)
+        self.estimator_.reinit(initialEvals_p)
+
+    def addBandit(self, initialEval_p):
+        super().addBandit(initialEval_p)
+        self.estimator_.addBandit(initialEval_p)
+
+    def update(self, action_p, reward_p):
+        self.vectCountBanditsPulls_[action_p] += 1
+        for action_l in self.estimator_.update(self.step_, action_p, reward_p):
+            estimate_l = self.estimator_.getEstimate(action_l)
+            self.vectBanditsEvals_[action_l] = estimate_l
+            self.vectBanditsParamEstimates_[action_l] = estimate_l
+            self._updateGreedyTree(action_l)
+
+class NonStationaryUCBPolicy(UCBPolicy):
+    """
+    Class implementing an Upper Confidence Bound policy for non-stationary bandits, sliding-window
+     UCB with a SlidingWindowEstimator and discounted UCB with a DiscountedEstimator.
+    The sample averages and the counts of UCBPolicy are replaced by those of the estimator, which
+     only remembers the recent rewards, and the step by the number of rewards it remembers:
+
+    Eval(Action, step) = Estimate(Action, step) + exploreParam_ * sqrt( ln(Horizon(step)+1) / (1+Count(Action, step)) )
+
+    The estimator applies the discount lazily, so that an update costs O(1) and the counts of every
+     bandit are only brought to the current step when the evaluations are read.
+    Runs are not vectorized nor fused: the batched and fused simulations replay the steps one by one.
+
+    Parameters
+    ----------
+    exploreParam_p : exploration coefficient.
+
+    estimator_p : the estimator of the bandits' mean rewards, owned by the policy.
+
+    Attributes
+    ----------
+    estimator_ : the estimator of the bandits' mean rewards.
+
+    vectCountBanditsPulls_ counts every pull, including the ones the estimator forgot.
+    """
+
+    __slots__ = ("estimator_",)
+
+    getNexActionsBatch = _BasePolicy.getNexActionsBatch
+    updateBatch = _BasePolicy.updateBatch
+    updateMany = _BasePolicy.updateMany
+
+    def __init__(self, exploreParam_p, estimator_p, dtype_p=np.float64):
+        self.estimator_ = estimator_p
+        super().__init__(exploreParam_p, dtype_p)
+
+    def _getEvals(self):
+        if self.lastUpdateStep_ is None:
+            return self.vectInitialEvals_.copy()
+        counts_l = self.estimator_.getCounts(self.lastUpdateStep_)
+        uncertainties_l = np.sqrt(np.log(self.estimator_.getHorizon(self.lastUpdateStep_)+1) / (1+counts_l))
+        return self.vectBanditsParamEstimates_ + self.exploreParam_ * uncertainties_l
+
+    vectBanditsEvals_ = property(_getEvals, UCBPolicy.vectBanditsEvals_.fset)
+
+    def reinit(self, initialEvals_p):
+        super().reinit(initialEvals_p)
+        self.estimator_.reinit(initialEvals_p)
+
+    def addBandit(self, initialEval_p):
+        super().addBandit(initialEval_p)
+        self.estimator_.addBandit(initialEval_p)
+
+    def update(self, action_p, reward_p):
+        self.vectCountBanditsPulls_[action_p] += 1
+        for action_l in self.estimator_.update(self.step_, action_p, reward_p):
+            self.vectBanditsParamEstimates_[action_l] = self.estimator_.getEstimate(action_l)
+        self.lastUpdateStep_ = self.step_
+
+class _BaseThompsonPolicy(_BasePolicy):
+    """
+    Abstract base class for Thompson sampling policies.
+    The policy draws a sample of the posterior distribution of the mean reward of every bandit and
+     returns the action having the highest sample.
+
+    Posterior parameters are held in arrays, and the posteriors of all the bandits are sampled by one
+     call to the policy's Generator per step, or per batch of steps in getNexActions, so that the
+     Python cost of a step does not grow with the number of bandits. The samples are drawn from rng_
+     rather than from the uniforms buffer: a run draws the same samples alone, in a batch or in
+     another process as long as it samples its posteriors with the same calls.
+
+    Attributes
+    ----------
+    vectCountBanditsPulls_ : array describing the number of times we pulled the corresponding bandit.
+
+    vectBanditsEvals_ : array of the posterior means of the rewards of the bandits.
+
+    vectBanditsParamEstimates_ : array of the posterior means of the rewards of the bandits.
+
+    step_ : timestep ie number of times actions were performed.
+
+    posteriorAttributes_ : names of the arrays of the posterior parameters, the first two ones
+     parameterizing the sampling.
+
+    Methods
+    -------
+    getNexAction : returns the action having the highest posterior sample.
+
+    update : updates the posterior of the bandit pulled with its reward.
+
+    _initPosteriors : abstract. sets the prior parameters of some bandits.
+
+    _samplePosteriors : abstract. returns samples of the posteriors drawn from a Generator.
+
+    _addRewards : abstract. adds the rewards of some pulls to the posteriors of the bandits.
+
+    _checkRewards : raises a ValueError for rewards the posteriors are not defined for.
+    """
+
+    posteriorAttributes_ = ()
+    # bound on the number of samples drawn by one call, in getNexActions and in batch states
+    maxSamples_ = 2**22
+
+    __slots__ = ()
+
+    def _arraysAttributes(self):
+        # posterior parameters stay float64, whatever the dtype of the evaluations
+        return super()._arraysAttributes() + tuple((name_l, np.float64) for name_l in self.posteriorAttributes_)
+
+    def _initArrays(self, index_p, initialEvals_p):
+        self.vectCountBanditsPulls_[index_p] = 0
+        self._initPosteriors(self, index_p, initialEvals_p)
+
+    def _initPosteriors(self, state_p, index_p, priorMeans_p):
+        """
+        abstract. sets the prior parameters, evaluations and estimates of the bandits index_p of
+         state_p, the policy itself or a batch state.
+
+        priorMeans_p : initial scores of the bandits.
+        """
+        pass
+
+    def _samplePosteriors(self, rng_p, first_p, second_p, shape_p):
+        """
+        abstract. returns an array of shape shape_p of samples of the posteriors parameterized by the
+         arrays first_p and second_p, broadcast along its first axis, drawn from rng_p.
+        """
+        pass
+
+    def _addRewards(self, state_p, index_p, counts_p, sums_p):
+        """
+        abstract. adds to the posteriors of the bandits index_p of state_p counts_p rewards summing to
+         sums_p, and updates their evaluations and estimates. The bandits of index_p are distinct.
+        """
+        pass
+
+    def _checkRewards(self, rewards_p):
+        """
+        raises a ValueError if the posteriors are not defined for the reward, or array of rewards,
+         rewards_p. Any reward is accepted by default.
+        """
+        pass
+
+    def _sampleParams(self, state_p):
+        return getattr(state_p, self.posteriorAttributes_[0]), getattr(state_p, self.posteriorAttributes_[1])
+
+    def getNexAction(self):
+        self.step_ += 1
+        first_l, second_l = self._sampleParams(self)
+        return int(np.argmax(self._samplePosteriors(self.rng_, first_l, second_l, (1, len(first_l)))[0]))
+
+    def getNexActions(self, nbActions_p):
+        self.step_ += nbActions_p
+        first_l, second_l = self._sampleParams(self)
+        rowsPerCall_l = max(1, self.maxSamples_ // max(1, len(first_l)))
+        actions_l = np.empty(nbActions_p, dtype=np.int64)
+        for firstRow_l in range(0, nbActions_p, rowsPerCall_l):
+            nbRows_l = min(rowsPerCall_l, nbActions_p - firstRow_l)
+            actions_l[firstRow_l:firstRow_l+nbRows_l] = np.argmax(self._samplePosteriors(self.rng_, first_l, second_l, (nbRows_l, len(first_l))), axis=1)
+        return actions_l
+
+    def update(self, action_p, reward_p):
+        self._checkRewards(reward_p)
+        self.vectCountBanditsPulls_[action_p] += 1
+        self._addRewards(self, action_p, 1, reward_p)
+
+    def updateMany(self, actions_p, rewards_p):
+        self._checkRewards(rewards_p)
+        actions_l, inverse_l = np.unique(np.asarray(actions_p), return_inverse=True)
+        counts_l = np.bincount(inverse_l, minlength=len(actions_l))
+        self.vectCountBanditsPulls_[actions_l] += counts_l
+        self._addRewards(self, actions_l, counts_l, np.bincount(inverse_l, weights=rewards_p, minlength=len(actions_l)))
+
+    def runSteps(self, nsteps_p, firstStep_p, pull_p, actions_p, rewards_p, evals_p=None, evalsStride_p=1):
+        first_l, second_l = self._sampleParams(self)
+        shape_l = (1, len(first_l))
+        counts_l = self.vectCountBanditsPulls_
+        for step_cntr in range(nsteps_p):
+            if evals_p is not None and step_cntr % evalsStride_p == 0:
+                evals_p[step_cntr // evalsStride_p] = self.vectBanditsEvals_
+            action_l = int(np.argmax(self._samplePosteriors(self.rng_, first_l, second_l, shape_l)[0]))
+            reward_l = pull_p(action_l, firstStep_p + step_cntr + 1)
+            self._checkRewards(reward_l)
+            counts_l[action_l] += 1
+            self._addRewards(self, action_l, 1, reward_l)
+            actions_p[step_cntr] = action_l
+            rewards_p[step_cntr] = reward_l
+        self.step_ += nsteps_p
+
+    def newBatchState(self, initialEvals_p, nbRuns_p, rngs_p=None):
+        if rngs_p is None:
+            rngs_p = [np.random.default_rng(seedSequence_l) for seedSequence_l in np.random.SeedSequence().spawn(nbRuns_p)]
+        state_l = BatchPolicyState(initialEvals_p, nbRuns_p, rngs_p, self.bufferSize_)
+        state_l.rngs_ = rngs_p
+        for name_l in self.posteriorAttributes_:
+            setattr(state_l, name_l, np.zeros(state_l.vectBanditsEvals_.shape))
+        self._initPosteriors(state_l, Ellipsis, state_l.vectBanditsEvals_.copy())
+        return state_l
+
+    def _sampleRuns(self, state_p):
+        """
+        returns the (nbRuns, nbBandits) samples of the posteriors of each run of state_p, each run
+         drawing from its own Generator.
+        """
+        first_l, second_l = self._sampleParams(state_p)
+        return np.concatenate([self._samplePosteriors(rng_l, runFirst_l, runSecond_l, (1, len(runFirst_l)))
+                               for rng_l, runFirst_l, runSecond_l in zip(state_p.rngs_, first_l, second_l)])
+
+    def getNexActionsBatch(self, state_p):
+        state_p.step_ += 1
+        return np.argmax(self._sampleRuns(state_p), axis=1)
+
+    def updateBatch(self, state_p, actions_p, rewards_p):
+        self._checkRewards(rewards_p)
+        runs_l = np.arange(state_p.nbRuns_)
+        state_p.vectCountBanditsPulls_[runs_l, actions_p] += 1
+        self._addRewards(state_p, (runs_l, actions_p), 1, rewards_p)
+
+class BetaThompsonPolicy(_BaseThompsonPolicy):
+    """
+    Class implementing Thompson sampling with Beta-Bernoulli conjugate posteriors, suited to rewards
+     in [0, 1].
+    The posterior of a bandit is Beta(alpha_ + sum of its rewards, beta_ + sum of 1 - its rewards).
+    The initial scores of the bandits are not used, their evaluations being the posterior means.
+    Rewards outside [0, 1] would make the posterior parameters negative, updates raise a ValueError
+     for them instead: use this policy with Bernoulli bandits or rewards rescaled to [0, 1].
+
+    Parameters
+    ----------
+    alpha_p : first parameter of the Beta prior.
+
+    beta_p : second parameter of the Beta prior.
+
+    Attributes
+    ----------
+    alphas_ : array of the first parameter of the posterior of each bandit.
+
+    betas_ : array of the second parameter of the posterior of each bandit.
+    """
+
+    __slots__ = ("alpha_", "beta_", "alphas_", "betas_")
+
+    posteriorAttributes_ = ("alphas_", "betas_")
+
+    def __init__(self, alpha_p=1., beta_p=1., dtype_p=np.float64):
+        self.alpha_ = alpha_p
+        self.beta_ = beta_p
+        super().__init__(dtype_p)
+
+    def _initPosteriors(self, state_p, index_p, priorMeans_p):
+        state_p.alphas_[index_p] = self.alpha_
+        state_p.betas_[index_p] = self.beta_
+        state_p.vectBanditsEvals_[index_p] = self.alpha_ / (self.alpha_ + self.beta_)
+        state_p.vectBanditsParamEstimates_[index_p] = self.alpha_ / (self.alpha_ + self.beta_)
+
+    def _samplePosteriors(self, rng_p, first_p, second_p, shape_p):
+        # X/(X+Y) with X ~ Gamma(alpha) and Y ~ Gamma(beta) follows Beta(alpha, beta), and is faster to
+        # draw than Generator.beta for the many bandits still close to a uniform prior. Both gammas of
+        # a sample row are drawn together, so that n rows at once draw the same as n rows one by one
+        gammas_l = rng_p.standard_gamma(np.stack((first_p, second_p)), (shape_p[0], 2, shape_p[1]))
+        return gammas_l[:, 0] / (gammas_l[:, 0] + gammas_l[:, 1])
+
+    def _addRewards(self, state_p, index_p, counts_p, sums_p):
+        state_p.alphas_[index_p] += sums_p
+        state_p.betas_[index_p] += counts_p - sums_p
+        means_l = state_p.alphas_[index_p] / (state_p.alphas_[index_p] + state_p.betas_[index_p])
+        state_p.vectBanditsEvals_[index_p] = means_l
+        state_p.vectBanditsParamEstimates_[index_p] = means_l
+
+    def _checkRewards(self, rewards_p):
+        # a scalar is compared as a float, cheaper than through numpy in the loop of runSteps
+        if np.ndim(rewards_p) == 0:
+            valid_l = 0 <= rewards_p <= 1
+        else:
+            rewards_l = np.asarray(rewards_p)
+            valid_l = bool(np.all((rewards_l >= 0) & (rewards_l <= 1)))
+        if not valid_l:
+            raise ValueError("BetaThompsonPolicy needs rewards in [0, 1], the Beta-Bernoulli posteriors being undefined for others")
+
+class NormalThompsonPolicy(_BaseThompsonPolicy):
+    """
+    Class implementing Thompson sampling with Normal-Normal conjugate posteriors, for normal rewards
+     of known standard deviation.
+    The prior of the mean reward of a bandit is N(initial score, priorStd_). Its posterior precision
+     is 1/priorStd_**2 + count/noiseStd_**2 and its posterior mean the precision-weighted average of
+     the prior mean and of the rewards.
+
+    In batch states the standard normal variates of each run are drawn by blocks of steps, so that
+     the Generators are called once per block rather than once per step.
+
+    Parameters
+    ----------
+    noiseStd_p : standard deviation of the rewards.
+
+    priorStd_p : standard deviation of the prior of the mean rewards.
+
+    Attributes
+    ----------
+    means_ : array of the posterior mean of each bandit.
+
+    stds_ : array of the posterior standard deviation of each bandit.
+
+    precisions_ : array of the posterior precision of each bandit.
+
+    weightedSums_ : array of the precision-weighted sum of the prior mean and of the rewards of each bandit.
+    """
+
+    __slots__ = ("noiseStd_", "priorStd_", "means_", "stds_", "precisions_", "weightedSums_")
+
+    posteriorAttributes_ = ("means_", "stds_", "precisions_", "weightedSums_")
+
+    def __init__(self, noiseStd_p=1., priorStd_p=1., dtype_p=np.float64):
+        self.noiseStd_ = noiseStd_p
+        self.priorStd_ = priorStd_p
+        super().__init__(dtype_p)
+
+    def _initPosteriors(self, state_p, index_p, priorMeans_p):
+        state_p.precisions_[index_p] = 1 / self.priorStd_**2
+        state_p.weightedSums_[index_p] = priorMeans_p / self.priorStd_**2
+        state_p.means_[index_p] = priorMeans_p
+        state_p.stds_[index_p] = self.priorStd_
+        state_p.vectBanditsEvals_[index_p] = priorMeans_p
+        state_p.vectBanditsParamEstimates_[index_p] = priorMeans_p
+
+    def _samplePosteriors(self, rng_p, first_p, second_p, shape_p):
+        return first_p + second_p * rng_p.standard_normal(shape_p)
+
+    def _addRewards(self, state_p, index_p, counts_p, sums_p):
+        state_p.precisions_[index_p] += counts_p / self.noiseStd_**2
+        state_p.weightedSums_[index_p] += sums_p / self.noiseStd_**2
+        means_l = state_p.weightedSums_[index_p] / state_p.precisions_[index_p]
+        state_p.means_[index_p] = means_l
+        state_p.stds_[index_p] = 1 / np.sqrt(state_p.precisions_[index_p])
+        state_p.vectBanditsEvals_[index_p] = means_l
+        state_p.vectBanditsParamEstimates_[index_p] = means_l
 
-        uncertainties_l = []
-        for action_cntr in range(len(self.vectBanditsEvals_)):
-            uncertainty_l = np.sqrt(np.log(self.step_+1) / (1+self.vectCountBanditsPulls_[action_cntr]) )
-            self.vectBanditsEvals_[action_cntr] = self.vectBanditsParamEstimates_[action_cntr] + self.exploreParam_ * uncertainty_l
+    def _sampleRuns(self, state_p):
+        normals_l = getattr(state_p, "normals_", None)
+        if normals_l is None or state_p.normalsPosition_ == normals_l.shape[1]:
+            # a block of standard normals drawn at once is the sequence drawn by as many steps
+            blockSteps_l = max(1, min(self.bufferSize_, 2**20 // state_p.means_.size))
+            state_p.normals_ = np.empty((state_p.nbRuns_, blockSteps_l, state_p.means_.shape[1]))
+            for run_cntr, rng_l in enumerate(state_p.rngs_):
+                state_p.normals_[run_cntr] = rng_l.standard_normal((blockSteps_l, state_p.means_.shape[1]))
+            state_p.normalsPosition_ = 0
+        normals_l = state_p.normals_[:, state_p.normalsPosition_, :]
+        state_p.normalsPosition_ += 1
+        return state_p.means_ + state_p.stds_ * normals_l
@@ -0,0 +1,5 @@
+from .profiling import StepProfiler
+
+__all__ = [
+    "StepProfiler"
+]
\ No newline at end of file
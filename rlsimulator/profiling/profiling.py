@@ -0,0 +1,113 @@
+ # profiling.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import io
+import cProfile
+import pstats
+
+class StepProfiler:
+    """
+    Cumulative time and calls count of each phase of the steps of a Simulator.
+
+    Phases are keyed by their name and by the class performing them, eg. ("getReward",
+     "NormalBandit"), so that custom policies, bandits and metrics show up in the breakdown.
+    cProfile captures the calls made by the steps sampled in a window of steps.
+
+    Attached with Simulator.enableProfiling, which switches the simulator to an instrumented step
+     so that a simulator without profiler pays nothing.
+
+    Parameters
+    ----------
+    profileWindow_p : (firstStep, lastStep) window of the steps captured by cProfile, bounds included.
+     No capture if None.
+
+    profileEvery_p : one step out of profileEvery_p of the window is captured.
+
+    Attributes
+    ----------
+    phases_ : dict mapping each (phase, class name) to the list [calls count, cumulative seconds].
+
+    profile_ : cProfile.Profile of the captured steps, None if no capture.
+
+    profiledSteps_ : number of steps captured by cProfile.
+
+    Methods
+    -------
+    record : adds the duration of a phase.
+
+    beginStep : starts the capture of a step if it is sampled.
+
+    endStep : stops the capture of a step.
+
+    getStats : returns the breakdown of the time spent per phase.
+
+    report : returns a printable report of the breakdown and of the cProfile capture.
+
+    reset : forgets the recorded times and the capture.
+    """
+
+    def __init__(self, profileWindow_p=None, profileEvery_p=1):
+        self.profileWindow_ = profileWindow_p
+        self.profileEvery_ = profileEvery_p
+        self.reset()
+
+    def reset(self):
+        self.phases_ = {}
+        self.profile_ = cProfile.Profile() if self.profileWindow_ is not None else None
+        self.profiledSteps_ = 0
+        self.profiling_ = False
+
+    def record(self, phase_p, className_p, seconds_p):
+        phase_l = self.phases_.get((phase_p, className_p))
+        if phase_l is None:
+            phase_l = self.phases_[(phase_p, className_p)] = [0, 0.]
+        phase_l[0] += 1
+        phase_l[1] += seconds_p
+
+    def beginStep(self, step_p):
+        if self.profile_ is None:
+            return
+        firstStep_l, lastStep_l = self.profileWindow_
+        if firstStep_l <= step_p <= lastStep_l and (step_p - firstStep_l) % self.profileEvery_ == 0:
+            self.profiling_ = True
+            self.profiledSteps_ += 1
+            self.profile_.enable()
+
+    def endStep(self):
+        if self.profiling_:
+            self.profile_.disable()
+            self.profiling_ = False
+
+    def getStats(self):
+        """
+        returns a list of dicts, one per phase sorted by decreasing time, holding the phase, the
+         class, the calls count, the cumulative seconds, the mean microseconds per call and the share
+         of the total time.
+        """
+        totalSeconds_l = sum(seconds_l for _, seconds_l in self.phases_.values())
+        stats_l = []
+        for (phase_l, className_l), (calls_l, seconds_l) in self.phases_.items():
+            stats_l.append({"phase": phase_l, "class": className_l, "calls": calls_l, "seconds": seconds_l,
+                            "meanMicroseconds": 1e6 * seconds_l / calls_l,
+                            "share": seconds_l / totalSeconds_l if totalSeconds_l > 0 else 0.})
+        return sorted(stats_l, key=lambda stat_l: -stat_l["seconds"])
+
+    def report(self, nbFunctions_p=20):
+        """
+        returns the breakdown of the time per phase followed, if steps were captured, by the
+         nbFunctions_p functions with the highest cumulative time in the cProfile capture.
+        """
+        lines_l = ["%-14s %-28s %10s %12s %12s %7s" % ("phase", "class", "calls", "seconds", "us/call", "share")]
+        for stat_l in self.getStats():
+            lines_l.append("%-14s %-28s %10i %12.4f %12.3f %6.1f%%" % (stat_l["phase"], stat_l["class"], stat_l["calls"],
+                                                                       stat_l["seconds"], stat_l["meanMicroseconds"], 100*stat_l["share"]))
+        if self.profiledSteps_ > 0:
+            stream_l = io.StringIO()
+            lines_l.append("")
+            lines_l.append("cProfile capture of %i steps" % self.profiledSteps_)
+            pstats.Stats(self.profile_, stream=stream_l).sort_stats("cumulative").print_stats(nbFunctions_p)
+            lines_l.append(stream_l.getvalue())
+        return "\n".join(lines_l)
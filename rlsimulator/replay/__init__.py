@@ -0,0 +1,5 @@
+from .replay import ReplayEvaluator
+
+__all__ = [
+    "ReplayEvaluator"
+]
\ No newline at end of file
@@ -0,0 +1,172 @@
+ # replay.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import os
+import numpy as np
+
+def _openColumn(column_p):
+    # paths are opened as memory-mapped .npy files, arrays and np.memmap are used as they are
+    if isinstance(column_p, (str, os.PathLike)):
+        return np.load(column_p, mmap_mode="r")
+    return column_p
+
+class ReplayEvaluator:
+    """
+    Offline evaluation of a policy against logged (action, reward) data, without a live environment.
+
+    The rows of the log are replayed in order: the policy chooses an action for each row and, by
+     rejection sampling, the row is accepted when the choice matches the logged action, the policy is
+     then updated with the logged reward, and discarded otherwise, as if it had not been logged. The
+     steps of the policy only count the accepted rows. The mean reward of the accepted rows estimates
+     the reward of the policy when the actions were logged uniformly at random.
+    When the propensities of the logged actions, ie. their probabilities under the logging policy,
+     are given, the rewards are also estimated by inverse propensity scoring, each row weighing
+     1/propensity when accepted and 0 otherwise, in its plain and self-normalized forms. Rows whose
+     propensity is missing, ie. nan, are replayed but not scored. A propensity of 0 is an action the
+     logging policy never takes, the estimates are undefined with it.
+
+    The columns of the log are read by chunks of chunkSize_p rows, so that memory-mapped logs of
+     billions of rows are replayed in bounded memory. With batchSize_p greater than 1, the actions of
+     batchSize_p rows are chosen together with getNexActions from the state of the policy at the
+     start of the batch and the accepted rows are applied with one updateMany, which is faster but
+     evaluates the policy as if it were served by batches.
+
+    Parameters
+    ----------
+    policy_p : the policy evaluated.
+
+    initialEvals_p : list of the initial scores of the bandits the policy is reinitialized with.
+
+    batchSize_p : number of rows whose actions are chosen together.
+
+    chunkSize_p : number of rows of the log read at once.
+
+    seed_p : seed of the Generator of the policy. Fresh entropy is used if None.
+
+    Attributes
+    ----------
+    policy_ : the policy evaluated.
+
+    rowsCount_ : number of rows replayed.
+
+    acceptedCount_ : number of rows accepted.
+
+    acceptedRewards_ : sum of the rewards of the accepted rows.
+
+    scoredCount_ : number of rows replayed with a propensity that is not missing.
+
+    weightsSum_ : sum of the inverse propensity weights of the rows replayed with a propensity.
+
+    weightedRewards_ : sum of the rewards of these rows times their weights.
+
+    Methods
+    -------
+    reinit : reinitializes the policy and forgets the rows replayed.
+
+    replay : replays the rows of a log, continuing the previous ones.
+
+    getEstimates : returns the estimated rewards of the policy.
+    """
+
+    def __init__(self, policy_p, initialEvals_p, batchSize_p=1, chunkSize_p=2**20, seed_p=None):
+        self.policy_ = policy_p
+        self.initialEvals_ = list(initialEvals_p)
+        self.batchSize_ = batchSize_p
+        self.chunkSize_ = chunkSize_p
+        self.seed_ = seed_p
+        self.reinit()
+
+    def reinit(self):
+        """
+        reinitializes the policy with the initial scores and its Generator with the seed, and forgets
+         the rows replayed.
+        """
+        self.policy_.setRng(np.random.default_rng(self.seed_))
+        self.policy_.reinit(list(self.initialEvals_))
+        self.rowsCount_ = 0
+        self.acceptedCount_ = 0
+        self.acceptedRewards_ = 0.
+        self.scoredCount_ = 0
+        self.weightsSum_ = 0.
+        self.weightedRewards_ = 0.
+
+    def _chooseActions(self, loggedActions_p, rewards_p):
+        # returns the mask of the rows whose logged action is the one chosen by the policy
+        policy_l = self.policy_
+        accepted_l = np.zeros(len(loggedActions_p), dtype=bool)
+        if self.batchSize_ == 1:
+            for row_cntr, (loggedAction_l, reward_l) in enumerate(zip(loggedActions_p.tolist(), rewards_p.tolist())):
+                if policy_l.getNexAction() == loggedAction_l:
+                    policy_l.update(loggedAction_l, reward_l)
+                    accepted_l[row_cntr] = True
+                else:
+                    # the rejected row is not a step of the policy
+                    policy_l.step_ -= 1
+        else:
+            for firstRow_l in range(0, len(loggedActions_p), self.batchSize_):
+                rows_l = slice(firstRow_l, firstRow_l + self.batchSize_)
+                step_l = policy_l.step_
+                batchAccepted_l = policy_l.getNexActions(len(loggedActions_p[rows_l])) == loggedActions_p[rows_l]
+                policy_l.step_ = step_l + int(np.count_nonzero(batchAccepted_l))
+                policy_l.updateMany(loggedActions_p[rows_l][batchAccepted_l], rewards_p[rows_l][batchAccepted_l])
+                accepted_l[rows_l] = batchAccepted_l
+        return accepted_l
+
+    def replay(self, actions_p, rewards_p, propensities_p=None):
+        """
+        replays the rows of a log after the ones already replayed and returns the estimates of
+         getEstimates.
+
+        parameters
+        ----------
+        actions_p : the logged actions, an array, a np.memmap or the path of a .npy file, opened
+         memory-mapped.
+
+        rewards_p : the logged rewards, likewise.
+
+        propensities_p : the probabilities of the logged actions under the logging policy, likewise.
+         Rewards are only estimated by inverse propensity scoring if given, from the rows whose
+         propensity is not nan. Raises a ValueError, before replaying the chunk holding it, for a
+         propensity outside ]0, 1].
+        """
+        actions_l = _openColumn(actions_p)
+        rewards_l = _openColumn(rewards_p)
+        propensities_l = None if propensities_p is None else _openColumn(propensities_p)
+        if len(rewards_l) != len(actions_l) or (propensities_l is not None and len(propensities_l) != len(actions_l)):
+            raise ValueError("the columns of the log have different lengths")
+
+        for firstRow_l in range(0, len(actions_l), self.chunkSize_):
+            rows_l = slice(firstRow_l, firstRow_l + self.chunkSize_)
+            chunkActions_l = np.asarray(actions_l[rows_l], dtype=np.int64)
+            chunkRewards_l = np.asarray(rewards_l[rows_l], dtype=float)
+            if propensities_l is not None:
+                chunkPropensities_l = np.asarray(propensities_l[rows_l], dtype=float)
+                if np.any(chunkPropensities_l <= 0) or np.any(chunkPropensities_l > 1):
+                    raise ValueError("the propensities of the log must be in ]0, 1], or nan when missing")
+            accepted_l = self._chooseActions(chunkActions_l, chunkRewards_l)
+
+            self.rowsCount_ += len(chunkActions_l)
+            self.acceptedCount_ += int(np.count_nonzero(accepted_l))
+            self.acceptedRewards_ += float(np.sum(chunkRewards_l[accepted_l]))
+            if propensities_l is not None:
+                scored_l = ~np.isnan(chunkPropensities_l)
+                weights_l = np.where(scored_l, accepted_l, 0.) / np.where(scored_l, chunkPropensities_l, 1.)
+                self.scoredCount_ += int(np.count_nonzero(scored_l))
+                self.weightsSum_ += float(np.sum(weights_l))
+                self.weightedRewards_ += float(np.dot(weights_l, chunkRewards_l))
+
+        return self.getEstimates()
+
+    def getEstimates(self):
+        """
+        returns a dict holding the number of rows replayed and accepted, the mean reward of the
+         accepted rows ("replayReward"), and the inverse propensity scoring ("ipsReward") and
+         self-normalized ("snipsReward") estimates, None when they cannot be computed.
+        """
+        return {"rows": self.rowsCount_, "accepted": self.acceptedCount_,
+                "replayReward": self.acceptedRewards_ / self.acceptedCount_ if self.acceptedCount_ > 0 else None,
+                "ipsReward": self.weightedRewards_ / self.scoredCount_ if self.scoredCount_ > 0 else None,
+                "snipsReward": self.weightedRewards_ / self.weightsSum_ if self.weightsSum_ > 0 else None}
@@ -0,0 +1,15 @@
+from .schedules import ConstantSchedule
+from .schedules import StepSchedule
+from .schedules import PeriodicSchedule
+from .schedules import LinearDriftSchedule
+from .schedules import PiecewiseSchedule
+from .schedules import RandomWalkSchedule
+
+__all__ = [
+    "ConstantSchedule",
+    "StepSchedule",
+    "PeriodicSchedule",
+    "LinearDriftSchedule",
+    "PiecewiseSchedule",
+    "RandomWalkSchedule"
+]
\ No newline at end of file
@@ -0,0 +1,209 @@
+ # schedules.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import numpy as np
+
+class _BaseSchedule:
+    """
+    Abstract base class for schedules ie. values of a parameter of a bandit's distribution evolving
+     with the time step.
+
+    Schedules are evaluated over an array of steps at once, in closed form or with cumulative sums,
+     so that non-stationary bandits produce their rewards and expected rewards in bulk.
+
+    Attributes
+    ----------
+    stationary_ : whether the value is the same at every step.
+
+    Methods
+    -------
+    getValues : abstract. returns the array of the values at each of the given steps.
+
+    getValue : returns the value at a given step.
+    """
+
+    stationary_ = False
+
+    def getValues(self, steps_p):
+        """
+            returns the array of the values of the schedule at each of the given steps.
+
+            steps_p : array of the time steps.
+        """
+        pass
+
+    def getValue(self, step_p):
+        return self.getValues(np.array([step_p])).item(0)
+
+class ConstantSchedule(_BaseSchedule):
+    """
+    Schedule keeping the same value at every step.
+
+    Parameters
+    ----------
+    value_p : the value.
+    """
+
+    stationary_ = True
+
+    def __init__(self, value_p):
+        self.value_ = value_p
+
+    def getValues(self, steps_p):
+        return np.full(len(steps_p), self.value_, dtype=float)
+
+    def getValue(self, step_p):
+        return self.value_
+
+class StepSchedule(_BaseSchedule):
+    """
+    Schedule whose value increases by increment_ every nbStepsToIncrement_ steps:
+     value(step) = initialValue_ + (step // nbStepsToIncrement_) * increment_
+
+    Parameters
+    ----------
+    initialValue_p : value at step 0.
+
+    nbStepsToIncrement_p : number of steps upon which the value is increased.
+
+    increment_p : increment to the value.
+    """
+
+    def __init__(self, initialValue_p, nbStepsToIncrement_p, increment_p):
+        self.initialValue_ = initialValue_p
+        self.nbStepsToIncrement_ = nbStepsToIncrement_p
+        self.increment_ = increment_p
+
+    def getValues(self, steps_p):
+        return self.initialValue_ + (np.asarray(steps_p) // self.nbStepsToIncrement_) * float(self.increment_)
+
+    def getValue(self, step_p):
+        return self.initialValue_ + (step_p // self.nbStepsToIncrement_) * self.increment_
+
+class PeriodicSchedule(_BaseSchedule):
+    """
+    Schedule cycling through values_, each one kept during subPeriod_ steps:
+     value(step) = values_[step % (subPeriod_ * len(values_)) // subPeriod_]
+
+    Parameters
+    ----------
+    values_p : list of the values of a period.
+
+    subPeriod_p : number of steps each value is kept.
+    """
+
+    def __init__(self, values_p, subPeriod_p):
+        self.values_ = np.asarray(values_p, dtype=float)
+        self.subPeriod_ = subPeriod_p
+
+    def getValues(self, steps_p):
+        period_l = self.subPeriod_ * len(self.values_)
+        return self.values_[np.asarray(steps_p) % period_l // self.subPeriod_]
+
+    def getValue(self, step_p):
+        period_l = self.subPeriod_ * len(self.values_)
+        return self.values_.item(step_p % period_l // self.subPeriod_)
+
+class LinearDriftSchedule(_BaseSchedule):
+    """
+    Schedule drifting linearly with the steps: value(step) = initialValue_ + slope_ * step
+
+    Parameters
+    ----------
+    initialValue_p : value at step 0.
+
+    slope_p : change of the value per step.
+    """
+
+    def __init__(self, initialValue_p, slope_p):
+        self.initialValue_ = initialValue_p
+        self.slope_ = slope_p
+
+    def getValues(self, steps_p):
+        return self.initialValue_ + self.slope_ * np.asarray(steps_p, dtype=float)
+
+    def getValue(self, step_p):
+        return self.initialValue_ + self.slope_ * step_p
+
+class PiecewiseSchedule(_BaseSchedule):
+    """
+    Schedule defined by its values at breakpoints, constant between them or linearly interpolated.
+
+    Parameters
+    ----------
+    breakpoints_p : increasing list of the steps where the value is given.
+
+    values_p : list of the values at the breakpoints. The value is values_p[0] before the first
+     breakpoint and values_p[-1] after the last one.
+
+    interpolate_p : whether the value is linearly interpolated between the breakpoints. Otherwise it
+     changes at each breakpoint and stays constant until the next one.
+    """
+
+    def __init__(self, breakpoints_p, values_p, interpolate_p=False):
+        self.breakpoints_ = np.asarray(breakpoints_p, dtype=float)
+        self.values_ = np.asarray(values_p, dtype=float)
+        self.interpolate_ = interpolate_p
+
+    def getValues(self, steps_p):
+        steps_l = np.asarray(steps_p, dtype=float)
+        if self.interpolate_:
+            return np.interp(steps_l, self.breakpoints_, self.values_)
+        pieces_l = np.searchsorted(self.breakpoints_, steps_l, side="right") - 1
+        return self.values_[np.maximum(pieces_l, 0)]
+
+class RandomWalkSchedule(_BaseSchedule):
+    """
+    Schedule following a gaussian random walk: value(step) = initialValue_ + sum of step independent
+     N(0, std_) increments.
+
+    The walk is a fixed function of the steps drawn from its own seed, the same in every run, so that
+     its expected rewards are known to the regret metrics. Its path is drawn lazily, by blocks of
+     blockSize_ steps, each one a cumulative sum of its increments.
+
+    Parameters
+    ----------
+    initialValue_p : value at step 0.
+
+    std_p : standard deviation of the increment of each step.
+
+    seed_p : seed of the walk. Fresh entropy is used if None.
+
+    Attributes
+    ----------
+    walk_ : array of the values of the steps drawn so far. A function of the seed only.
+    """
+
+    blockSize_ = 4096
+
+    def __init__(self, initialValue_p, std_p, seed_p=None):
+        self.initialValue_ = initialValue_p
+        self.std_ = std_p
+        self.seed_ = np.random.SeedSequence(seed_p).entropy
+        self.walk_ = np.array([float(initialValue_p)])
+        self.rng_ = np.random.default_rng(self.seed_)
+
+    def _extendWalk(self, lastStep_p):
+        if lastStep_p < len(self.walk_):
+            return
+        # the walk at least doubles so that extending it costs O(1) amortized per step, and is drawn
+        # by whole blocks so that its values do not depend on the steps asked for
+        missing_l = max(lastStep_p + 1, 2*len(self.walk_)) - len(self.walk_)
+        blocks_l = [self.walk_]
+        for block_cntr in range(-(-missing_l // self.blockSize_)):
+            increments_l = self.std_ * self.rng_.standard_normal(self.blockSize_)
+            blocks_l.append(blocks_l[-1][-1] + np.cumsum(increments_l))
+        self.walk_ = np.concatenate(blocks_l)
+
+    def getValues(self, steps_p):
+        steps_l = np.asarray(steps_p)
+        if len(steps_l) > 0:
+            self._extendWalk(int(np.max(steps_l)))
+        return self.walk_[steps_l]
+
+    def getValue(self, step_p):
+        self._extendWalk(step_p)
+        return self.walk_.item(step_p)
@@ -0,0 +1,9 @@
+from .serving import PolicyServer
+from .serving import generateLoad
+from .serving import runLoadTest
+
+__all__ = [
+    "PolicyServer",
+    "generateLoad",
+    "runLoadTest"
+]
\ No newline at end of file
@@ -0,0 +1,242 @@
+ # serving.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import copy
+import time
+import asyncio
+import numpy as np
+
+class PolicyServer:
+    """
+    Asyncio front end serving the decisions of a policy to concurrent clients.
+
+    Clients await chooseAction to get an action and the id of their decision, then report the reward
+     of the decision with reportReward, in any order. Decision requests made while the server is
+     busy are answered together by one getNexActions call, and reported rewards are coalesced into
+     micro-batches applied by one updateMany call, so that the Python overhead is paid per batch.
+    The policy is only used from the event loop, hence needs no lock.
+
+    Parameters
+    ----------
+    policy_p : the policy serving the decisions.
+
+    initialEvals_p : list of the initial scores of the bandits the policy is reinitialized with.
+
+    maxBatchSize_p : maximal number of decisions, or of rewards, handled together.
+
+    batchWindow_p : seconds a batch waits for more requests or rewards before being handled. With 0
+     the batch only gathers those arrived while the server was busy.
+
+    Attributes
+    ----------
+    policy_ : the policy serving the decisions.
+
+    outstanding_ : dict mapping the id of each decision whose reward was not reported to its action.
+
+    decisionsCount_ : number of decisions served.
+
+    decisionBatches_ : number of getNexActions calls.
+
+    updatesCount_ : number of rewards applied to the policy.
+
+    updateBatches_ : number of updateMany calls.
+
+    Methods
+    -------
+    start : starts the batching tasks on the running event loop.
+
+    stop : stops the batching tasks, answering the pending decision requests and applying the pending rewards.
+
+    chooseAction : returns the id and the action of a new decision.
+
+    reportReward : queues the reward of a decision for the next update batch.
+    """
+
+    def __init__(self, policy_p, initialEvals_p, maxBatchSize_p=256, batchWindow_p=0.):
+        self.policy_ = policy_p
+        self.policy_.reinit(list(initialEvals_p))
+        self.maxBatchSize_ = maxBatchSize_p
+        self.batchWindow_ = batchWindow_p
+
+        self.outstanding_ = {}
+        self.nextDecisionId_ = 0
+        self.decisionsCount_ = 0
+        self.decisionBatches_ = 0
+        self.updatesCount_ = 0
+        self.updateBatches_ = 0
+
+        self.requests_ = []
+        self.pendingActions_ = []
+        self.pendingRewards_ = []
+        self.tasks_ = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, excType_p, exc_p, traceback_p):
+        await self.stop()
+
+    async def start(self):
+        self.requestsEvent_ = asyncio.Event()
+        self.rewardsEvent_ = asyncio.Event()
+        self.tasks_ = [asyncio.ensure_future(self._decisionsLoop()), asyncio.ensure_future(self._updatesLoop())]
+
+    async def stop(self):
+        # batches are handled without awaiting, a cancelled task leaves none half done
+        for task_l in self.tasks_:
+            task_l.cancel()
+        await asyncio.gather(*self.tasks_, return_exceptions=True)
+        self.tasks_ = None
+        self._serveRequests()
+        self._applyRewards()
+
+    async def chooseAction(self):
+        """
+        returns the id of a new decision and the action chosen by the policy.
+        """
+        future_l = asyncio.get_running_loop().create_future()
+        self.requests_.append(future_l)
+        self.requestsEvent_.set()
+        return await future_l
+
+    def reportReward(self, decisionId_p, reward_p):
+        """
+        queues the reward of the decision decisionId_p, applied to the policy with the next batch.
+        Raises a KeyError if the decision is unknown or its reward was already reported.
+        """
+        self.pendingActions_.append(self.outstanding_.pop(decisionId_p))
+        self.pendingRewards_.append(reward_p)
+        self.rewardsEvent_.set()
+
+    async def _gather(self, pending_p):
+        # lets the batch grow with the requests arriving meanwhile
+        if len(pending_p) < self.maxBatchSize_:
+            await asyncio.sleep(self.batchWindow_)
+
+    def _serveRequests(self):
+        while self.requests_:
+            requests_l = [future_l for future_l in self.requests_[:self.maxBatchSize_] if not future_l.cancelled()]
+            del self.requests_[:self.maxBatchSize_]
+            if not requests_l:
+                continue
+            actions_l = self.policy_.getNexActions(len(requests_l)).tolist()
+            for future_l, action_l in zip(requests_l, actions_l):
+                decisionId_l = self.nextDecisionId_
+                self.nextDecisionId_ += 1
+                self.outstanding_[decisionId_l] = action_l
+                future_l.set_result((decisionId_l, action_l))
+            self.decisionsCount_ += len(requests_l)
+            self.decisionBatches_ += 1
+
+    async def _decisionsLoop(self):
+        while True:
+            await self.requestsEvent_.wait()
+            self.requestsEvent_.clear()
+            await self._gather(self.requests_)
+            self._serveRequests()
+
+    def _applyRewards(self):
+        while self.pendingActions_:
+            actions_l = self.pendingActions_[:self.maxBatchSize_]
+            rewards_l = self.pendingRewards_[:self.maxBatchSize_]
+            del self.pendingActions_[:self.maxBatchSize_]
+            del self.pendingRewards_[:self.maxBatchSize_]
+            self.policy_.updateMany(np.array(actions_l, dtype=np.int64), np.array(rewards_l, dtype=float))
+            self.updatesCount_ += len(actions_l)
+            self.updateBatches_ += 1
+
+    async def _updatesLoop(self):
+        while True:
+            await self.rewardsEvent_.wait()
+            self.rewardsEvent_.clear()
+            await self._gather(self.pendingActions_)
+            self._applyRewards()
+
+async def generateLoad(server_p, banditsList_p, nbDecisions_p, concurrency_p=64, feedbackDelay_p=0., seed_p=None):
+    """
+    simulates the traffic of concurrent clients served by a PolicyServer and returns a report of
+     its latency and throughput.
+
+    Each of the concurrency_p clients requests a decision, draws the reward of the chosen bandit
+     and reports it after an exponentially distributed delay of mean feedbackDelay_p seconds, so
+     that rewards come back out of order, then requests the next decision.
+
+    Parameters
+    ----------
+    server_p : the started PolicyServer.
+
+    banditsList_p : list of the bandits drawing the rewards. Copied, the copies draw from streams
+     spawned from seed_p.
+
+    nbDecisions_p : number of decisions requested.
+
+    concurrency_p : number of concurrent clients.
+
+    feedbackDelay_p : mean delay of the rewards in seconds. Rewards are reported at once if 0.
+
+    seed_p : seed of the bandits and of the delays. Fresh entropy is used if None.
+
+    Returns
+    -------
+    dict holding the number of decisions, the seconds elapsed, the decisions per second, the p50 and
+     p99 decision latencies in seconds and the mean reward.
+    """
+    seedSequence_l = np.random.SeedSequence(seed_p)
+    delaysRng_l = np.random.default_rng(seedSequence_l.spawn(1)[0])
+    bandits_l = copy.deepcopy(list(banditsList_p))
+    for bandit_l, banditSeedSequence_l in zip(bandits_l, seedSequence_l.spawn(len(bandits_l))):
+        bandit_l.setRng(np.random.default_rng(banditSeedSequence_l))
+
+    loop_l = asyncio.get_running_loop()
+    latencies_l = np.empty(nbDecisions_p)
+    rewards_l = np.empty(nbDecisions_p)
+    feedbacks_l = []
+    requested_l = 0
+
+    async def client():
+        nonlocal requested_l
+        while requested_l < nbDecisions_p:
+            request_l = requested_l
+            requested_l += 1
+            start_l = time.perf_counter()
+            decisionId_l, action_l = await server_p.chooseAction()
+            latencies_l[request_l] = time.perf_counter() - start_l
+
+            rewards_l[request_l] = bandits_l[action_l].getReward(request_l+1)
+            if feedbackDelay_p > 0:
+                feedback_l = loop_l.create_future()
+                loop_l.call_later(delaysRng_l.exponential(feedbackDelay_p), _reportLater, server_p, decisionId_l, rewards_l[request_l], feedback_l)
+                feedbacks_l.append(feedback_l)
+            else:
+                server_p.reportReward(decisionId_l, rewards_l[request_l])
+
+    start_l = time.perf_counter()
+    await asyncio.gather(*[client() for client_cntr in range(concurrency_p)])
+    seconds_l = time.perf_counter() - start_l
+    await asyncio.gather(*feedbacks_l)
+
+    return {"decisions": nbDecisions_p, "seconds": seconds_l, "decisionsPerSec": nbDecisions_p / seconds_l,
+            "p50Latency": float(np.percentile(latencies_l, 50)), "p99Latency": float(np.percentile(latencies_l, 99)),
+            "meanReward": float(np.mean(rewards_l))}
+
+def _reportLater(server_p, decisionId_p, reward_p, feedback_p):
+    server_p.reportReward(decisionId_p, reward_p)
+    feedback_p.set_result(None)
+
+def runLoadTest(policy_p, banditsList_p, initialEvals_p, nbDecisions_p, concurrency_p=64, feedbackDelay_p=0.,
+                maxBatchSize_p=256, batchWindow_p=0., seed_p=None):
+    """
+    serves the decisions of policy_p with a PolicyServer under the traffic of generateLoad and
+     returns its report, completed with the number of decision and update batches.
+    """
+    async def loadTest():
+        async with PolicyServer(policy_p, initialEvals_p, maxBatchSize_p, batchWindow_p) as server_l:
+            report_l = await generateLoad(server_l, banditsList_p, nbDecisions_p, concurrency_p, feedbackDelay_p, seed_p)
+        report_l["decisionBatches"] = server_l.decisionBatches_
+        report_l["updateBatches"] = server_l.updateBatches_
+        return report_l
+    return asyncio.run(loadTest())
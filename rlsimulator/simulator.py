@@ -5,7 +5,18 @@
  # License: GNU General Public License version 3
 
 from .policies.policies import _BasePolicy
+from .policies.policies import _isFusable
 from .bandits.bandits import _BaseBandit
+from .bandits.bandits import _FusedRewards
+from .utils.utils import childSeedSequence
+from .utils.utils import ArrayHistory
+from .metrics.metrics import Regret
+from .profiling.profiling import StepProfiler
+from .cache.cache import cachedRun
+
+import copy
+import time
+import numpy as np
 
 class Simulator:
     """
@@ -15,9 +26,24 @@ class Simulator:
     ----------
     policy_p : the policy to use. 
 
+    seed_p : seed of the simulator's numpy SeedSequence. Fresh entropy is used if None.
+
+    historyLength_p : number of last steps kept in the history. The whole history is kept if None,
+     otherwise the history is a ring buffer suited to long-lived simulations.
+
+    rewardsDtype_p : numpy dtype of the rewards history, float64 by default.
+
     Attributes
     ----------
     step_ : timestep ie number of times actions were performed.
+
+    seedSequence_ : numpy SeedSequence from which the random streams of every run are spawned.
+
+    run_ : index of the current run. Run r draws from the child r of seedSequence_, so that a run
+     gives the same results whether it is simulated alone, in a batch or in another process.
+
+    rng_ : numpy Generator of the current run. The policy draws from its child 0 and the bandit of
+     index k from its child k+1.
     
     nbBandits_ : number of the bandits used in the simulator.
 
@@ -25,35 +51,108 @@ class Simulator:
 
     banditsList_ : List of the bandits available in the simulator.
 
-    actionsList_ : List of the actions performed ie. indices of the bandits pulled at each step.
+    actionsHistory_ : ArrayHistory of the actions performed ie. indices of the bandits pulled at each step.
 
-    rewardsList_ : reward obtained at each timestep.
+    rewardsHistory_ : ArrayHistory of the reward obtained at each timestep.
+
+    actionsCounts_ : array of the number of times each bandit was pulled, over the whole run.
+
+    metricsList_ : list of the metrics updated after each step.
+
+    profiler_ : StepProfiler timing the phases of each step, None when profiling is disabled.
 
     Methods
     -------
+    reinit : restarts the simulation with the random streams of the next run.
+
     addBandit : adds a bandit to the available bandits in the simulator.
+
+    addMetric : attaches a metric updated after each step.
+
+    trackRegret : attaches a Regret metric updated after each step.
     
     nextStep : returns the chosen action and its reward.
+
+    run : simulates several steps and returns their actions, rewards and evaluations as arrays.
+
+    enableProfiling : times each phase of the steps, optionally capturing some of them with cProfile.
+
+    disableProfiling : goes back to the uninstrumented steps.
+
+    runSeedSequence : returns the SeedSequence of a given run.
+
+    runRngs : returns the Generators of the policy and of the bandits for a given run.
+
+    getSpec : returns a picklable SimulatorSpec rebuilding the simulator.
+
+    getRewardsList : returns a view on the rewards history.
+
+    getActionsList : returns a view on the actions history.
+
+    getTotalReward : returns the sum of the rewards over the whole run.
     """
 
-    def __init__(self, policy_p):
+    def __init__(self, policy_p, seed_p=None, historyLength_p=None, rewardsDtype_p=np.float64):
         self.banditsList_ = []
         self.nbBandits_ = 0
         self.initialEvals_= []
 
         self.step_ = 0
-        self.actionsList_ = []
-        self.rewardsList_= []
+        self.actionsHistory_ = ArrayHistory(np.int32, length_p=historyLength_p)
+        self.rewardsHistory_ = ArrayHistory(rewardsDtype_p, length_p=historyLength_p)
+        self.actionsCounts_ = np.zeros(0, dtype=np.int64)
+        self.metricsList_ = []
+        self.profiler_ = None
 
         self.policy_ = policy_p
 
-    def reinit(self):
+        self.seedSequence_ = np.random.SeedSequence(seed_p)
+        self.run_ = 0
+        self._seedRun()
+
+    def reinit(self, run_p=None):
+        """
+        restarts the simulation.
+
+        Parameters
+        ----------
+        run_p : index of the run to restart with. Defaults to the run following the current one.
+        """
         self.step_ = 0
-        self.actionsList_ = []
-        self.rewardsList_= []
+        self.actionsHistory_.clear()
+        self.rewardsHistory_.clear()
+        self.actionsCounts_[:] = 0
+        for metric_l in self.metricsList_:
+            metric_l.reinit()
 
+        self.run_ = self.run_ + 1 if run_p is None else run_p
+        self._seedRun()
         self.policy_.reinit(self.initialEvals_)
 
+    def runSeedSequence(self, run_p):
+        """
+        returns the SeedSequence of the run run_p, independent of the other runs' ones.
+        """
+        return childSeedSequence(self.seedSequence_, run_p)
+
+    def runRngs(self, run_p):
+        """
+        returns the Generator of the policy and the list of the Generators of the bandits for the
+         run run_p.
+        """
+        runSeedSequence_l = self.runSeedSequence(run_p)
+        policyRng_l = np.random.default_rng(childSeedSequence(runSeedSequence_l, 0))
+        banditsRngs_l = [np.random.default_rng(childSeedSequence(runSeedSequence_l, bandit_cntr+1))
+                         for bandit_cntr in range(self.nbBandits_)]
+        return policyRng_l, banditsRngs_l
+
+    def _seedRun(self):
+        self.rng_ = np.random.default_rng(self.runSeedSequence(self.run_))
+        policyRng_l, banditsRngs_l = self.runRngs(self.run_)
+        self.policy_.setRng(policyRng_l)
+        for bandit_l, banditRng_l in zip(self.banditsList_, banditsRngs_l):
+            bandit_l.setRng(banditRng_l)
+
     def addBandit(self, bandit_p, initialEval_p):
         """
         adds a bandit to the available bandits in the simulator.
@@ -67,12 +166,32 @@ class Simulator:
         if self.step_ > 0:
             print("ERROR : added bandit when the simulation is already running.")
 
+        runSeedSequence_l = self.runSeedSequence(self.run_)
+        bandit_p.setRng(np.random.default_rng(childSeedSequence(runSeedSequence_l, self.nbBandits_+1)))
+
         self.banditsList_.append(bandit_p)
         self.initialEvals_.append(initialEval_p)
         self.policy_.addBandit(initialEval_p)
+        self.actionsCounts_ = np.append(self.actionsCounts_, 0)
         self.nbBandits_ += 1
 
 
+    def addMetric(self, metric_p):
+        """
+        attaches a metric of rlsimulator.metrics, updated in O(1) after each step and reinitialized
+         with the simulator.
+        """
+        self.metricsList_.append(metric_p)
+
+    def trackRegret(self, keepHistory_p=True):
+        """
+        attaches and returns a Regret metric computing the instantaneous and cumulative regret of each
+         step from the expected rewards of the bandits.
+        """
+        regret_l = Regret(self.banditsList_, keepHistory_p)
+        self.addMetric(regret_l)
+        return regret_l
+
     def nextStep(self):
         """
         returns the chosen action and its reward.
@@ -80,20 +199,208 @@ class Simulator:
         self.step_ += 1
 
         action_l = self.policy_.getNexAction()
-        self.actionsList_.append(action_l)
+        self.actionsHistory_.append(action_l)
+        self.actionsCounts_[action_l] += 1
         
         reward_l = self.banditsList_[action_l].getReward(self.step_) 
-        self.rewardsList_.append(reward_l)
+        self.rewardsHistory_.append(reward_l)
+
+        self.policy_.update(action_l, reward_l)
+
+        for metric_l in self.metricsList_:
+            metric_l.update(self.step_, action_l, reward_l)
+
+        return action_l, reward_l
+
+    def run(self, nsteps_p, recordEvals_p=False, evalsStride_p=1, cache_p=None):
+        """
+        simulates nsteps_p steps, with the same results as nsteps_p calls to nextStep.
+
+        Built-in policies perform the steps in one fused loop, reading the rewards of stationary
+         buffered bandits from rewards computed in bulk. Custom policies, and simulators being
+         profiled, are simulated one nextStep at a time. The history, the counts and the metrics are
+         updated as by nextStep, the metrics once the steps are performed.
+        With a ResultCache cache_p, the steps from the start of a run are read from the cache when
+         they were already simulated, see cachedRun.
+
+        Parameters
+        ----------
+        nsteps_p : number of steps to simulate.
+
+        recordEvals_p : whether to record the evaluations of the bandits.
+
+        evalsStride_p : the evaluations are recorded before one step out of evalsStride_p.
 
+        cache_p : ResultCache the steps are read from and stored to, None to always simulate them.
+
+        Returns
+        -------
+        actions : (nsteps,) array of the actions performed.
+
+        rewards : (nsteps,) array of the rewards obtained.
+
+        evals : (ceil(nsteps / evalsStride), nbBandits) array of the evaluations before the steps
+         0, evalsStride, 2*evalsStride... of the call, None when recordEvals_p is False.
+        """
+        if cache_p is not None:
+            return cachedRun(self, nsteps_p, cache_p, recordEvals_p, evalsStride_p)
+
+        actions_l = np.empty(nsteps_p, dtype=np.int64)
+        rewards_l = np.empty(nsteps_p)
+        evals_l = np.empty((-(-nsteps_p // evalsStride_p), self.nbBandits_)) if recordEvals_p else None
+
+        if self.profiler_ is not None or not _isFusable(self.policy_):
+            for step_cntr in range(nsteps_p):
+                if recordEvals_p and step_cntr % evalsStride_p == 0:
+                    evals_l[step_cntr // evalsStride_p] = self.policy_.vectBanditsEvals_
+                actions_l[step_cntr], rewards_l[step_cntr] = self.nextStep()
+            return actions_l, rewards_l, evals_l
+
+        fusedRewards_l = _FusedRewards(self.banditsList_)
+        self.policy_.runSteps(nsteps_p, self.step_, fusedRewards_l.pull, actions_l, rewards_l, evals_l, evalsStride_p)
+        fusedRewards_l.close()
+        self._recordSteps(actions_l, rewards_l)
+
+        return actions_l, rewards_l, evals_l
+
+    def _recordSteps(self, actions_p, rewards_p):
+        """
+        updates the history, the counts, the metrics and the step with the actions and rewards of
+         steps whose policy and bandits updates were already made.
+        """
+        nsteps_l = len(actions_p)
+        self.actionsHistory_.extend(actions_p)
+        self.rewardsHistory_.extend(rewards_p)
+        self.actionsCounts_ += np.bincount(actions_p, minlength=self.nbBandits_)
+        for metric_l in self.metricsList_:
+            for step_l, action_l, reward_l in zip(range(self.step_+1, self.step_+1+nsteps_l), actions_p.tolist(), rewards_p.tolist()):
+                metric_l.update(step_l, action_l, reward_l)
+        self.step_ += nsteps_l
+
+    def enableProfiling(self, profileWindow_p=None, profileEvery_p=1):
+        """
+        attaches and returns a StepProfiler recording the time spent in each phase of the next steps
+         and, for the steps of profileWindow_p sampled every profileEvery_p steps, a cProfile capture.
+        nextStep is replaced by an instrumented step until disableProfiling is called, so that
+         simulations without profiling do not pay for it.
+        """
+        self.profiler_ = StepProfiler(profileWindow_p, profileEvery_p)
+        self.nextStep = self._profiledNextStep
+        return self.profiler_
+
+    def disableProfiling(self):
+        """
+        detaches and returns the StepProfiler.
+        """
+        profiler_l = self.profiler_
+        self.profiler_ = None
+        self.__dict__.pop("nextStep", None)
+        return profiler_l
+
+    def _profiledNextStep(self):
+        """
+        nextStep recording the duration of each phase in profiler_.
+        """
+        profiler_l = self.profiler_
+        clock_l = time.perf_counter
+        policyName_l = type(self.policy_).__name__
+        self.step_ += 1
+        profiler_l.beginStep(self.step_)
+
+        start_l = clock_l()
+        action_l = self.policy_.getNexAction()
+        end_l = clock_l()
+        profiler_l.record("getNexAction", policyName_l, end_l - start_l)
+
+        start_l = end_l
+        bandit_l = self.banditsList_[action_l]
+        reward_l = bandit_l.getReward(self.step_)
+        end_l = clock_l()
+        profiler_l.record("getReward", type(bandit_l).__name__, end_l - start_l)
+
+        start_l = end_l
+        self.actionsHistory_.append(action_l)
+        self.actionsCounts_[action_l] += 1
+        self.rewardsHistory_.append(reward_l)
+        end_l = clock_l()
+        profiler_l.record("history", type(self).__name__, end_l - start_l)
+
+        start_l = end_l
         self.policy_.update(action_l, reward_l)
+        end_l = clock_l()
+        profiler_l.record("update", policyName_l, end_l - start_l)
+
+        for metric_l in self.metricsList_:
+            start_l = end_l
+            metric_l.update(self.step_, action_l, reward_l)
+            end_l = clock_l()
+            profiler_l.record("metric", type(metric_l).__name__, end_l - start_l)
 
+        profiler_l.endStep()
         return action_l, reward_l
 
     def getRewardsList(self):
-        return self.rewardsList_
+        """
+        returns a view, without copy, on the rewards of the kept steps.
+        The view is overwritten by the next run, copy it to keep it across reinit.
+        """
+        return self.rewardsHistory_.view()
 
     def getActionsList(self):
-        return self.actionsList_
+        """
+        returns a view, without copy, on the actions of the kept steps.
+        The view is overwritten by the next run, copy it to keep it across reinit.
+        """
+        return self.actionsHistory_.view()
+
+    def getTotalReward(self):
+        return self.rewardsHistory_.total_
+
+    def getSpec(self):
+        """
+        returns a picklable SimulatorSpec rebuilding the simulator.
+        """
+        return SimulatorSpec(self.policy_, self.banditsList_, self.initialEvals_, self.seedSequence_.entropy,
+                             self.rewardsHistory_.length_, self.rewardsHistory_.values_.dtype)
+
+
+class SimulatorSpec:
+    """
+    Picklable description of a simulator, used to rebuild it in another process.
+
+    Parameters
+    ----------
+    policy_p : the policy to use. Copied when building.
+
+    banditsList_p : list of the bandits. Copied when building.
+
+    initialEvals_p : list of the initial scores associated to the bandits.
+
+    entropy_p : entropy of the simulator's SeedSequence.
 
+    historyLength_p : number of last steps kept in the simulator's history, None to keep them all.
 
-    
\ No newline at end of file
+    rewardsDtype_p : numpy dtype of the simulator's rewards history.
+
+    Methods
+    -------
+    build : returns a new simulator set on a given run.
+    """
+
+    def __init__(self, policy_p, banditsList_p, initialEvals_p, entropy_p, historyLength_p=None, rewardsDtype_p=np.float64):
+        self.policy_ = policy_p
+        self.banditsList_ = list(banditsList_p)
+        self.initialEvals_ = list(initialEvals_p)
+        self.entropy_ = entropy_p
+        self.historyLength_ = historyLength_p
+        self.rewardsDtype_ = rewardsDtype_p
+
+    def build(self, run_p=0):
+        """
+        returns a new simulator set on the run run_p.
+        """
+        simulator_l = Simulator(copy.deepcopy(self.policy_), self.entropy_, self.historyLength_, self.rewardsDtype_)
+        for bandit_l, initialEval_l in zip(self.banditsList_, self.initialEvals_):
+            simulator_l.addBandit(copy.deepcopy(bandit_l), initialEval_l)
+        simulator_l.reinit(run_p)
+        return simulator_l
@@ -0,0 +1,7 @@
+from .store import StoreWriter
+from .store import ResultStore
+
+__all__ = [
+    "StoreWriter",
+    "ResultStore"
+]
\ No newline at end of file
@@ -0,0 +1,264 @@
+ # store.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+from ..utils.utils import RunsAggregator
+from ..utils.utils import progressBar
+
+import os
+import json
+import numpy as np
+
+METADATA_FILE = "metadata.json"
+COLUMNS = ("actions", "rewards", "evals")
+
+def _chunkPath(path_p, block_p, column_p, chunk_p):
+    return os.path.join(path_p, "block%04i_%s_%05i.npy" % (block_p, column_p, chunk_p))
+
+def _readMetadata(path_p):
+    with open(os.path.join(path_p, METADATA_FILE), "r") as metadataFile_l:
+        return json.load(metadataFile_l)
+
+class StoreWriter:
+    """
+    Writes the history of simulations into a columnar store on disk while they run.
+
+    The store is a directory holding a small metadata.json header and, for each block of runs
+     simulated together, the actions, rewards and optionally evaluations split into .npy chunks of
+     chunkSize_p steps. Each chunk holds a (nbRuns, steps) array, or (nbRuns, steps, nbBandits) for
+     the evaluations, so that a ResultStore reopens them with np.memmap without loading them.
+    The header is rewritten after each chunk: a store interrupted mid-simulation can be reopened with
+     the steps of its complete chunks. Writing to an existing store appends new blocks to it, whose
+     runs may be longer or shorter than the ones already stored, see ResultStore.
+
+    Parameters
+    ----------
+    path_p : directory of the store, created if needed.
+
+    nbBandits_p : number of bandits of the simulations.
+
+    recordEvals_p : whether to store the evaluations of the bandits before each step.
+
+    chunkSize_p : number of steps per chunk file.
+
+    rewardsDtype_p : numpy dtype of the stored rewards.
+
+    metadata_p : json-serializable dict of user metadata kept in the header.
+
+    Attributes
+    ----------
+    path_ : directory of the store.
+
+    blocks_ : list of the header's description of each block: first run, number of runs, number of
+     steps and number of chunk files.
+
+    Methods
+    -------
+    beginRuns : starts a new block of runs.
+
+    addStep : appends one step of the runs of the current block.
+
+    recordRuns : simulates runs of a simulator one after the other, recording each one.
+
+    recordBatch : simulates the runs of a BatchSimulator, recording them in one block.
+
+    close : writes the last chunks of the current block and the header.
+    """
+
+    def __init__(self, path_p, nbBandits_p, recordEvals_p=False, chunkSize_p=65536, rewardsDtype_p=np.float64, metadata_p=None):
+        self.path_ = path_p
+        self.nbBandits_ = nbBandits_p
+        self.recordEvals_ = recordEvals_p
+        self.chunkSize_ = chunkSize_p
+        self.rewardsDtype_ = np.dtype(rewardsDtype_p)
+        self.metadata_ = {} if metadata_p is None else dict(metadata_p)
+        self.blocks_ = []
+        self.buffers_ = None
+
+        os.makedirs(path_p, exist_ok=True)
+        if os.path.exists(os.path.join(path_p, METADATA_FILE)):
+            header_l = _readMetadata(path_p)
+            if header_l["nbBandits"] != nbBandits_p or header_l["recordEvals"] != recordEvals_p:
+                raise ValueError("the store %s holds simulations of another kind" % path_p)
+            self.blocks_ = header_l["blocks"]
+            self.metadata_ = dict(header_l["metadata"], **self.metadata_)
+
+    def _writeMetadata(self):
+        header_l = {"nbBandits": self.nbBandits_, "recordEvals": self.recordEvals_, "chunkSize": self.chunkSize_,
+                    "rewardsDtype": self.rewardsDtype_.str, "blocks": self.blocks_, "metadata": self.metadata_}
+        # replaced atomically so that a reader never sees a partial header
+        temporaryPath_l = os.path.join(self.path_, METADATA_FILE + ".tmp")
+        with open(temporaryPath_l, "w") as metadataFile_l:
+            json.dump(header_l, metadataFile_l, indent=1)
+        os.replace(temporaryPath_l, os.path.join(self.path_, METADATA_FILE))
+
+    def _flushChunk(self):
+        block_l = self.blocks_[-1]
+        filled_l = block_l["nsteps"] - block_l["chunks"] * self.chunkSize_
+        if filled_l == 0:
+            return
+        for column_l, buffer_l in self.buffers_.items():
+            np.save(_chunkPath(self.path_, len(self.blocks_)-1, column_l, block_l["chunks"]), buffer_l[:, :filled_l])
+        block_l["chunks"] += 1
+        self._writeMetadata()
+
+    def beginRuns(self, nbRuns_p=1):
+        """
+        writes the current block and starts a new block of nbRuns_p runs simulated together.
+        """
+        self.close()
+        firstRun_l = self.blocks_[-1]["firstRun"] + self.blocks_[-1]["nbRuns"] if self.blocks_ else 0
+        self.blocks_.append({"firstRun": firstRun_l, "nbRuns": nbRuns_p, "nsteps": 0, "chunks": 0})
+        self.buffers_ = {"actions": np.empty((nbRuns_p, self.chunkSize_), dtype=np.int32),
+                         "rewards": np.empty((nbRuns_p, self.chunkSize_), dtype=self.rewardsDtype_)}
+        if self.recordEvals_:
+            self.buffers_["evals"] = np.empty((nbRuns_p, self.chunkSize_, self.nbBandits_))
+
+    def addStep(self, actions_p, rewards_p, evals_p=None):
+        """
+        appends one step of the runs of the current block.
+
+        Parameters
+        ----------
+        actions_p : the action, or array of the actions of each run, performed.
+
+        rewards_p : the reward, or array of the rewards of each run, obtained.
+
+        evals_p : (nbRuns, nbBandits) evaluations before the step, required when recording evaluations.
+        """
+        block_l = self.blocks_[-1]
+        position_l = block_l["nsteps"] - block_l["chunks"] * self.chunkSize_
+        self.buffers_["actions"][:, position_l] = actions_p
+        self.buffers_["rewards"][:, position_l] = rewards_p
+        if self.recordEvals_:
+            self.buffers_["evals"][:, position_l] = evals_p
+        block_l["nsteps"] += 1
+        if position_l + 1 == self.chunkSize_:
+            self._flushChunk()
+
+    def recordRuns(self, simulator_p, nsteps_p, runs_p=1):
+        """
+        simulates runs_p runs of nsteps_p steps of the simulator, starting with its current run, and
+         records each one in its own block. The simulator is left on the run following the last one.
+        """
+        for run_cntr in range(runs_p):
+            if run_cntr > 0:
+                simulator_p.reinit()
+            self.beginRuns(1)
+            for step_cntr in range(nsteps_p):
+                # copied before the step updates the evaluations in place
+                evals_l = np.array(simulator_p.policy_.vectBanditsEvals_, dtype=float) if self.recordEvals_ else None
+                self.addStep(*simulator_p.nextStep(), evals_l)
+        simulator_p.reinit()
+        self.close()
+
+    def recordBatch(self, batchSimulator_p, nsteps_p, showProgress_p=False):
+        """
+        simulates nsteps_p steps of the runs of a BatchSimulator, recording them in one block.
+        """
+        self.beginRuns(batchSimulator_p.nbRuns_)
+        progressStride_l = max(1, nsteps_p // 100)
+        for step_cntr in range(nsteps_p):
+            if showProgress_p and step_cntr % progressStride_l == 0:
+                progressBar(step_cntr, nsteps_p)
+            evals_l = batchSimulator_p.getEvals().copy() if self.recordEvals_ else None
+            self.addStep(*batchSimulator_p.nextStep(), evals_l)
+        self.close()
+
+    def close(self):
+        """
+        writes the steps of the current block not written yet, and the header.
+        """
+        if self.buffers_ is not None:
+            self._flushChunk()
+            self.buffers_ = None
+        self._writeMetadata()
+
+class ResultStore:
+    """
+    Read access to a store written by a StoreWriter.
+
+    Chunks are opened with np.memmap, so that the history of runs larger than the memory is read
+     lazily, one chunk at a time.
+
+    The runs of different blocks may have different lengths, eg. a block of 5 runs of 100 steps
+     appended after a block of 3 runs of 200 steps. nsteps_ is then the length of the longest runs,
+     200, and the steps of a run stop at the length of its block: getRun returns the steps of the
+     run only, and aggregate folds in at each step the runs that reached it, so that the counts_ of
+     the aggregator are 8 for the steps 0 to 99 and 3 for the steps 100 to 199.
+
+    Parameters
+    ----------
+    path_p : directory of the store.
+
+    Attributes
+    ----------
+    nbBandits_ : number of bandits of the simulations.
+
+    nbRuns_ : number of runs stored.
+
+    nsteps_ : number of steps of the longest run. Shorter runs hold no value after their last step.
+
+    blocks_ : list of the description of each block of runs.
+
+    metadata_ : dict of user metadata.
+
+    Methods
+    -------
+    iterChunks : yields the chunks of a column for a block of runs.
+
+    getRun : returns a column of a run.
+
+    aggregate : returns a RunsAggregator of a column over all the runs.
+    """
+
+    def __init__(self, path_p):
+        self.path_ = path_p
+        header_l = _readMetadata(path_p)
+        self.nbBandits_ = header_l["nbBandits"]
+        self.recordEvals_ = header_l["recordEvals"]
+        self.chunkSize_ = header_l["chunkSize"]
+        self.metadata_ = header_l["metadata"]
+        # steps written after the last chunk of a block are not readable
+        self.blocks_ = [dict(block_l, nsteps=min(block_l["nsteps"], block_l["chunks"]*self.chunkSize_)) for block_l in header_l["blocks"]]
+        self.nbRuns_ = sum(block_l["nbRuns"] for block_l in self.blocks_)
+        self.nsteps_ = max([block_l["nsteps"] for block_l in self.blocks_], default=0)
+
+    def _checkColumn(self, column_p):
+        if column_p not in COLUMNS or (column_p == "evals" and not self.recordEvals_):
+            raise ValueError("the store does not hold the column %s" % column_p)
+
+    def iterChunks(self, column_p, block_p):
+        """
+        yields, for each chunk of the column column_p ("actions", "rewards" or "evals") of the block
+         block_p, the index of its first step and the memory-mapped array of its values.
+        """
+        self._checkColumn(column_p)
+        for chunk_cntr in range(self.blocks_[block_p]["chunks"]):
+            yield chunk_cntr * self.chunkSize_, np.load(_chunkPath(self.path_, block_p, column_p, chunk_cntr), mmap_mode="r")
+
+    def getRun(self, run_p, column_p):
+        """
+        returns the array of the values of the column column_p taken by the run run_p at each step.
+        """
+        for block_cntr, block_l in enumerate(self.blocks_):
+            if block_l["firstRun"] <= run_p < block_l["firstRun"] + block_l["nbRuns"]:
+                row_l = run_p - block_l["firstRun"]
+                chunks_l = [chunk_l[row_l] for _, chunk_l in self.iterChunks(column_p, block_cntr)]
+                if not chunks_l:
+                    return np.empty((0,) + ((self.nbBandits_,) if column_p == "evals" else ()))
+                return np.concatenate(chunks_l)
+        raise IndexError("the store holds %i runs" % self.nbRuns_)
+
+    def aggregate(self, column_p):
+        """
+        returns a RunsAggregator of the column column_p over all the runs, folded in one chunk at a time.
+        """
+        self._checkColumn(column_p)
+        aggregator_l = RunsAggregator(self.nsteps_, (self.nbBandits_,) if column_p == "evals" else ())
+        for block_cntr in range(len(self.blocks_)):
+            for firstStep_l, chunk_l in self.iterChunks(column_p, block_cntr):
+                aggregator_l.addRuns(chunk_l, firstStep_l)
+        return aggregator_l
@@ -0,0 +1,175 @@
+ # sweepRunner.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+from .simulator import Simulator
+from .batchSimulator import BatchSimulator
+from .policies.policies import _BasePolicy
+from .metrics.metrics import expectedRewards
+from .metrics.metrics import implementsExpectedRewards
+
+import copy
+import itertools
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+def _sweepChunk(policyClass_p, fixedParams_p, batchedParams_p, banditsList_p, initialEvals_p, entropy_p, runs_p, nsteps_p):
+    """
+    simulates runs_p runs of each configuration of a chunk in a single lockstep batch and returns the
+     (nbConfigs, runs_p) arrays of the total reward, of the regret and of the number of optimal
+     actions of each run. The last two are nan when the bandits do not implement getExpectedReward.
+
+    Parameters
+    ----------
+    fixedParams_p : dict of the parameters of the policy shared by the configurations.
+
+    batchedParams_p : dict mapping parameters listed in the policy's batchParams_ to the array of
+     their values over the configurations.
+
+    initialEvals_p : (nbConfigs, nbBandits) array of the initial evaluations of each configuration.
+    """
+    nbConfigs_l = len(initialEvals_p)
+    nbRuns_l = nbConfigs_l * runs_p
+
+    policyParams_l = dict(fixedParams_p)
+    for name_l, values_l in batchedParams_p.items():
+        policyParams_l[name_l] = np.repeat(values_l, runs_p)
+    simulator_l = Simulator(policyClass_p(**policyParams_l), entropy_p)
+    for bandit_l, initialEval_l in zip(banditsList_p, initialEvals_p[0]):
+        simulator_l.addBandit(copy.deepcopy(bandit_l), initialEval_l)
+
+    # the configurations are compared on common random numbers: each one replicates the runs 0 to
+    # runs_p-1 of the simulator
+    batchSimulator_l = BatchSimulator(simulator_l, nbRuns_l, 0, np.tile(np.arange(runs_p), nbConfigs_l),
+                                      np.repeat(initialEvals_p, runs_p, axis=0))
+
+    totalRewards_l = np.zeros(nbRuns_l)
+    shape_l = (nbConfigs_l, runs_p)
+    if not implementsExpectedRewards(simulator_l.banditsList_):
+        # without expected rewards, the regret and the optimal actions are unknown
+        for step_cntr in range(nsteps_p):
+            totalRewards_l += batchSimulator_l.nextStep()[1]
+        return totalRewards_l.reshape(shape_l), np.full(shape_l, np.nan), np.full(shape_l, np.nan)
+
+    regrets_l = np.zeros(nbRuns_l)
+    optimalCounts_l = np.zeros(nbRuns_l, dtype=np.int64)
+    blockSize_l = max(1, min(4096, 2**20 // len(banditsList_p)))
+    for blockStart_cntr in range(1, nsteps_p+1, blockSize_l):
+        expected_l = expectedRewards(simulator_l.banditsList_, np.arange(blockStart_cntr, min(blockStart_cntr+blockSize_l, nsteps_p+1)))
+        bestExpected_l = np.max(expected_l, axis=0)
+        for offset_cntr in range(expected_l.shape[1]):
+            actions_l, rewards_l = batchSimulator_l.nextStep()
+            actionsExpected_l = expected_l[actions_l, offset_cntr]
+            totalRewards_l += rewards_l
+            regrets_l += bestExpected_l[offset_cntr] - actionsExpected_l
+            optimalCounts_l += (actionsExpected_l == bestExpected_l[offset_cntr])
+
+    return totalRewards_l.reshape(shape_l), regrets_l.reshape(shape_l), optimalCounts_l.reshape(shape_l)
+
+def runSweep(policyClass_p, paramsGrid_p, banditsConfigs_p, initialEvals_p, nsteps_p, runs_p,
+             seed_p=None, nbWorkers_p=1, maxBatchRuns_p=4096):
+    """
+    simulates every combination of policy parameters, bandits configuration and initial evaluations,
+     and returns a summary of each one.
+
+    Configurations sharing their bandits are simulated together in lockstep batches of at most
+     maxBatchRuns_p runs, the parameters listed in the policy's batchParams_ taking one value per
+     run. The other parameters, and every parameter of policies that do not implement the batch
+     methods, split the configurations into separate batches.
+    Every configuration replicates the runs 0 to runs_p-1 of a simulator seeded with seed_p, so that
+     the configurations are compared on common random numbers and the summary of a configuration does
+     not depend on the rest of the grid.
+
+    Parameters
+    ----------
+    policyClass_p : class of the policy eg. EpsilonGreedyPolicy.
+
+    paramsGrid_p : dict mapping each parameter of the policy's constructor to the list of its values
+     eg. {"epsilon_p": [0.01, 0.1, 0.2]}.
+
+    banditsConfigs_p : list of the bandits configurations, each one a list of bandits.
+
+    initialEvals_p : list of the initial evaluations, each one a score shared by all the bandits or a
+     list of one score per bandit.
+
+    nsteps_p : number of steps of each run.
+
+    runs_p : number of runs of each configuration.
+
+    seed_p : seed of the simulators' SeedSequence. Fresh entropy is used if None.
+
+    nbWorkers_p : number of processes the batches are spread over. Batches are simulated in the
+     current process if 1.
+
+    maxBatchRuns_p : maximal number of runs simulated in lockstep in a batch.
+
+    Returns
+    -------
+    list of dicts, one per configuration, convertible to a pandas DataFrame, holding:
+     bandits : index of the bandits configuration in banditsConfigs_p.
+     initialEvals : initial evaluations.
+     the value of each parameter of paramsGrid_p.
+     meanReward : mean reward per step, averaged over the runs.
+     meanRewardStdErr : standard error of meanReward.
+     regret : cumulative regret at the last step, averaged over the runs. nan if the bandits do not
+      implement getExpectedReward.
+     regretStdErr : standard error of regret.
+     percentOptimalAction : percentage of the steps at which an optimal bandit was pulled. nan if the
+      bandits do not implement getExpectedReward.
+    """
+    paramsNames_l = list(paramsGrid_p)
+    supportsBatch_l = policyClass_p.getNexActionsBatch is not _BasePolicy.getNexActionsBatch
+    batchedNames_l = [name_l for name_l in paramsNames_l if supportsBatch_l and name_l in policyClass_p.batchParams_]
+    fixedNames_l = [name_l for name_l in paramsNames_l if name_l not in batchedNames_l]
+    entropy_l = np.random.SeedSequence(seed_p).entropy
+
+    # configurations grouped by the arguments that can not vary within a batch
+    configs_l = []
+    groups_l = {}
+    for bandits_cntr, banditsList_l in enumerate(banditsConfigs_p):
+        for paramsValues_l in itertools.product(*[paramsGrid_p[name_l] for name_l in paramsNames_l]):
+            params_l = dict(zip(paramsNames_l, paramsValues_l))
+            for initialEvals_l in initialEvals_p:
+                groupKey_l = (bandits_cntr,) + tuple(params_l[name_l] for name_l in fixedNames_l)
+                groups_l.setdefault(groupKey_l, []).append(len(configs_l))
+                configs_l.append((bandits_cntr, params_l, initialEvals_l))
+
+    # enough batches to keep every worker busy
+    configsPerBatch_l = max(1, min(maxBatchRuns_p // runs_p, -(-len(configs_l) // nbWorkers_p)))
+    chunks_l = []
+    for groupKey_l, groupConfigs_l in groups_l.items():
+        banditsList_l = banditsConfigs_p[groupKey_l[0]]
+        fixedParams_l = dict(zip(fixedNames_l, groupKey_l[1:]))
+        for chunkStart_cntr in range(0, len(groupConfigs_l), configsPerBatch_l):
+            chunkConfigs_l = groupConfigs_l[chunkStart_cntr:chunkStart_cntr+configsPerBatch_l]
+            batchedParams_l = {name_l: np.array([configs_l[config_l][1][name_l] for config_l in chunkConfigs_l])
+                               for name_l in batchedNames_l}
+            initialEvals_l = np.array([np.broadcast_to(np.asarray(configs_l[config_l][2], dtype=float), (len(banditsList_l),))
+                                       for config_l in chunkConfigs_l])
+            chunks_l.append((chunkConfigs_l, (policyClass_p, fixedParams_l, batchedParams_l, banditsList_l, initialEvals_l, entropy_l, runs_p, nsteps_p)))
+
+    if nbWorkers_p == 1:
+        results_l = [_sweepChunk(*arguments_l) for _, arguments_l in chunks_l]
+    else:
+        with ProcessPoolExecutor(max_workers=nbWorkers_p) as executor_l:
+            futures_l = [executor_l.submit(_sweepChunk, *arguments_l) for _, arguments_l in chunks_l]
+            results_l = [future_l.result() for future_l in futures_l]
+
+    def standardError(values_p):
+        return float(np.std(values_p, ddof=1) / np.sqrt(runs_p)) if runs_p > 1 else np.nan
+
+    table_l = [None] * len(configs_l)
+    for (chunkConfigs_l, _), (totalRewards_l, regrets_l, optimalCounts_l) in zip(chunks_l, results_l):
+        for row_cntr, config_l in enumerate(chunkConfigs_l):
+            bandits_l, params_l, initialEvals_l = configs_l[config_l]
+            record_l = {"bandits": bandits_l, "initialEvals": initialEvals_l}
+            record_l.update(params_l)
+            record_l["meanReward"] = float(np.mean(totalRewards_l[row_cntr])) / nsteps_p
+            record_l["meanRewardStdErr"] = standardError(totalRewards_l[row_cntr]) / nsteps_p
+            record_l["regret"] = float(np.mean(regrets_l[row_cntr]))
+            record_l["regretStdErr"] = standardError(regrets_l[row_cntr])
+            record_l["percentOptimalAction"] = 100 * float(np.mean(optimalCounts_l[row_cntr])) / nsteps_p
+            table_l[config_l] = record_l
+    return table_l
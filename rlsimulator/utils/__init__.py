@@ -1,7 +1,15 @@
 from .utils import rollingAverage
 from .utils import progressBar
+from .utils import childSeedSequence
+from .utils import RunsVariatesBuffer
+from .utils import ArrayHistory
+from .utils import RunsAggregator
 
 __all__ = [
     "rollingAverage",
-    "progressBar"
+    "progressBar",
+    "childSeedSequence",
+    "RunsVariatesBuffer",
+    "ArrayHistory",
+    "RunsAggregator"
 ]
\ No newline at end of file
@@ -1,15 +1,251 @@
 import numpy as np
 
 def rollingAverage(values_p, window_p):
-    average_l = []
-    for i_cntr in range(len(values_p)):
-        windowValues_l = values_p[max(0,i_cntr-window_p+1):i_cntr+1]
-        average_l.append(np.mean(windowValues_l))
-    return average_l
+    """
+    kept for compatibility, see rlsimulator.metrics.rollingMean.
+    """
+    from ..metrics.metrics import rollingMean
+    return rollingMean(values_p, window_p)
 
 def progressBar(progress_p, total_p, barLength_p = 20):
     progressPercentage_l = float(progress_p) * 100 / total_p
     arrow_l   = '-' * int(progressPercentage_l/100 * barLength_p - 1) + '>'
     spaces_l  = ' ' * (barLength_p - len(arrow_l))
 
-    print('Progress: [%s%s] %d %%' % (arrow_l, spaces_l, progressPercentage_l), end='\r')
\ No newline at end of file
+    print('Progress: [%s%s] %d %%' % (arrow_l, spaces_l, progressPercentage_l), end='\r')
+
+def childSeedSequence(seedSequence_p, *keys_p):
+    """
+    returns the child of a numpy SeedSequence identified by keys_p.
+    Equivalent to successive calls to spawn but independent of the number of children already spawned.
+    """
+    return np.random.SeedSequence(seedSequence_p.entropy, spawn_key=tuple(seedSequence_p.spawn_key) + tuple(keys_p),
+                                  pool_size=seedSequence_p.pool_size)
+
+class RunsVariatesBuffer:
+    """
+    Buffer of pre-drawn variates for several independent runs, one row per run.
+    Each row is refilled by its own draw function when exhausted so that a run consumes exactly the
+     same sequence of variates as if it drew them alone. Rows are first drawn when first taken from,
+     so that runs taking no variate draw none.
+
+    Parameters
+    ----------
+    draws_p : list of functions, one per run, returning an array of variates of a given size.
+
+    size_p : number of variates drawn each time a row is refilled.
+
+    Methods
+    -------
+    take : returns the next variate of each of the given runs.
+    """
+
+    def __init__(self, draws_p, size_p):
+        self.draws_ = draws_p
+        self.size_ = size_p
+        self.variates_ = np.empty((len(draws_p), size_p))
+        self.positions_ = np.full(len(draws_p), size_p, dtype=np.int64)
+
+    def take(self, runs_p=None):
+        """
+        returns an array of the next variate of each run of runs_p (all the runs if None).
+        """
+        if runs_p is None:
+            runs_p = np.arange(len(self.draws_))
+        for run_l in runs_p[self.positions_[runs_p] == self.size_]:
+            self.variates_[run_l] = self.draws_[run_l](self.size_)
+            self.positions_[run_l] = 0
+        variates_l = self.variates_[runs_p, self.positions_[runs_p]]
+        self.positions_[runs_p] += 1
+        return variates_l
+
+class ArrayHistory:
+    """
+    History of scalar values held in a preallocated typed numpy array.
+
+    By default the array grows by doubling its capacity when full. When length_p is given, only the
+     last length_p values are kept in a ring buffer of twice that size in which each value is written
+     twice, so that the kept values are always contiguous and can be returned without copy.
+
+    Parameters
+    ----------
+    dtype_p : numpy dtype of the values.
+
+    capacity_p : initial capacity of the array when it is growable.
+
+    length_p : number of values kept in ring-buffer mode. None for a growable history.
+
+    Attributes
+    ----------
+    values_ : the underlying array.
+
+    length_ : number of values kept in ring-buffer mode, None for a growable history.
+
+    count_ : number of values appended since the last clear.
+
+    total_ : running sum of the values appended since the last clear.
+
+    Methods
+    -------
+    append : appends a value.
+
+    extend : appends an array of values.
+
+    view : returns a view on the kept values in chronological order.
+
+    clear : forgets all the values, keeping the allocated array.
+    """
+
+    def __init__(self, dtype_p, capacity_p=1024, length_p=None):
+        self.length_ = length_p
+        if length_p is None:
+            self.values_ = np.empty(max(1, capacity_p), dtype=dtype_p)
+        else:
+            self.values_ = np.empty(2*length_p, dtype=dtype_p)
+        self.clear()
+
+    def clear(self):
+        self.count_ = 0
+        self.total_ = 0
+
+    def append(self, value_p):
+        if self.length_ is None:
+            if self.count_ == len(self.values_):
+                values_l = np.empty(2*len(self.values_), dtype=self.values_.dtype)
+                values_l[:self.count_] = self.values_
+                self.values_ = values_l
+            self.values_[self.count_] = value_p
+        else:
+            position_l = self.count_ % self.length_
+            self.values_[position_l] = value_p
+            self.values_[position_l+self.length_] = value_p
+        self.count_ += 1
+        self.total_ += value_p
+
+    def extend(self, values_p):
+        nbValues_l = len(values_p)
+        if self.length_ is None:
+            if self.count_ + nbValues_l > len(self.values_):
+                capacity_l = len(self.values_)
+                while capacity_l < self.count_ + nbValues_l:
+                    capacity_l *= 2
+                values_l = np.empty(capacity_l, dtype=self.values_.dtype)
+                values_l[:self.count_] = self.values_[:self.count_]
+                self.values_ = values_l
+            self.values_[self.count_:self.count_+nbValues_l] = values_p
+        else:
+            # only the last length_ values are kept
+            keptValues_l = values_p[max(0, nbValues_l-self.length_):]
+            positions_l = (self.count_ + nbValues_l - len(keptValues_l) + np.arange(len(keptValues_l))) % self.length_
+            self.values_[positions_l] = keptValues_l
+            self.values_[positions_l+self.length_] = keptValues_l
+        self.count_ += nbValues_l
+        self.total_ += np.sum(values_p)
+
+    def view(self):
+        """
+        returns a view on the kept values in chronological order.
+        """
+        if self.length_ is None or self.count_ <= self.length_:
+            return self.values_[:self.count_]
+        start_l = self.count_ % self.length_
+        return self.values_[start_l:start_l+self.length_]
+
+class RunsAggregator:
+    """
+    Streaming per-step mean and variance of a quantity over independent runs.
+
+    Runs are folded in as they are simulated with Welford's online algorithm, combined with Chan's
+     formula when several runs are folded at once, so that the memory used does not depend on the
+     number of runs.
+
+    Parameters
+    ----------
+    nsteps_p : number of steps of the runs.
+
+    shape_p : shape of the quantity at each step, () for a scalar such as the reward.
+
+    Attributes
+    ----------
+    counts_ : array of the number of runs folded in at each step.
+
+    mean_ : (nsteps,)+shape array of the running means.
+
+    m2_ : (nsteps,)+shape array of the running sums of squared deviations from the mean.
+
+    Methods
+    -------
+    addStep : folds in the values of several runs at a given step.
+
+    addRuns : folds in whole runs, or a range of their steps.
+
+    merge : folds in the runs of another aggregator.
+
+    getMean : returns the per-step mean.
+
+    getVariance : returns the per-step variance.
+
+    getStandardError : returns the per-step standard error of the mean.
+    """
+
+    def __init__(self, nsteps_p, shape_p=()):
+        self.counts_ = np.zeros(nsteps_p, dtype=np.int64)
+        self.mean_ = np.zeros((nsteps_p,) + tuple(shape_p))
+        self.m2_ = np.zeros((nsteps_p,) + tuple(shape_p))
+
+    def _expandCounts(self, counts_p):
+        # broadcast per-step counts over the shape of the quantity
+        counts_l = np.asarray(counts_p, dtype=float)
+        if counts_l.ndim == 0:
+            return counts_l
+        return counts_l.reshape(counts_l.shape + (1,) * (self.mean_.ndim - 1))
+
+    def _combine(self, steps_p, countsB_p, meanB_p, m2B_p):
+        countsA_l = self.counts_[steps_p]
+        counts_l = countsA_l + countsB_p
+        weightsB_l = np.divide(countsB_p, counts_l, out=np.zeros(np.shape(counts_l)), where=counts_l > 0)
+        delta_l = meanB_p - self.mean_[steps_p]
+        self.mean_[steps_p] += delta_l * self._expandCounts(weightsB_l)
+        self.m2_[steps_p] += m2B_p + delta_l**2 * self._expandCounts(weightsB_l * countsA_l)
+        self.counts_[steps_p] = counts_l
+
+    def addStep(self, step_p, values_p):
+        """
+        folds in the values values_p, of shape (nbRuns,)+shape, taken by several runs at step step_p.
+        """
+        values_l = np.asarray(values_p, dtype=float)
+        meanB_l = values_l.mean(axis=0)
+        self._combine(step_p, len(values_l), meanB_l, ((values_l - meanB_l)**2).sum(axis=0))
+
+    def addRuns(self, values_p, firstStep_p=0):
+        """
+        folds in the runs values_p, of shape (nbRuns, nsteps)+shape, from the step firstStep_p on.
+        """
+        values_l = np.asarray(values_p, dtype=float)
+        meanB_l = values_l.mean(axis=0)
+        steps_l = slice(firstStep_p, firstStep_p+values_l.shape[1])
+        countsB_l = np.full(values_l.shape[1], len(values_l))
+        self._combine(steps_l, countsB_l, meanB_l, ((values_l - meanB_l)**2).sum(axis=0))
+
+    def merge(self, aggregator_p):
+        """
+        folds in the runs folded in another aggregator of the same shape.
+        """
+        self._combine(slice(None), aggregator_p.counts_, aggregator_p.mean_, aggregator_p.m2_)
+
+    def getMean(self):
+        return self.mean_
+
+    def getVariance(self, ddof_p=1):
+        """
+        returns the per-step variance, nan at the steps having at most ddof_p runs.
+        """
+        denominators_l = (self.counts_ - ddof_p).astype(float)
+        denominators_l[denominators_l <= 0] = np.nan
+        return self.m2_ / self._expandCounts(denominators_l)
+
+    def getStandardError(self):
+        """
+        returns the per-step standard error of the mean.
+        """
+        return np.sqrt(self.getVariance() / self._expandCounts(self.counts_))
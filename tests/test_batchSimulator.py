@@ -0,0 +1,70 @@
+ # test_batchSimulator.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import unittest
+import numpy as np
+
+from rlsimulator import Simulator
+from rlsimulator import BatchSimulator
+from rlsimulator.policies import GreedyPolicy, EpsilonGreedyPolicy, UCBPolicy, BetaThompsonPolicy, NormalThompsonPolicy
+from rlsimulator.bandits.bandits import NormalBandit, BernoulliBandit, IncrementalNormalBandit
+from rlsimulator.utils.utils import RunsAggregator
+
+POLICIES = [lambda: GreedyPolicy(), lambda: EpsilonGreedyPolicy(0.1), lambda: UCBPolicy(1.),
+            lambda: BetaThompsonPolicy(), lambda: NormalThompsonPolicy(1., 2.)]
+
+def makeSimulator(policy_p, nbBandits_p=6):
+    simulator_l = Simulator(policy_p, 3)
+    for bandit_cntr in range(nbBandits_p):
+        if isinstance(policy_p, BetaThompsonPolicy):
+            simulator_l.addBandit(BernoulliBandit(bandit_cntr/nbBandits_p), 0.)
+        else:
+            simulator_l.addBandit(NormalBandit(bandit_cntr/nbBandits_p, 1.), 0.)
+    if not isinstance(policy_p, BetaThompsonPolicy):
+        simulator_l.addBandit(IncrementalNormalBandit(0., 1., 50, 0.1), 0.)
+    return simulator_l
+
+def runSerially(simulator_p, nsteps_p):
+    steps_l = [simulator_p.nextStep() for step_cntr in range(nsteps_p)]
+    return np.array([action_l for action_l, _ in steps_l]), np.array([reward_l for _, reward_l in steps_l])
+
+class BatchSimulatorTest(unittest.TestCase):
+
+    def testBatchRunsMatchSerialRuns(self):
+        nbSteps_l = 400
+        nbRuns_l = 3
+        firstRun_l = 2
+        for makePolicy_l in POLICIES:
+            batchActions_l, batchRewards_l, _ = BatchSimulator(makeSimulator(makePolicy_l()), nbRuns_l, firstRun_l).run(nbSteps_l)
+            serial_l = makeSimulator(makePolicy_l())
+            for run_cntr in range(nbRuns_l):
+                serial_l.reinit(firstRun_l + run_cntr)
+                serialActions_l, serialRewards_l = runSerially(serial_l, nbSteps_l)
+                np.testing.assert_array_equal(serialActions_l, batchActions_l[run_cntr])
+                np.testing.assert_array_equal(serialRewards_l, batchRewards_l[run_cntr])
+
+    def testAggregateMatchesRuns(self):
+        batchSimulator_l = BatchSimulator(makeSimulator(UCBPolicy(1.)), 4, 0)
+        _, rewards_l, _ = batchSimulator_l.run(100)
+        batchSimulator_l.reinit(0)
+        aggregator_l = RunsAggregator(100)
+        batchSimulator_l.aggregate(100, aggregator_l)
+        np.testing.assert_allclose(aggregator_l.mean_, rewards_l.mean(axis=0))
+
+class ShiftedNormalBandit(NormalBandit):
+    def getReward(self, step_p):
+        return super().getReward(step_p) + 100.
+
+class BanditsFallbackTest(unittest.TestCase):
+
+    def testGetRewardOverridesAreSimulated(self):
+        simulator_l = Simulator(UCBPolicy(1.), 3)
+        for bandit_cntr in range(3):
+            simulator_l.addBandit(ShiftedNormalBandit(bandit_cntr/3, 1.), 0.)
+        _, rewards_l, _ = simulator_l.run(200)
+        _, batchRewards_l, _ = BatchSimulator(simulator_l, 2, 0).run(200)
+        np.testing.assert_array_equal(rewards_l, batchRewards_l[simulator_l.run_])
+        self.assertGreater(batchRewards_l.min(), 90.)
@@ -0,0 +1,129 @@
+ # test_cache.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+
+from rlsimulator import Simulator
+from rlsimulator.policies import UCBPolicy
+from rlsimulator.bandits.bandits import NormalBandit, IncrementalNormalBandit
+from rlsimulator.cache import ResultCache, simulationKey, cachedRun, cachedRuns, cachedAggregates
+
+def makeSimulator(exploreParam_p=1., seed_p=4):
+    simulator_l = Simulator(UCBPolicy(exploreParam_p), seed_p)
+    for bandit_cntr in range(3):
+        simulator_l.addBandit(NormalBandit(bandit_cntr, 1.), 0.)
+    simulator_l.addBandit(IncrementalNormalBandit(1., 1., 30, 0.5), 0.)
+    return simulator_l
+
+def notSimulated(*arguments_p, **keywords_p):
+    raise AssertionError("the simulation should have been read from the cache")
+
+class ResultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory_ = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory_)
+
+    def testMissAndHit(self):
+        cache_l = ResultCache(self.directory_)
+        self.assertIsNone(cache_l.get("key"))
+        cache_l.put("key", {"values": np.arange(5), "other": np.ones((2, 3))})
+        arrays_l = cache_l.get("key")
+        np.testing.assert_array_equal(arrays_l["values"], np.arange(5))
+        np.testing.assert_array_equal(arrays_l["other"], np.ones((2, 3)))
+        self.assertEqual(os.listdir(self.directory_), ["key.npz"])
+
+    def testLeastRecentlyUsedEntriesAreEvicted(self):
+        cache_l = ResultCache(self.directory_)
+        for key_l in ("a", "b", "c"):
+            cache_l.put(key_l, {"values": np.zeros(1000)})
+        entryBytes_l = os.path.getsize(os.path.join(self.directory_, "a.npz"))
+        # a used most recently, then c, then b
+        for time_l, key_l in ((1000, "b"), (2000, "c"), (3000, "a")):
+            os.utime(os.path.join(self.directory_, key_l + ".npz"), (time_l, time_l))
+
+        cache_l.maxBytes_ = 3 * entryBytes_l
+        cache_l.put("d", {"values": np.zeros(1000)})
+        self.assertEqual(sorted(os.listdir(self.directory_)), ["a.npz", "c.npz", "d.npz"])
+        self.assertIsNone(cache_l.get("b"))
+        # an entry larger than the cache is still stored
+        cache_l.maxBytes_ = 1
+        cache_l.put("e", {"values": np.zeros(1000)})
+        self.assertEqual(os.listdir(self.directory_), ["e.npz"])
+
+    def testEntriesBeingWrittenAreNotCounted(self):
+        cache_l = ResultCache(self.directory_)
+        inFlightPath_l = os.path.join(self.directory_, "other.npz.tmp")
+        with open(inFlightPath_l, "wb") as inFlightFile_l:
+            inFlightFile_l.write(b"0" * 100000)
+        cache_l.maxBytes_ = 10000
+        cache_l.put("a", {"values": np.zeros(100)})
+
+        # the entries listed while b is being written are the complete ones
+        listedEntries_l = []
+        def savez(file_p, **arrays_p):
+            saveArrays_l(file_p, **arrays_p)
+            listedEntries_l.extend(name_l for _, _, name_l in cache_l._entries())
+        saveArrays_l = np.savez
+        with mock.patch.object(np, "savez", savez):
+            cache_l.put("b", {"values": np.zeros(100)})
+        self.assertEqual(listedEntries_l, ["a.npz"])
+        self.assertTrue(os.path.exists(inFlightPath_l))
+        self.assertEqual(sorted(os.listdir(self.directory_)), ["a.npz", "b.npz", "other.npz.tmp"])
+
+    def testSimulationKey(self):
+        self.assertEqual(simulationKey(makeSimulator(), "runs", nsteps=10), simulationKey(makeSimulator(), "runs", nsteps=10))
+        # the key describes the simulator as reinitialized
+        simulator_l = makeSimulator()
+        simulator_l.run(50)
+        self.assertEqual(simulationKey(simulator_l, "runs", nsteps=10), simulationKey(makeSimulator(), "runs", nsteps=10))
+        for otherKey_l in (simulationKey(makeSimulator(2.), "runs", nsteps=10), simulationKey(makeSimulator(seed_p=5), "runs", nsteps=10),
+                           simulationKey(makeSimulator(), "runs", nsteps=11), simulationKey(makeSimulator(), "aggregates", nsteps=10)):
+            self.assertNotEqual(simulationKey(makeSimulator(), "runs", nsteps=10), otherKey_l)
+
+    def testCachedRunContinuesAsSimulated(self):
+        cache_l = ResultCache(self.directory_)
+        reference_l = makeSimulator()
+        reference_l.trackRegret()
+        expected_l = reference_l.run(300, True, 3)
+        reference_l.run(100)
+
+        for hit_l in (False, True):
+            simulator_l = makeSimulator()
+            simulator_l.trackRegret()
+            if hit_l:
+                simulator_l.run = notSimulated
+            results_l = cachedRun(simulator_l, 300, cache_l, True, 3)
+            for result_l, expectedResult_l in zip(results_l, expected_l):
+                np.testing.assert_array_equal(result_l, expectedResult_l)
+            if hit_l:
+                del simulator_l.run
+            simulator_l.run(100)
+            np.testing.assert_array_equal(simulator_l.actionsHistory_.view(), reference_l.actionsHistory_.view())
+            np.testing.assert_array_equal(simulator_l.metricsList_[0].history_.view(), reference_l.metricsList_[0].history_.view())
+            np.testing.assert_array_equal(simulator_l.policy_.vectBanditsEvals_, reference_l.policy_.vectBanditsEvals_)
+            self.assertEqual(len(os.listdir(self.directory_)), 1)
+
+    def testCachedRunsAndAggregates(self):
+        cache_l = ResultCache(self.directory_)
+        actions_l, rewards_l, _ = cachedRuns(makeSimulator(), 80, 4, cache_l)
+        cachedActions_l, cachedRewards_l, _ = cachedRuns(makeSimulator(), 80, 4, cache_l)
+        np.testing.assert_array_equal(actions_l, cachedActions_l)
+        np.testing.assert_array_equal(rewards_l, cachedRewards_l)
+
+        rewardsAggregator_l, evalsAggregator_l = cachedAggregates(makeSimulator(), 80, 4, cache_l, True)
+        cachedRewardsAggregator_l, cachedEvalsAggregator_l = cachedAggregates(makeSimulator(), 80, 4, cache_l, True)
+        np.testing.assert_allclose(rewardsAggregator_l.getMean(), rewards_l.mean(axis=0))
+        np.testing.assert_array_equal(cachedRewardsAggregator_l.getMean(), rewardsAggregator_l.getMean())
+        np.testing.assert_array_equal(cachedEvalsAggregator_l.getVariance(), evalsAggregator_l.getVariance())
+        self.assertEqual(len(os.listdir(self.directory_)), 2)
@@ -0,0 +1,87 @@
+ # test_checkpoint.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+from rlsimulator import Simulator
+from rlsimulator.policies import GreedyPolicy, EpsilonGreedyPolicy, UCBPolicy, BetaThompsonPolicy, NormalThompsonPolicy
+from rlsimulator.bandits.bandits import NormalBandit, BernoulliBandit
+from rlsimulator.metrics.metrics import Regret
+from rlsimulator.checkpoint import Checkpointer, resumeCheckpoint
+
+POLICIES = [lambda: GreedyPolicy(), lambda: EpsilonGreedyPolicy(0.1), lambda: UCBPolicy(1.),
+            lambda: BetaThompsonPolicy(), lambda: NormalThompsonPolicy(1., 2.)]
+
+def makeSimulator(policy_p, nbBandits_p=5):
+    simulator_l = Simulator(policy_p, 7)
+    for bandit_cntr in range(nbBandits_p):
+        if isinstance(policy_p, BetaThompsonPolicy):
+            simulator_l.addBandit(BernoulliBandit(bandit_cntr/nbBandits_p), 0.)
+        else:
+            simulator_l.addBandit(NormalBandit(bandit_cntr/nbBandits_p, 1.), 0.)
+    simulator_l.addMetric(Regret(simulator_l.banditsList_, True))
+    return simulator_l
+
+class CheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path_ = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path_)
+
+    def assertSameSimulations(self, simulator_p, otherSimulator_p):
+        self.assertEqual(simulator_p.step_, otherSimulator_p.step_)
+        np.testing.assert_array_equal(simulator_p.actionsHistory_.view(), otherSimulator_p.actionsHistory_.view())
+        np.testing.assert_array_equal(simulator_p.rewardsHistory_.view(), otherSimulator_p.rewardsHistory_.view())
+        np.testing.assert_array_equal(simulator_p.metricsList_[0].history_.view(), otherSimulator_p.metricsList_[0].history_.view())
+        np.testing.assert_array_equal(simulator_p.policy_.vectBanditsEvals_, otherSimulator_p.policy_.vectBanditsEvals_)
+
+    def testResumeIsBitIdentical(self):
+        for makePolicy_l in POLICIES:
+            referencePath_l = os.path.join(self.path_, "reference")
+            reference_l = makeSimulator(makePolicy_l())
+            Checkpointer(reference_l, referencePath_l, 300, 200).runTo(2000)
+
+            checkpointPath_l = os.path.join(self.path_, "interrupted")
+            interrupted_l = makeSimulator(makePolicy_l())
+            Checkpointer(interrupted_l, checkpointPath_l, 300, 200).runTo(1000)
+            # steps simulated after the last checkpoint are lost
+            interrupted_l.run(123)
+            checkpointer_l = resumeCheckpoint(checkpointPath_l)
+            self.assertEqual(checkpointer_l.simulator_.step_, 1000)
+            checkpointer_l.runTo(2000)
+
+            self.assertSameSimulations(reference_l, checkpointer_l.simulator_)
+            shutil.rmtree(referencePath_l)
+            shutil.rmtree(checkpointPath_l)
+
+    def testResumeReinitRoundTrip(self):
+        for makePolicy_l in POLICIES:
+            checkpointPath_l = os.path.join(self.path_, "runs")
+            Checkpointer(makeSimulator(makePolicy_l()), checkpointPath_l, 100).runTo(250)
+
+            checkpointer_l = resumeCheckpoint(checkpointPath_l)
+            simulator_l = checkpointer_l.simulator_
+            reference_l = makeSimulator(makePolicy_l())
+            for run_l in (1, 2):
+                simulator_l.reinit(run_l)
+                checkpointer_l.runTo(200)
+                reference_l.reinit(run_l)
+                Checkpointer(reference_l, os.path.join(self.path_, "reference"), 100).runTo(200)
+                self.assertSameSimulations(reference_l, simulator_l)
+
+            # the last checkpoint only holds the streams of the last run
+            resumed_l = resumeCheckpoint(checkpointPath_l).simulator_
+            self.assertSameSimulations(reference_l, resumed_l)
+            resumed_l.reinit(3)
+            resumed_l.run(50)
+            shutil.rmtree(checkpointPath_l)
+            shutil.rmtree(os.path.join(self.path_, "reference"))
@@ -0,0 +1,100 @@
+ # test_delayedSimulator.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import unittest
+import numpy as np
+
+from rlsimulator import Simulator
+from rlsimulator import DelayedSimulator
+from rlsimulator.policies import GreedyPolicy, EpsilonGreedyPolicy, UCBPolicy, BetaThompsonPolicy, NormalThompsonPolicy
+from rlsimulator.bandits.bandits import NormalBandit, BernoulliBandit
+
+POLICIES = [lambda: GreedyPolicy(), lambda: EpsilonGreedyPolicy(0.1), lambda: UCBPolicy(1.),
+            lambda: BetaThompsonPolicy(), lambda: NormalThompsonPolicy(1., 2.)]
+
+# delays of the decisions of each batch of 4, cycling
+DELAYS = np.array([3, 0, 6, 1])
+
+class RecordingUCBPolicy(UCBPolicy):
+    # records the feedback of each updateMany, with the step of the policy it is applied at
+    def __init__(self, exploreParam_p):
+        self.feedback_ = []
+        super().__init__(exploreParam_p)
+
+    def updateMany(self, actions_p, rewards_p):
+        self.feedback_.append((self.step_, list(actions_p), list(rewards_p)))
+        super().updateMany(actions_p, rewards_p)
+
+def makeSimulator(policy_p, nbBandits_p=5):
+    simulator_l = Simulator(policy_p, 7)
+    for bandit_cntr in range(nbBandits_p):
+        if isinstance(policy_p, BetaThompsonPolicy):
+            simulator_l.addBandit(BernoulliBandit(bandit_cntr/nbBandits_p), 0.)
+        else:
+            simulator_l.addBandit(NormalBandit(bandit_cntr/nbBandits_p, 1.), 0.)
+    return simulator_l
+
+class DelayedSimulatorTest(unittest.TestCase):
+
+    def testSingleActionsWithoutDelayMatchNextStep(self):
+        nbSteps_l = 300
+        for makePolicy_l in POLICIES:
+            serial_l = makeSimulator(makePolicy_l())
+            serialRegret_l = serial_l.trackRegret()
+            steps_l = [serial_l.nextStep() for step_cntr in range(nbSteps_l)]
+
+            simulator_l = makeSimulator(makePolicy_l())
+            regret_l = simulator_l.trackRegret()
+            delayed_l = DelayedSimulator(simulator_l, 1, 0)
+            actions_l, rewards_l = delayed_l.run(nbSteps_l)
+            delayed_l.flush()
+
+            np.testing.assert_array_equal(actions_l, [action_l for action_l, _ in steps_l])
+            np.testing.assert_array_equal(rewards_l, [reward_l for _, reward_l in steps_l])
+            np.testing.assert_array_equal(simulator_l.actionsCounts_, serial_l.actionsCounts_)
+            np.testing.assert_allclose(simulator_l.policy_.vectBanditsEvals_, serial_l.policy_.vectBanditsEvals_)
+            np.testing.assert_array_equal(regret_l.getHistory(), serialRegret_l.getHistory())
+            self.assertEqual(simulator_l.step_, serial_l.step_)
+
+    def testDelayedFeedbackOrder(self):
+        batchSize_l = 4
+        nbSteps_l = 40
+        simulator_l = makeSimulator(RecordingUCBPolicy(1.))
+        delayed_l = DelayedSimulator(simulator_l, batchSize_l, lambda rng_p, size_p: DELAYS[:size_p])
+        actions_l, rewards_l = delayed_l.run(nbSteps_l)
+        arrivals_l = np.arange(1, nbSteps_l+1) + np.tile(DELAYS, nbSteps_l // batchSize_l)
+
+        # the feedback applied before the batch starting after step s is the one arrived by s and not
+        # applied yet, in the order of the arrivals then of the decisions
+        feedback_l = simulator_l.policy_.feedback_
+        self.assertEqual(len(feedback_l), nbSteps_l // batchSize_l - 1)
+        applied_l = np.zeros(nbSteps_l, dtype=bool)
+        for step_l, feedbackActions_l, feedbackRewards_l in feedback_l:
+            self.assertEqual(step_l % batchSize_l, 0)
+            expected_l = [decision_l for decision_l in np.lexsort((np.arange(nbSteps_l), arrivals_l))
+                          if arrivals_l[decision_l] <= step_l and not applied_l[decision_l]]
+            applied_l[expected_l] = True
+            self.assertEqual(feedbackActions_l, actions_l[expected_l].tolist())
+            self.assertEqual(feedbackRewards_l, rewards_l[expected_l].tolist())
+        self.assertEqual(delayed_l.getPendingCount(), nbSteps_l - applied_l.sum())
+        np.testing.assert_array_equal(np.sort(delayed_l.pendingSteps_), np.sort(arrivals_l[~applied_l]))
+
+        # a decision's reward never reaches the policy before its arrival, the rest is flushed
+        self.assertTrue(np.all(arrivals_l[applied_l] <= nbSteps_l - batchSize_l))
+        delayed_l.flush()
+        self.assertEqual(delayed_l.getPendingCount(), 0)
+        self.assertEqual(simulator_l.policy_.vectCountBanditsPulls_.sum(), nbSteps_l)
+        np.testing.assert_array_equal(simulator_l.policy_.vectCountBanditsPulls_, simulator_l.actionsCounts_)
+
+    def testReinitDiscardsPendingFeedback(self):
+        simulator_l = makeSimulator(UCBPolicy(1.))
+        delayed_l = DelayedSimulator(simulator_l, 8, 100)
+        delayed_l.run(40)
+        self.assertEqual(delayed_l.getPendingCount(), 40)
+        self.assertEqual(simulator_l.policy_.vectCountBanditsPulls_.sum(), 0)
+        delayed_l.reinit(0)
+        self.assertEqual(delayed_l.getPendingCount(), 0)
+        self.assertEqual(simulator_l.step_, 0)
@@ -0,0 +1,142 @@
+ # test_estimators.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import unittest
+import numpy as np
+
+from rlsimulator.estimators import SlidingWindowEstimator, DiscountedEstimator
+from rlsimulator.policies import NonStationaryEpsilonGreedyPolicy, NonStationaryUCBPolicy
+
+INITIAL_EVALS = [0.1, 0.2, 0.3, 0.4]
+
+def windowedValues(history_p, window_p, initialEvals_p):
+    # recomputes the counts and estimates from the last window_p rewards observed
+    counts_l = np.zeros(len(initialEvals_p))
+    sums_l = np.zeros(len(initialEvals_p))
+    for _, action_l, reward_l in history_p[-window_p:]:
+        counts_l[action_l] += 1
+        sums_l[action_l] += reward_l
+    estimates_l = np.array([sums_l[bandit_cntr] / counts_l[bandit_cntr] if counts_l[bandit_cntr] > 0 else initialEvals_p[bandit_cntr]
+                            for bandit_cntr in range(len(initialEvals_p))])
+    return counts_l, estimates_l, min(len(history_p), window_p)
+
+def discountedValues(history_p, discount_p, step_p, initialEvals_p):
+    # recomputes the counts and estimates weighing every reward by discount_p**(its age at step_p)
+    counts_l = np.zeros(len(initialEvals_p))
+    sums_l = np.zeros(len(initialEvals_p))
+    for rewardStep_l, action_l, reward_l in history_p:
+        counts_l[action_l] += discount_p ** (step_p - rewardStep_l)
+        sums_l[action_l] += discount_p ** (step_p - rewardStep_l) * reward_l
+    estimates_l = np.array([sums_l[bandit_cntr] / counts_l[bandit_cntr] if counts_l[bandit_cntr] > 0 else initialEvals_p[bandit_cntr]
+                            for bandit_cntr in range(len(initialEvals_p))])
+    return counts_l, estimates_l, counts_l.sum()
+
+def randomHistory(nbSteps_p, nbBandits_p, seed_p):
+    # steps increase by gaps of 1 to 3, as the steps a bandit is pulled at
+    rng_l = np.random.default_rng(seed_p)
+    steps_l = np.cumsum(rng_l.integers(1, 4, nbSteps_p))
+    return [(int(step_l), int(rng_l.integers(nbBandits_p)), float(rng_l.normal(1., 2.))) for step_l in steps_l]
+
+class EstimatorsTest(unittest.TestCase):
+
+    def testSlidingWindowMatchesBruteForce(self):
+        for window_l in (1, 7, 50):
+            estimator_l = SlidingWindowEstimator(window_l)
+            estimator_l.reinit(INITIAL_EVALS)
+            history_l = []
+            for step_l, action_l, reward_l in randomHistory(300, len(INITIAL_EVALS), window_l):
+                previousEstimates_l = estimator_l.getEstimates().copy()
+                changedActions_l = estimator_l.update(step_l, action_l, reward_l)
+                history_l.append((step_l, action_l, reward_l))
+
+                counts_l, estimates_l, horizon_l = windowedValues(history_l, window_l, INITIAL_EVALS)
+                np.testing.assert_array_equal(estimator_l.getCounts(step_l), counts_l)
+                np.testing.assert_allclose(estimator_l.getEstimates(), estimates_l, rtol=1e-9, atol=1e-12)
+                for bandit_cntr in range(len(INITIAL_EVALS)):
+                    self.assertAlmostEqual(estimator_l.getEstimate(bandit_cntr), estimates_l[bandit_cntr], places=9)
+                self.assertEqual(estimator_l.getHorizon(step_l), horizon_l)
+                # the bandits not reported as changed kept their estimates
+                unchanged_l = np.setdiff1d(np.arange(len(INITIAL_EVALS)), changedActions_l)
+                np.testing.assert_array_equal(estimator_l.getEstimates()[unchanged_l], previousEstimates_l[unchanged_l])
+
+    def testDiscountedMatchesBruteForce(self):
+        for discount_l in (1., 0.9, 0.5):
+            estimator_l = DiscountedEstimator(discount_l)
+            estimator_l.reinit(INITIAL_EVALS)
+            history_l = []
+            for step_l, action_l, reward_l in randomHistory(300, len(INITIAL_EVALS), 3):
+                self.assertEqual(estimator_l.update(step_l, action_l, reward_l), [action_l])
+                history_l.append((step_l, action_l, reward_l))
+
+                # counts and horizon are read at later steps too, the rewards aging without updates
+                for readStep_l in (step_l, step_l + 5):
+                    counts_l, estimates_l, horizon_l = discountedValues(history_l, discount_l, readStep_l, INITIAL_EVALS)
+                    np.testing.assert_allclose(estimator_l.getCounts(readStep_l), counts_l, rtol=1e-9)
+                    np.testing.assert_allclose(estimator_l.getEstimates(), estimates_l, rtol=1e-9, atol=1e-12)
+                    self.assertAlmostEqual(estimator_l.getHorizon(readStep_l), horizon_l, places=9)
+
+    def testAddBanditAndReinit(self):
+        for estimator_l in (SlidingWindowEstimator(10), DiscountedEstimator(0.8)):
+            estimator_l.reinit(INITIAL_EVALS[:2])
+            estimator_l.update(1, 0, 1.)
+            estimator_l.update(2, 1, 3.)
+            estimator_l.addBandit(0.7)
+            np.testing.assert_allclose(estimator_l.getEstimates(), [1., 3., 0.7])
+            estimator_l.update(3, 2, 5.)
+            self.assertEqual(estimator_l.getEstimate(2), 5.)
+            estimator_l.reinit(INITIAL_EVALS)
+            np.testing.assert_array_equal(estimator_l.getEstimates(), INITIAL_EVALS)
+            self.assertEqual(estimator_l.getHorizon(3), 0)
+
+class NonStationaryPoliciesTest(unittest.TestCase):
+
+    def testEpsilonGreedyFollowsEstimator(self):
+        # with epsilon 0 every action is greedy for the estimates of the window
+        window_l = 5
+        policy_l = NonStationaryEpsilonGreedyPolicy(0., SlidingWindowEstimator(window_l))
+        policy_l.setRng(np.random.default_rng(1))
+        policy_l.reinit(INITIAL_EVALS)
+        rng_l = np.random.default_rng(2)
+        means_l = np.array([0., 1., 2., 3.])
+        history_l = []
+        for step_cntr in range(400):
+            if step_cntr == 200:
+                means_l = means_l[::-1].copy()
+            evals_l = np.array(policy_l.vectBanditsEvals_)
+            action_l = policy_l.getNexAction()
+            self.assertIn(action_l, np.flatnonzero(evals_l == evals_l.max()))
+            reward_l = float(rng_l.normal(means_l[action_l], 1.))
+            policy_l.update(action_l, reward_l)
+            history_l.append((policy_l.step_, action_l, reward_l))
+            _, estimates_l, _ = windowedValues(history_l, window_l, INITIAL_EVALS)
+            np.testing.assert_allclose(policy_l.vectBanditsEvals_, estimates_l, rtol=1e-9, atol=1e-12)
+            np.testing.assert_allclose(policy_l.vectBanditsParamEstimates_, estimates_l, rtol=1e-9, atol=1e-12)
+        self.assertEqual(policy_l.vectCountBanditsPulls_.sum(), 400)
+
+    def testUCBFollowsEstimator(self):
+        discount_l = 0.9
+        exploreParam_l = 1.5
+        policy_l = NonStationaryUCBPolicy(exploreParam_l, DiscountedEstimator(discount_l))
+        policy_l.setRng(np.random.default_rng(1))
+        policy_l.reinit(INITIAL_EVALS)
+        np.testing.assert_array_equal(policy_l.vectBanditsEvals_, INITIAL_EVALS)
+        rng_l = np.random.default_rng(2)
+        means_l = np.array([0., 1., 2., 3.])
+        history_l = []
+        for step_cntr in range(400):
+            if step_cntr == 200:
+                means_l = means_l[::-1].copy()
+            evals_l = np.array(policy_l.vectBanditsEvals_)
+            action_l = policy_l.getNexAction()
+            self.assertIn(action_l, np.flatnonzero(evals_l == evals_l.max()))
+            reward_l = float(rng_l.normal(means_l[action_l], 1.))
+            policy_l.update(action_l, reward_l)
+            history_l.append((policy_l.step_, action_l, reward_l))
+            counts_l, estimates_l, horizon_l = discountedValues(history_l, discount_l, policy_l.step_, INITIAL_EVALS)
+            expectedEvals_l = estimates_l + exploreParam_l * np.sqrt(np.log(horizon_l+1) / (1+counts_l))
+            np.testing.assert_allclose(policy_l.vectBanditsEvals_, expectedEvals_l, rtol=1e-9, atol=1e-12)
+        # the discounted estimates forgot the rewards of the first half, the last best bandit is found
+        self.assertEqual(int(np.argmax(policy_l.vectBanditsParamEstimates_)), 0)
@@ -0,0 +1,95 @@
+ # test_metrics.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import unittest
+import numpy as np
+
+from rlsimulator.metrics import rollingMean, ewma, cumulativeAverage, percentOptimalAction, expectedRewards, optimalActions, regret
+from rlsimulator.metrics import RollingMean, Ewma, CumulativeAverage, PercentOptimalAction, Regret
+from rlsimulator.bandits.bandits import _BaseBandit, NormalBandit, ScheduledNormalBandit
+from rlsimulator.schedules import PeriodicSchedule, LinearDriftSchedule
+
+VALUES = np.random.default_rng(0).normal(1., 2., 1000)
+
+class UnknownMeanBandit(_BaseBandit):
+    def getReward(self, step_p):
+        return 1.
+
+def incrementalHistory(metric_p, actions_p, rewards_p):
+    # the values of a metric updated step by step, as the simulator does
+    for step_cntr, (action_l, reward_l) in enumerate(zip(actions_p, rewards_p)):
+        metric_p.update(step_cntr+1, action_l, reward_l)
+    return metric_p.getHistory()
+
+def makeBandits():
+    # the best bandit changes every 10 steps
+    return [NormalBandit(0.5, 1.), ScheduledNormalBandit(PeriodicSchedule([0., 1.], 10), 1.),
+            ScheduledNormalBandit(LinearDriftSchedule(-1., 0.01), 1.)]
+
+class MetricsTest(unittest.TestCase):
+
+    def testRollingMean(self):
+        for window_l in (1, 7, 50, 2000):
+            naive_l = [np.mean(VALUES[max(0, step_cntr+1-window_l):step_cntr+1]) for step_cntr in range(len(VALUES))]
+            np.testing.assert_allclose(rollingMean(VALUES, window_l), naive_l, rtol=1e-9, atol=1e-12)
+            np.testing.assert_allclose(incrementalHistory(RollingMean(window_l), [0]*len(VALUES), VALUES), naive_l, rtol=1e-9, atol=1e-12)
+
+    def testEwma(self):
+        for alpha_l in (0., 0.01, 0.3, 1.):
+            naive_l = [VALUES[0]]
+            for value_l in VALUES[1:]:
+                naive_l.append((1-alpha_l) * naive_l[-1] + alpha_l * value_l)
+            np.testing.assert_allclose(ewma(VALUES, alpha_l), naive_l, rtol=1e-9, atol=1e-12)
+            np.testing.assert_allclose(incrementalHistory(Ewma(alpha_l), [0]*len(VALUES), VALUES), naive_l, rtol=1e-9, atol=1e-12)
+        self.assertEqual(len(ewma([], 0.5)), 0)
+
+    def testCumulativeAverage(self):
+        naive_l = [np.mean(VALUES[:step_cntr+1]) for step_cntr in range(len(VALUES))]
+        np.testing.assert_allclose(cumulativeAverage(VALUES), naive_l, rtol=1e-9)
+        np.testing.assert_allclose(incrementalHistory(CumulativeAverage(), [0]*len(VALUES), VALUES), naive_l, rtol=1e-9)
+
+    def testPercentOptimalAction(self):
+        actions_l = np.random.default_rng(1).integers(0, 3, (4, 200))
+        optimal_l = np.arange(200) // 10 % 3
+        for run_l in actions_l:
+            naive_l = [100 * np.mean(run_l[:step_cntr+1] == optimal_l[:step_cntr+1]) for step_cntr in range(200)]
+            np.testing.assert_allclose(percentOptimalAction(run_l, optimal_l), naive_l)
+            metric_l = PercentOptimalAction(lambda step_p: optimal_l[step_p-1])
+            np.testing.assert_allclose(incrementalHistory(metric_l, run_l, np.zeros(200)), naive_l)
+        # over the runs at each step
+        np.testing.assert_allclose(percentOptimalAction(actions_l, 2), [100 * np.mean(actions_l[:, step_cntr] == 2) for step_cntr in range(200)])
+
+    def testRegret(self):
+        bandits_l = makeBandits()
+        actions_l = np.random.default_rng(2).integers(0, 3, (3, 250))
+        expected_l = np.array([[bandit_l.getExpectedReward(step_l) for step_l in range(1, 251)] for bandit_l in bandits_l])
+        np.testing.assert_allclose(expectedRewards(bandits_l, np.arange(1, 251)), expected_l)
+        np.testing.assert_array_equal(optimalActions(bandits_l, np.arange(1, 251)), np.argmax(expected_l, axis=0))
+
+        instantRegrets_l, cumulativeRegrets_l = regret(actions_l, bandits_l)
+        for run_l, instantRegret_l, cumulativeRegret_l in zip(actions_l, instantRegrets_l, cumulativeRegrets_l):
+            naive_l = [max(expected_l[:, step_cntr]) - expected_l[action_l, step_cntr] for step_cntr, action_l in enumerate(run_l)]
+            np.testing.assert_allclose(instantRegret_l, naive_l, atol=1e-12)
+            np.testing.assert_allclose(cumulativeRegret_l, np.cumsum(naive_l), atol=1e-9)
+            # the incremental metric computes its expected rewards by blocks, crossed here
+            for blockSize_l in (1, 7, 4096):
+                metric_l = Regret(bandits_l, blockSize_p=blockSize_l)
+                np.testing.assert_allclose(incrementalHistory(metric_l, run_l, np.zeros(250)), np.cumsum(naive_l), atol=1e-9)
+                np.testing.assert_allclose(metric_l.getInstantHistory(), naive_l, atol=1e-12)
+
+        # stationary bandits share a single column of expected rewards
+        stationary_l = [NormalBandit(0., 1.), NormalBandit(2., 1.)]
+        metric_l = Regret(stationary_l)
+        np.testing.assert_allclose(incrementalHistory(metric_l, actions_l[0] % 2, np.zeros(250)), regret(actions_l[0] % 2, stationary_l)[1])
+
+    def testUnknownExpectedRewards(self):
+        bandits_l = makeBandits() + [UnknownMeanBandit()]
+        with self.assertRaises(TypeError):
+            expectedRewards(bandits_l, np.arange(1, 10))
+        with self.assertRaises(TypeError):
+            regret(np.zeros(10, dtype=np.int64), bandits_l)
+        with self.assertRaises(TypeError):
+            Regret(bandits_l)
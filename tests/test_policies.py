@@ -0,0 +1,106 @@
+ # test_policies.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import copy
+import pickle
+import unittest
+import numpy as np
+
+from rlsimulator import Simulator
+from rlsimulator.policies import GreedyPolicy, EpsilonGreedyPolicy, UCBPolicy, BetaThompsonPolicy, NormalThompsonPolicy
+from rlsimulator.policies import NonStationaryEpsilonGreedyPolicy, NonStationaryUCBPolicy
+from rlsimulator.estimators import SlidingWindowEstimator, DiscountedEstimator
+from rlsimulator.bandits.bandits import NormalBandit, BernoulliBandit
+
+POLICIES = [lambda: GreedyPolicy(), lambda: EpsilonGreedyPolicy(0.1), lambda: UCBPolicy(1.),
+            lambda: BetaThompsonPolicy(), lambda: NormalThompsonPolicy(1., 2.),
+            lambda: NonStationaryEpsilonGreedyPolicy(0.1, SlidingWindowEstimator(50)),
+            lambda: NonStationaryUCBPolicy(1., DiscountedEstimator(0.99))]
+
+class OffsetUCBPolicy(UCBPolicy):
+    # declares no slots, its own attributes are kept in an instance dict
+    def __init__(self, offset_p):
+        self.offset_ = offset_p
+        super().__init__(1.)
+
+def makeSimulator(policy_p, nbBandits_p=5):
+    simulator_l = Simulator(policy_p, 11)
+    for bandit_cntr in range(nbBandits_p):
+        if isinstance(policy_p, BetaThompsonPolicy):
+            simulator_l.addBandit(BernoulliBandit(bandit_cntr/nbBandits_p), 0.)
+        else:
+            simulator_l.addBandit(NormalBandit(bandit_cntr/nbBandits_p, 1.), 0.)
+    return simulator_l
+
+class PolicyStateTest(unittest.TestCase):
+
+    def testCopiesContinueIdentically(self):
+        for makePolicy_l in POLICIES:
+            simulator_l = makeSimulator(makePolicy_l())
+            simulator_l.run(300)
+            for protocol_l in (2, pickle.HIGHEST_PROTOCOL):
+                copy_l = pickle.loads(pickle.dumps(simulator_l, protocol_l))
+                reference_l = copy.deepcopy(simulator_l)
+                np.testing.assert_array_equal(reference_l.run(200)[0], copy_l.run(200)[0])
+
+    def testAddBanditAndReinitAfterPickling(self):
+        for makePolicy_l in POLICIES:
+            simulator_l = makeSimulator(makePolicy_l())
+            simulator_l.run(100)
+            for protocol_l in (2, 5):
+                copy_l = pickle.loads(pickle.dumps(simulator_l, protocol_l))
+                copy_l.reinit(1)
+                copy_l.run(50)
+                copy_l.reinit(2)
+                copy_l.run(50)
+
+                policy_l = pickle.loads(pickle.dumps(simulator_l.policy_, protocol_l))
+                policy_l.addBandit(0.5)
+                policy_l.addBandit(0.5)
+                self.assertEqual(len(policy_l.vectBanditsEvals_), 7)
+                np.testing.assert_array_equal(policy_l.vectCountBanditsPulls_[:5], simulator_l.policy_.vectCountBanditsPulls_)
+                policy_l.reinit([0.]*20)
+                policy_l.reinit([0.]*3)
+                self.assertEqual(len(policy_l.vectBanditsEvals_), 3)
+
+    def testReinitReusesArrays(self):
+        for makePolicy_l in POLICIES:
+            policy_l = makeSimulator(makePolicy_l()).policy_
+            counts_l = policy_l.vectCountBanditsPulls_
+            policy_l.reinit([0.]*5)
+            self.assertTrue(np.shares_memory(counts_l, policy_l.vectCountBanditsPulls_))
+
+    def testSubclassAttributesAreCopied(self):
+        policy_l = OffsetUCBPolicy(3.)
+        self.assertEqual(copy.deepcopy(policy_l).offset_, 3.)
+        self.assertEqual(pickle.loads(pickle.dumps(policy_l)).offset_, 3.)
+
+class BetaThompsonRewardsTest(unittest.TestCase):
+
+    def testRewardsOutsideUnitIntervalAreRejected(self):
+        simulator_l = Simulator(BetaThompsonPolicy(), 3)
+        simulator_l.addBandit(NormalBandit(0., 1.), 0.)
+        simulator_l.addBandit(NormalBandit(1., 1.), 0.)
+        with self.assertRaises(ValueError):
+            simulator_l.run(50)
+
+        policy_l = BetaThompsonPolicy()
+        policy_l.reinit([0.]*3)
+        with self.assertRaises(ValueError):
+            policy_l.update(0, 1.5)
+        with self.assertRaises(ValueError):
+            policy_l.updateMany([0, 1, 2], [1., -0.5, 0.])
+        state_l = policy_l.newBatchState([0.]*3, 2)
+        with self.assertRaises(ValueError):
+            policy_l.updateBatch(state_l, np.array([0, 1]), np.array([0.5, 2.]))
+        # nothing was added by the rejected updates
+        np.testing.assert_array_equal(policy_l.vectCountBanditsPulls_, 0)
+        np.testing.assert_array_equal(state_l.vectCountBanditsPulls_, 0)
+        self.assertTrue(np.all(policy_l.betas_ > 0))
+
+        policy_l.update(0, 1.)
+        policy_l.updateMany([1, 2], [0., 0.25])
+        policy_l.updateBatch(state_l, np.array([0, 1]), np.array([0., 1.]))
@@ -0,0 +1,78 @@
+ # test_replay.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from rlsimulator.replay import ReplayEvaluator
+from rlsimulator.policies import GreedyPolicy
+
+# a greedy policy starting with the evaluations INITIAL_EVALS always chooses the action 0, its
+# positive rewards keeping it the best: the rows 0, 2 and 4 are accepted
+INITIAL_EVALS = [1., 0., 0.]
+ACTIONS = np.array([0, 1, 0, 2, 0, 1])
+REWARDS = np.array([1., 0., 0.5, 1., 1., 1.])
+PROPENSITIES = np.array([0.5, 0.25, 0.8, 0.25, 0.5, 0.25])
+
+class ReplayEvaluatorTest(unittest.TestCase):
+
+    def testEstimatesComputedByHand(self):
+        # accepted rows weigh 1/propensity: 2 + 1.25 + 2, with the rewards 1, 0.5 and 1
+        expected_l = {"rows": 6, "accepted": 3, "replayReward": 2.5/3, "ipsReward": 4.625/6, "snipsReward": 4.625/5.25}
+        for batchSize_l, chunkSize_l in ((1, 2**20), (1, 4), (2, 4), (6, 1)):
+            evaluator_l = ReplayEvaluator(GreedyPolicy(), INITIAL_EVALS, batchSize_l, chunkSize_l, seed_p=0)
+            estimates_l = evaluator_l.replay(ACTIONS, REWARDS, PROPENSITIES)
+            self.assertEqual(estimates_l.keys(), expected_l.keys())
+            for key_l, value_l in expected_l.items():
+                self.assertAlmostEqual(estimates_l[key_l], value_l)
+            self.assertEqual(evaluator_l.policy_.step_, 3)
+
+    def testReplayContinuesAndReadsFiles(self):
+        evaluator_l = ReplayEvaluator(GreedyPolicy(), INITIAL_EVALS, seed_p=0)
+        evaluator_l.replay(ACTIONS[:3], REWARDS[:3], PROPENSITIES[:3])
+        with tempfile.TemporaryDirectory() as directory_l:
+            paths_l = []
+            for name_l, column_l in (("actions", ACTIONS[3:]), ("rewards", REWARDS[3:]), ("propensities", PROPENSITIES[3:])):
+                paths_l.append(os.path.join(directory_l, name_l + ".npy"))
+                np.save(paths_l[-1], column_l)
+            estimates_l = evaluator_l.replay(*paths_l)
+        self.assertEqual(estimates_l["rows"], 6)
+        self.assertAlmostEqual(estimates_l["ipsReward"], 4.625/6)
+
+        evaluator_l.reinit()
+        self.assertEqual(evaluator_l.getEstimates(), {"rows": 0, "accepted": 0, "replayReward": None, "ipsReward": None, "snipsReward": None})
+
+    def testMissingPropensities(self):
+        evaluator_l = ReplayEvaluator(GreedyPolicy(), INITIAL_EVALS, seed_p=0)
+        estimates_l = evaluator_l.replay(ACTIONS, REWARDS)
+        self.assertAlmostEqual(estimates_l["replayReward"], 2.5/3)
+        self.assertIsNone(estimates_l["ipsReward"])
+        self.assertIsNone(estimates_l["snipsReward"])
+
+        # the row 4 is replayed but not scored, leaving the weights 2 and 1.25 over 5 rows
+        propensities_l = PROPENSITIES.copy()
+        propensities_l[4] = np.nan
+        evaluator_l.reinit()
+        estimates_l = evaluator_l.replay(ACTIONS, REWARDS, propensities_l)
+        self.assertEqual(estimates_l["accepted"], 3)
+        self.assertAlmostEqual(estimates_l["replayReward"], 2.5/3)
+        self.assertAlmostEqual(estimates_l["ipsReward"], 2.625/5)
+        self.assertAlmostEqual(estimates_l["snipsReward"], 2.625/3.25)
+
+    def testZeroPropensityIsRejected(self):
+        evaluator_l = ReplayEvaluator(GreedyPolicy(), INITIAL_EVALS, seed_p=0)
+        for invalid_l in (0., -0.5, 1.5):
+            propensities_l = PROPENSITIES.copy()
+            propensities_l[3] = invalid_l
+            with self.assertRaises(ValueError):
+                evaluator_l.replay(ACTIONS, REWARDS, propensities_l)
+            # the chunk was not replayed
+            self.assertEqual(evaluator_l.rowsCount_, 0)
+            self.assertEqual(evaluator_l.policy_.step_, 0)
+        with self.assertRaises(ValueError):
+            evaluator_l.replay(ACTIONS, REWARDS, PROPENSITIES[:4])
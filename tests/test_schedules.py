@@ -0,0 +1,78 @@
+ # test_schedules.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import unittest
+import numpy as np
+
+from rlsimulator.schedules import ConstantSchedule, StepSchedule, PeriodicSchedule, LinearDriftSchedule
+from rlsimulator.schedules import PiecewiseSchedule, RandomWalkSchedule
+from rlsimulator.bandits.bandits import ScheduledNormalBandit, ScheduledBernoulliBandit
+
+STEPS = np.array([0, 1, 9, 10, 11, 25, 29, 30, 31, 100, 1234])
+
+class SchedulesTest(unittest.TestCase):
+
+    def assertValues(self, schedule_p, steps_p, values_p):
+        np.testing.assert_allclose(schedule_p.getValues(np.array(steps_p)), values_p)
+        for step_l, value_l in zip(steps_p, values_p):
+            self.assertAlmostEqual(schedule_p.getValue(step_l), value_l)
+
+    def testValuesAtKnownSteps(self):
+        self.assertValues(ConstantSchedule(3.), [0, 7, 10**6], [3., 3., 3.])
+        # +0.5 every 10 steps
+        self.assertValues(StepSchedule(1., 10, 0.5), [0, 9, 10, 19, 20, 105], [1., 1., 1.5, 1.5, 2., 6.])
+        # 10 steps of each value, period of 30 steps
+        self.assertValues(PeriodicSchedule([5., 7., 9.], 10), [0, 9, 10, 25, 29, 30, 41, 1234], [5., 5., 7., 9., 9., 5., 7., 5.])
+        self.assertValues(LinearDriftSchedule(2., -0.25), [0, 1, 8, 100], [2., 1.75, 0., -23.])
+        self.assertValues(PiecewiseSchedule([10, 20, 40], [1., 3., 2.]), [0, 10, 15, 19, 20, 39, 40, 1000], [1., 1., 1., 1., 3., 3., 2., 2.])
+        self.assertValues(PiecewiseSchedule([10, 20, 40], [1., 3., 2.], interpolate_p=True), [0, 10, 15, 20, 30, 40, 1000], [1., 1., 2., 3., 2.5, 2., 2.])
+
+    def testRandomWalkIsAFunctionOfItsSeed(self):
+        walk_l = RandomWalkSchedule(1., 0.5, seed_p=4)
+        values_l = walk_l.getValues(STEPS)
+        self.assertEqual(values_l[0], 1.)
+        # the same values whatever the order and the number of the steps asked for
+        otherWalk_l = RandomWalkSchedule(1., 0.5, seed_p=4)
+        self.assertEqual(otherWalk_l.getValue(1234), values_l[-1])
+        np.testing.assert_array_equal(otherWalk_l.getValues(STEPS[::-1]), values_l[::-1])
+        increments_l = np.diff(RandomWalkSchedule(1., 0.5, seed_p=4).getValues(np.arange(20000)))
+        self.assertAlmostEqual(increments_l.std(), 0.5, delta=0.02)
+        self.assertFalse(np.array_equal(RandomWalkSchedule(1., 0.5, seed_p=5).getValues(STEPS), values_l))
+
+    def testExpectedRewardsFollowTheSchedule(self):
+        schedule_l = PeriodicSchedule([5., 7., 9.], 10)
+        bandit_l = ScheduledNormalBandit(schedule_l, 2.)
+        self.assertFalse(bandit_l.stationary_)
+        np.testing.assert_array_equal(bandit_l.getExpectedRewards(STEPS), schedule_l.getValues(STEPS))
+        for step_l in STEPS:
+            self.assertEqual(bandit_l.getExpectedReward(step_l), schedule_l.getValue(step_l))
+
+        # probabilities are clipped to [0, 1]
+        bandit_l = ScheduledBernoulliBandit(LinearDriftSchedule(-0.5, 0.01))
+        np.testing.assert_allclose(bandit_l.getExpectedRewards(STEPS), np.clip(-0.5 + 0.01*STEPS, 0., 1.))
+        self.assertEqual(bandit_l.getExpectedReward(0), 0.)
+        self.assertAlmostEqual(bandit_l.getExpectedReward(100), 0.5)
+        self.assertEqual(bandit_l.getExpectedReward(1234), 1.)
+
+        # a constant is a stationary schedule
+        self.assertTrue(ScheduledNormalBandit(3., 1.).stationary_)
+        self.assertEqual(ScheduledBernoulliBandit(0.3).getExpectedReward(10), 0.3)
+
+    def testRewardsFollowTheSchedule(self):
+        steps_l = np.arange(1, 3001)
+        schedule_l = StepSchedule(0., 1000, 10.)
+        for makeBandit_l in (lambda: ScheduledNormalBandit(schedule_l, 1.),
+                             lambda: ScheduledBernoulliBandit(PeriodicSchedule([0.1, 0.9], 1000))):
+            bandit_l = makeBandit_l()
+            bandit_l.setRng(np.random.default_rng(0))
+            rewards_l = bandit_l.getRewards(steps_l)
+            # pulled one by one, the bandit draws the same rewards
+            bandit_l.setRng(np.random.default_rng(0))
+            np.testing.assert_array_equal([bandit_l.getReward(step_l) for step_l in steps_l], rewards_l)
+            # the mean reward of each piece is its expected reward
+            for firstStep_l in (0, 1000, 2000):
+                piece_l = slice(firstStep_l, firstStep_l + 999)
+                self.assertAlmostEqual(rewards_l[piece_l].mean(), bandit_l.getExpectedRewards(steps_l[piece_l]).mean(), delta=0.1)
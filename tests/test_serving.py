@@ -0,0 +1,81 @@
+ # test_serving.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import asyncio
+import unittest
+import numpy as np
+
+from rlsimulator.serving import PolicyServer
+from rlsimulator.policies import UCBPolicy
+
+class PolicyServerTest(unittest.TestCase):
+
+    def testConcurrentClientsUpdateThePolicyConsistently(self):
+        nbClients_l = 20
+        nbDecisionsPerClient_l = 30
+        policy_l = UCBPolicy(1.)
+        policy_l.setRng(np.random.default_rng(0))
+        served_l = []
+
+        async def client(server_p, client_p):
+            rng_l = np.random.default_rng(client_p)
+            for decision_cntr in range(nbDecisionsPerClient_l):
+                decisionId_l, action_l = await server_p.chooseAction()
+                reward_l = float(rng_l.normal(action_l, 1.))
+                served_l.append((decisionId_l, action_l, reward_l))
+                # rewards come back out of order, some after the next decision
+                await asyncio.sleep(rng_l.random() * 1e-3)
+                server_p.reportReward(decisionId_l, reward_l)
+
+        async def serve():
+            async with PolicyServer(policy_l, [0.]*4, maxBatchSize_p=8, batchWindow_p=1e-4) as server_l:
+                await asyncio.gather(*[client(server_l, client_cntr) for client_cntr in range(nbClients_l)])
+            return server_l
+
+        server_l = asyncio.run(serve())
+        nbDecisions_l = nbClients_l * nbDecisionsPerClient_l
+        self.assertEqual(sorted(decisionId_l for decisionId_l, _, _ in served_l), list(range(nbDecisions_l)))
+        self.assertEqual(server_l.decisionsCount_, nbDecisions_l)
+        self.assertEqual(server_l.updatesCount_, nbDecisions_l)
+        self.assertLess(server_l.decisionBatches_, nbDecisions_l)
+        self.assertEqual(server_l.outstanding_, {})
+        self.assertEqual(policy_l.step_, nbDecisions_l)
+
+        # every reward reached the policy once, whatever the batches it was applied with
+        actions_l = np.array([action_l for _, action_l, _ in served_l])
+        rewards_l = np.array([reward_l for _, _, reward_l in served_l])
+        np.testing.assert_array_equal(policy_l.vectCountBanditsPulls_, np.bincount(actions_l, minlength=4))
+        for bandit_cntr in np.unique(actions_l):
+            self.assertAlmostEqual(policy_l.vectBanditsParamEstimates_[bandit_cntr], rewards_l[actions_l == bandit_cntr].mean())
+
+    def testStopDrainsPendingRequests(self):
+        policy_l = UCBPolicy(1.)
+        policy_l.setRng(np.random.default_rng(0))
+
+        async def serve():
+            server_l = PolicyServer(policy_l, [0.]*3, batchWindow_p=10.)
+            await server_l.start()
+            decisions_l = [asyncio.ensure_future(server_l.chooseAction()) for request_cntr in range(5)]
+            # the requests are queued, their batch waits for its window
+            await asyncio.sleep(0.01)
+            self.assertFalse(any(decision_l.done() for decision_l in decisions_l))
+            await server_l.stop()
+
+            served_l = [await asyncio.wait_for(decision_l, 1.) for decision_l in decisions_l]
+            for decisionId_l, action_l in served_l[:3]:
+                server_l.reportReward(decisionId_l, 1.)
+            # rewards reported after the stop are applied by the next one
+            await server_l.start()
+            await server_l.stop()
+            return server_l, served_l
+
+        server_l, served_l = asyncio.run(serve())
+        self.assertEqual(sorted(decisionId_l for decisionId_l, _ in served_l), list(range(5)))
+        self.assertEqual(server_l.decisionsCount_, 5)
+        self.assertEqual(server_l.updatesCount_, 3)
+        self.assertEqual(server_l.pendingActions_, [])
+        self.assertEqual(len(server_l.outstanding_), 2)
+        self.assertEqual(policy_l.vectCountBanditsPulls_.sum(), 3)
@@ -0,0 +1,58 @@
+ # test_simulator.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import unittest
+import numpy as np
+
+from rlsimulator import Simulator
+from rlsimulator.policies import GreedyPolicy, EpsilonGreedyPolicy, UCBPolicy, BetaThompsonPolicy, NormalThompsonPolicy
+from rlsimulator.bandits.bandits import NormalBandit, BernoulliBandit, IncrementalNormalBandit
+
+POLICIES = [lambda: GreedyPolicy(), lambda: EpsilonGreedyPolicy(0.1), lambda: UCBPolicy(1.),
+            lambda: BetaThompsonPolicy(), lambda: NormalThompsonPolicy(1., 2.)]
+
+def makeSimulator(policy_p, nbBandits_p=6):
+    simulator_l = Simulator(policy_p, 3)
+    for bandit_cntr in range(nbBandits_p):
+        if isinstance(policy_p, BetaThompsonPolicy):
+            simulator_l.addBandit(BernoulliBandit(bandit_cntr/nbBandits_p), 0.)
+        else:
+            simulator_l.addBandit(NormalBandit(bandit_cntr/nbBandits_p, 1.), 0.)
+    if not isinstance(policy_p, BetaThompsonPolicy):
+        simulator_l.addBandit(IncrementalNormalBandit(0., 1., 50, 0.1), 0.)
+    return simulator_l
+
+def runSerially(simulator_p, nsteps_p):
+    steps_l = [simulator_p.nextStep() for step_cntr in range(nsteps_p)]
+    return np.array([action_l for action_l, _ in steps_l]), np.array([reward_l for _, reward_l in steps_l])
+
+class SimulatorTest(unittest.TestCase):
+
+    def testSerialAndFusedRunsAreBitIdentical(self):
+        nbSteps_l = 500
+        for makePolicy_l in POLICIES:
+            serial_l = makeSimulator(makePolicy_l())
+            fused_l = makeSimulator(makePolicy_l())
+            for run_l in range(3):
+                serial_l.reinit(run_l)
+                serialActions_l, serialRewards_l = runSerially(serial_l, nbSteps_l)
+                fused_l.reinit(run_l)
+                fusedActions_l, fusedRewards_l, _ = fused_l.run(nbSteps_l)
+
+                np.testing.assert_array_equal(serialActions_l, fusedActions_l)
+                np.testing.assert_array_equal(serialRewards_l, fusedRewards_l)
+                np.testing.assert_array_equal(serial_l.policy_.vectBanditsEvals_, fused_l.policy_.vectBanditsEvals_)
+                np.testing.assert_array_equal(serial_l.actionsCounts_, fused_l.actionsCounts_)
+
+    def testRunInPiecesIsBitIdentical(self):
+        for makePolicy_l in POLICIES:
+            whole_l = makeSimulator(makePolicy_l())
+            actions_l, rewards_l, evals_l = whole_l.run(300, True)
+            pieces_l = makeSimulator(makePolicy_l())
+            piecesResults_l = [pieces_l.run(nsteps_l, True) for nsteps_l in (1, 99, 200)]
+            np.testing.assert_array_equal(actions_l, np.concatenate([result_l[0] for result_l in piecesResults_l]))
+            np.testing.assert_array_equal(rewards_l, np.concatenate([result_l[1] for result_l in piecesResults_l]))
+            np.testing.assert_array_equal(evals_l, np.concatenate([result_l[2] for result_l in piecesResults_l]))
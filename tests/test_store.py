@@ -0,0 +1,93 @@
+ # test_store.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+from rlsimulator import Simulator
+from rlsimulator import BatchSimulator
+from rlsimulator.policies import UCBPolicy
+from rlsimulator.bandits.bandits import NormalBandit
+from rlsimulator.store import StoreWriter, ResultStore
+
+def makeSimulator():
+    simulator_l = Simulator(UCBPolicy(1.), 9)
+    for bandit_cntr in range(4):
+        simulator_l.addBandit(NormalBandit(bandit_cntr/4, 1.), 0.)
+    return simulator_l
+
+class StoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path_ = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path_)
+
+    def testMemmapRoundTrip(self):
+        writer_l = StoreWriter(self.path_, 4, recordEvals_p=True, chunkSize_p=64, metadata_p={"policy": "ucb"})
+        writer_l.recordBatch(BatchSimulator(makeSimulator(), 3, 0), 150)
+        actions_l, rewards_l, evals_l = BatchSimulator(makeSimulator(), 3, 0).run(150, True)
+
+        store_l = ResultStore(self.path_)
+        self.assertEqual((store_l.nbRuns_, store_l.nsteps_, store_l.nbBandits_), (3, 150, 4))
+        self.assertEqual(store_l.metadata_, {"policy": "ucb"})
+        chunks_l = list(store_l.iterChunks("rewards", 0))
+        self.assertEqual([firstStep_l for firstStep_l, _ in chunks_l], [0, 64, 128])
+        self.assertTrue(all(isinstance(chunk_l, np.memmap) for _, chunk_l in chunks_l))
+        for run_cntr in range(3):
+            np.testing.assert_array_equal(store_l.getRun(run_cntr, "actions"), actions_l[run_cntr])
+            np.testing.assert_array_equal(store_l.getRun(run_cntr, "rewards"), rewards_l[run_cntr])
+            np.testing.assert_array_equal(store_l.getRun(run_cntr, "evals"), evals_l[run_cntr])
+        aggregator_l = store_l.aggregate("rewards")
+        np.testing.assert_allclose(aggregator_l.getMean(), rewards_l.mean(axis=0))
+        with self.assertRaises(IndexError):
+            store_l.getRun(3, "rewards")
+
+    def testRecordRunsMatchesSimulatorRuns(self):
+        writer_l = StoreWriter(self.path_, 4, chunkSize_p=32)
+        writer_l.recordRuns(makeSimulator(), 70, 2)
+        simulator_l = makeSimulator()
+        store_l = ResultStore(self.path_)
+        for run_cntr in range(2):
+            simulator_l.reinit(run_cntr)
+            actions_l, rewards_l, _ = simulator_l.run(70)
+            np.testing.assert_array_equal(store_l.getRun(run_cntr, "actions"), actions_l)
+            np.testing.assert_array_equal(store_l.getRun(run_cntr, "rewards"), rewards_l)
+        with self.assertRaises(ValueError):
+            store_l.aggregate("evals")
+
+    def testBlocksOfDifferentLengths(self):
+        StoreWriter(self.path_, 4, chunkSize_p=64).recordRuns(makeSimulator(), 200, 3)
+        # appended to the existing store
+        StoreWriter(self.path_, 4, chunkSize_p=64).recordBatch(BatchSimulator(makeSimulator(), 5, 10), 100)
+
+        store_l = ResultStore(self.path_)
+        self.assertEqual((store_l.nbRuns_, store_l.nsteps_), (8, 200))
+        self.assertEqual([len(store_l.getRun(run_cntr, "rewards")) for run_cntr in range(8)], [200]*3 + [100]*5)
+
+        aggregator_l = store_l.aggregate("rewards")
+        np.testing.assert_array_equal(aggregator_l.counts_, [8]*100 + [3]*100)
+        runs_l = [store_l.getRun(run_cntr, "rewards") for run_cntr in range(8)]
+        np.testing.assert_allclose(aggregator_l.getMean()[:100], np.mean([run_l[:100] for run_l in runs_l], axis=0))
+        np.testing.assert_allclose(aggregator_l.getMean()[100:], np.mean([run_l[100:] for run_l in runs_l[:3]], axis=0))
+
+    def testInterruptedStoreKeepsCompleteChunks(self):
+        writer_l = StoreWriter(self.path_, 4, chunkSize_p=16)
+        writer_l.beginRuns(2)
+        for step_cntr in range(40):
+            writer_l.addStep(np.array([0, 1]), np.array([step_cntr, -step_cntr]))
+        # not closed: the last 8 steps were not written
+        store_l = ResultStore(self.path_)
+        self.assertEqual(store_l.nsteps_, 32)
+        np.testing.assert_array_equal(store_l.getRun(1, "rewards"), -np.arange(32))
+
+    def testOtherKindOfStoreIsRejected(self):
+        StoreWriter(self.path_, 4).close()
+        with self.assertRaises(ValueError):
+            StoreWriter(self.path_, 5)
@@ -0,0 +1,92 @@
+ # test_sweepRunner.py
+ # author: aziz jegham
+ # Created on Sun Oct 18 2026
+ # Copyright (C) 2026 aziz jegham
+ # License: GNU General Public License version 3
+
+import math
+import unittest
+import numpy as np
+
+from rlsimulator import Simulator
+from rlsimulator import runSweep
+from rlsimulator.policies import EpsilonGreedyPolicy, UCBPolicy
+from rlsimulator.bandits.bandits import _BaseBandit, NormalBandit, IncrementalNormalBandit
+from rlsimulator.metrics.metrics import expectedRewards
+
+BANDITS_CONFIGS = [[NormalBandit(0., 1.), NormalBandit(0.5, 1.), NormalBandit(1., 1.)],
+                   [NormalBandit(1., 2.), IncrementalNormalBandit(0., 1., 20, 0.1)]]
+
+class ConstantBandit(_BaseBandit):
+    # implements getReward only, its expected reward is unknown
+    def __init__(self, reward_p):
+        self.reward_ = reward_p
+
+    def getReward(self, step_p):
+        return self.reward_
+
+def simulateOneByOne(policy_p, banditsList_p, initialEvals_p, nsteps_p, runs_p, seed_p):
+    # summary of the runs 0 to runs_p-1 of a Simulator, accumulated in the order of the steps
+    simulator_l = Simulator(policy_p, np.random.SeedSequence(seed_p).entropy)
+    for bandit_l, initialEval_l in zip(banditsList_p, np.broadcast_to(initialEvals_p, (len(banditsList_p),))):
+        simulator_l.addBandit(bandit_l, float(initialEval_l))
+    expected_l = expectedRewards(banditsList_p, np.arange(1, nsteps_p+1))
+    totalRewards_l, regrets_l, optimalCounts_l = np.zeros(runs_p), np.zeros(runs_p), np.zeros(runs_p)
+    for run_l in range(runs_p):
+        simulator_l.reinit(run_l)
+        for step_cntr in range(nsteps_p):
+            action_l, reward_l = simulator_l.nextStep()
+            totalRewards_l[run_l] += reward_l
+            regrets_l[run_l] += expected_l[:, step_cntr].max() - expected_l[action_l, step_cntr]
+            optimalCounts_l[run_l] += expected_l[action_l, step_cntr] == expected_l[:, step_cntr].max()
+    return totalRewards_l, regrets_l, optimalCounts_l
+
+class SweepRunnerTest(unittest.TestCase):
+
+    def assertMatchesOneByOne(self, table_p, policyClass_p, nsteps_p, runs_p, seed_p):
+        for record_l in table_p:
+            params_l = {name_l: value_l for name_l, value_l in record_l.items() if name_l.endswith("_p")}
+            totalRewards_l, regrets_l, optimalCounts_l = simulateOneByOne(policyClass_p(**params_l), BANDITS_CONFIGS[record_l["bandits"]],
+                                                                          record_l["initialEvals"], nsteps_p, runs_p, seed_p)
+            self.assertAlmostEqual(record_l["meanReward"], float(np.mean(totalRewards_l)) / nsteps_p, places=12)
+            self.assertAlmostEqual(record_l["regret"], float(np.mean(regrets_l)), places=12)
+            self.assertAlmostEqual(record_l["percentOptimalAction"], 100 * float(np.mean(optimalCounts_l)) / nsteps_p, places=12)
+
+    def testBatchedConfigurationsMatchOneByOneRuns(self):
+        # the explore parameters and the initial evaluations vary within the batches, split in two
+        # by maxBatchRuns_p
+        table_l = runSweep(UCBPolicy, {"exploreParam_p": [0.5, 2.]}, BANDITS_CONFIGS, [0., 1.5], 120, 3,
+                           seed_p=5, maxBatchRuns_p=6)
+        self.assertMatchesOneByOne(table_l, UCBPolicy, 120, 3, 5)
+
+    def testGroupedConfigurationsMatchOneByOneRuns(self):
+        # the dtype is not a batch parameter, each of its values is a separate group
+        table_l = runSweep(EpsilonGreedyPolicy, {"epsilon_p": [0.05, 0.3], "dtype_p": [np.float64, np.float32]}, BANDITS_CONFIGS[:1],
+                           [0.], 100, 4, seed_p=2)
+        self.assertMatchesOneByOne(table_l, EpsilonGreedyPolicy, 100, 4, 2)
+
+    def testResultsTable(self):
+        table_l = runSweep(EpsilonGreedyPolicy, {"epsilon_p": [0., 0.1, 0.2]}, BANDITS_CONFIGS, [0., 5.], 30, 2, seed_p=0)
+        self.assertEqual(len(table_l), 2 * 3 * 2)
+        columns_l = ["bandits", "initialEvals", "epsilon_p", "meanReward", "meanRewardStdErr", "regret", "regretStdErr", "percentOptimalAction"]
+        for record_l in table_l:
+            self.assertEqual(sorted(record_l), sorted(columns_l))
+        # configurations in the order of the bandits, then of the parameters, then of the initial evaluations
+        self.assertEqual([(record_l["bandits"], record_l["epsilon_p"], record_l["initialEvals"]) for record_l in table_l],
+                         [(bandits_l, epsilon_l, initialEvals_l) for bandits_l in range(2) for epsilon_l in (0., 0.1, 0.2) for initialEvals_l in (0., 5.)])
+        for record_l in table_l:
+            self.assertGreaterEqual(record_l["regret"], 0.)
+            self.assertTrue(0. <= record_l["percentOptimalAction"] <= 100.)
+
+    def testUnknownExpectedRewardsGiveNanRegret(self):
+        table_l = runSweep(UCBPolicy, {"exploreParam_p": [0.5, 2.]}, [[ConstantBandit(1.), ConstantBandit(2.)], [NormalBandit(0., 1.), NormalBandit(1., 1.)]],
+                           [0.], 50, 3, seed_p=1)
+        self.assertEqual(len(table_l), 4)
+        for record_l in table_l:
+            if record_l["bandits"] == 0:
+                self.assertTrue(math.isnan(record_l["regret"]))
+                self.assertTrue(math.isnan(record_l["percentOptimalAction"]))
+                self.assertTrue(1. <= record_l["meanReward"] <= 2.)
+            else:
+                self.assertFalse(math.isnan(record_l["regret"]))
+                self.assertFalse(math.isnan(record_l["percentOptimalAction"]))